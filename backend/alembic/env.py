@@ -14,7 +14,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.core.config import settings
 from app.core.database import Base
-from app.models import ScanSession  # 모든 모델 import
+from app.models import (  # 모든 모델 import
+    ScanSession,
+    ScanResultBlob,
+    ScanPort,
+    ScanFinding,
+    ScanOutcomeStats,
+    FindingSeverityStats,
+    OpenServiceStats,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -32,6 +40,18 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# 모델로 관리하지 않는 테이블
+# - checkpoint*: LangGraph PostgresSaver가 직접 생성
+# - scan_sessions_p*/scan_sessions_default: scan_sessions 월 파티션 (app.services.retention이 관리)
+UNMANAGED_TABLE_PREFIXES = ("checkpoint", "scan_sessions_p", "scan_sessions_default")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """autogenerate 대상에서 외부 라이브러리 테이블 제외"""
+    if type_ == "table" and reflected and compare_to is None:
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -54,6 +74,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -77,7 +98,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
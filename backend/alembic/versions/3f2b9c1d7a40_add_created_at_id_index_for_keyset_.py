@@ -0,0 +1,28 @@
+"""Add (created_at, id) index for keyset pagination of scan_sessions
+
+Revision ID: 3f2b9c1d7a40
+Revises: e6a1d4093a1a
+Create Date: 2026-10-19 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b9c1d7a40'
+down_revision: Union[str, None] = 'e6a1d4093a1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (created_at, id) 복합 인덱스가 created_at 단일 인덱스를 대체
+    op.create_index('ix_scan_sessions_created_at_id', 'scan_sessions', ['created_at', 'id'], unique=False)
+    op.drop_index('ix_scan_sessions_created_at', table_name='scan_sessions')
+
+
+def downgrade() -> None:
+    op.create_index('ix_scan_sessions_created_at', 'scan_sessions', ['created_at'], unique=False)
+    op.drop_index('ix_scan_sessions_created_at_id', table_name='scan_sessions')
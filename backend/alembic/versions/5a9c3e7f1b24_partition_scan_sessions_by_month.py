@@ -0,0 +1,140 @@
+"""Partition scan_sessions by month (RANGE on created_at)
+
+Revision ID: 5a9c3e7f1b24
+Revises: 749d32361354
+Create Date: 2026-10-19 04:02:31.507118
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c3e7f1b24'
+down_revision: Union[str, None] = '749d32361354'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 현재 달 이후로 미리 만들어 둘 파티션 수 (이후는 retention 작업이 만든다)
+PREMAKE_MONTHS = 3
+
+# (인덱스 이름, 컬럼) - 기존 ix_scan_sessions_id는 기본 키와 중복이라 만들지 않는다
+INDEXES = (
+    ('ix_scan_sessions_created_at_id', ['created_at', 'id']),
+    ('ix_scan_sessions_target', ['target']),
+    ('ix_scan_sessions_status', ['status']),
+    ('ix_scan_sessions_batch_id', ['batch_id']),
+    ('ix_scan_sessions_linked_session_id', ['linked_session_id']),
+    ('ix_scan_sessions_result_digest', ['result_digest']),
+)
+
+COLUMNS = (
+    "id, target, scan_type, batch_id, linked_session_id, status, progress, current_step, error, "
+    "ports, vulnerabilities, risk_assessment, remediation, report, result_digest, "
+    "created_at, started_at, completed_at, updated_at"
+)
+
+
+def _columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False, comment='세션 ID (UUID)'),
+        sa.Column('target', sa.String(length=255), nullable=False, comment='스캔 대상 IP 주소'),
+        sa.Column('scan_type', postgresql.ENUM(name='scantype', create_type=False), nullable=False, comment='스캔 유형 (quick/standard/full)'),
+        sa.Column('batch_id', sa.UUID(), nullable=True, comment='배치 제출 ID (/scans:batch)'),
+        sa.Column('linked_session_id', sa.UUID(), nullable=True, comment='결과를 공유하는 진행 중 세션 ID (중복 스캔 합류 시)'),
+        sa.Column('status', postgresql.ENUM(name='scanstatus', create_type=False), nullable=False, comment='스캔 상태'),
+        sa.Column('progress', sa.Integer(), nullable=True, comment='진행률 (0-100)'),
+        sa.Column('current_step', sa.String(length=100), nullable=True, comment='현재 진행 중인 단계'),
+        sa.Column('error', sa.Text(), nullable=True, comment='에러 메시지 (실패 시)'),
+        sa.Column('ports', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='발견된 포트 목록'),
+        sa.Column('vulnerabilities', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='발견된 취약점 목록'),
+        sa.Column('risk_assessment', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='위험도 평가 결과'),
+        sa.Column('remediation', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='해결 방안'),
+        sa.Column('report', sa.Text(), nullable=True, comment='최종 보고서 (Markdown)'),
+        sa.Column('result_digest', sa.String(length=64), nullable=True, comment='압축 결과 digest (scan_result_blobs)'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='생성 시간'),
+        sa.Column('started_at', sa.DateTime(), nullable=True, comment='스캔 시작 시간'),
+        sa.Column('completed_at', sa.DateTime(), nullable=True, comment='스캔 완료 시간'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='마지막 업데이트 시간'),
+        sa.ForeignKeyConstraint(['result_digest'], ['scan_result_blobs.digest'], name='fk_scan_sessions_result_digest'),
+    ]
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _drop_observation_fks() -> None:
+    op.drop_constraint('scan_ports_session_id_fkey', 'scan_ports', type_='foreignkey')
+    op.drop_constraint('scan_findings_session_id_fkey', 'scan_findings', type_='foreignkey')
+
+
+def upgrade() -> None:
+    # 파티션 테이블의 기본 키는 파티션 키를 포함해야 하므로 (id, created_at)이 된다.
+    # id만 참조하던 scan_ports/scan_findings의 FK는 걸 수 없으므로 제거한다 (삭제는 crud에서 함께 처리).
+    _drop_observation_fks()
+
+    op.rename_table('scan_sessions', 'scan_sessions_old')
+    op.execute("ALTER TABLE scan_sessions_old RENAME CONSTRAINT scan_sessions_pkey TO scan_sessions_old_pkey")
+    for name, _ in INDEXES + (('ix_scan_sessions_id', None),):
+        op.drop_index(name, table_name='scan_sessions_old')
+
+    op.create_table(
+        'scan_sessions',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at', name='scan_sessions_pkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+
+    # 기존 데이터가 있는 달부터 현재 달 + PREMAKE_MONTHS까지 월 파티션 생성
+    conn = op.get_bind()
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM scan_sessions_old")).scalar()
+    this_month = datetime.utcnow().date().replace(day=1)
+    month = (oldest.date().replace(day=1) if oldest else this_month)
+    last = _add_months(this_month, PREMAKE_MONTHS)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE scan_sessions_p{month:%Y_%m} PARTITION OF scan_sessions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    # 파티션이 아직 없는 달의 행을 받는 기본 파티션
+    op.execute("CREATE TABLE scan_sessions_default PARTITION OF scan_sessions DEFAULT")
+
+    op.execute(f"INSERT INTO scan_sessions ({COLUMNS}) SELECT {COLUMNS} FROM scan_sessions_old")
+    op.drop_table('scan_sessions_old')
+
+    # 인덱스는 데이터를 옮긴 뒤 만든다 (부모에 만들면 모든 파티션에 전파)
+    for name, columns in INDEXES:
+        op.create_index(name, 'scan_sessions', columns, unique=False)
+
+
+def downgrade() -> None:
+    # 분리(아카이브)된 파티션의 행은 복구하지 않는다
+    op.rename_table('scan_sessions', 'scan_sessions_partitioned')
+    op.execute("ALTER TABLE scan_sessions_partitioned RENAME CONSTRAINT scan_sessions_pkey TO scan_sessions_partitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='scan_sessions_partitioned')
+
+    op.create_table(
+        'scan_sessions',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', name='scan_sessions_pkey'),
+    )
+    op.execute(f"INSERT INTO scan_sessions ({COLUMNS}) SELECT {COLUMNS} FROM scan_sessions_partitioned")
+    op.drop_table('scan_sessions_partitioned')
+
+    for name, columns in INDEXES + (('ix_scan_sessions_id', ['id']),):
+        op.create_index(name, 'scan_sessions', columns, unique=False)
+
+    # 세션이 없는 관측 행은 FK를 다시 걸기 전에 정리
+    op.execute("DELETE FROM scan_ports p WHERE NOT EXISTS (SELECT 1 FROM scan_sessions s WHERE s.id = p.session_id)")
+    op.execute("DELETE FROM scan_findings f WHERE NOT EXISTS (SELECT 1 FROM scan_sessions s WHERE s.id = f.session_id)")
+    op.create_foreign_key('scan_ports_session_id_fkey', 'scan_ports', 'scan_sessions', ['session_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('scan_findings_session_id_fkey', 'scan_findings', 'scan_sessions', ['session_id'], ['id'], ondelete='CASCADE')
@@ -0,0 +1,147 @@
+"""Add normalized scan_ports and scan_findings tables and backfill them
+
+Revision ID: 749d32361354
+Revises: d41f6a2c9e73
+Create Date: 2026-10-19 03:37:45.788644
+
+"""
+from typing import Sequence, Union
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '749d32361354'
+down_revision: Union[str, None] = 'd41f6a2c9e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# 결과를 가진 세션 (합류 세션은 소유 세션과 같은 결과이므로 제외)
+RESULT_SESSIONS = (
+    "s.linked_session_id IS NULL "
+    "AND s.status IN ('COMPLETED', 'CANCELLED', 'TIMED_OUT')"
+)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def upgrade() -> None:
+    op.create_table('scan_findings',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='행 ID'),
+    sa.Column('session_id', sa.UUID(), nullable=False, comment='스캔 세션 ID'),
+    sa.Column('target', sa.String(length=255), nullable=False, comment='스캔 대상 IP 주소'),
+    sa.Column('port', sa.Integer(), nullable=True, comment='포트 번호'),
+    sa.Column('service', sa.String(length=64), nullable=True, comment='서비스 이름'),
+    sa.Column('type', sa.String(length=64), nullable=False, comment='취약점 유형 (예: MySQL, Telnet)'),
+    sa.Column('severity', sa.String(length=16), nullable=False, comment='심각도 (Low/Medium/High/Critical)'),
+    sa.Column('description', sa.Text(), nullable=True, comment='설명'),
+    sa.Column('created_at', sa.DateTime(), nullable=False, comment='관측 시간 (스캔 완료 시간)'),
+    sa.ForeignKeyConstraint(['session_id'], ['scan_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scan_findings_session_id'), 'scan_findings', ['session_id'], unique=False)
+    op.create_index(op.f('ix_scan_findings_severity'), 'scan_findings', ['severity'], unique=False)
+    op.create_index('ix_scan_findings_target_created_at', 'scan_findings', ['target', 'created_at'], unique=False)
+    op.create_table('scan_ports',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='행 ID'),
+    sa.Column('session_id', sa.UUID(), nullable=False, comment='스캔 세션 ID'),
+    sa.Column('target', sa.String(length=255), nullable=False, comment='스캔 대상 IP 주소'),
+    sa.Column('port', sa.Integer(), nullable=False, comment='포트 번호'),
+    sa.Column('state', sa.String(length=16), nullable=False, comment='포트 상태'),
+    sa.Column('service', sa.String(length=64), nullable=True, comment='서비스 이름'),
+    sa.Column('version', sa.String(length=255), nullable=True, comment='서비스 버전'),
+    sa.Column('created_at', sa.DateTime(), nullable=False, comment='관측 시간 (스캔 완료 시간)'),
+    sa.ForeignKeyConstraint(['session_id'], ['scan_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scan_ports_port_service', 'scan_ports', ['port', 'service'], unique=False)
+    op.create_index(op.f('ix_scan_ports_session_id'), 'scan_ports', ['session_id'], unique=False)
+    op.create_index('ix_scan_ports_target_created_at', 'scan_ports', ['target', 'created_at'], unique=False)
+
+    # 기존 결과 backfill (관측 시간은 스캔 완료 시간)
+    # 1) JSONB 컬럼에 있는 결과는 SQL로 바로 펼친다
+    op.execute(
+        "INSERT INTO scan_ports (session_id, target, port, state, service, version, created_at) "
+        "SELECT s.id, s.target, (p->>'port')::int, COALESCE(p->>'state', 'open'), "
+        "p->>'service', p->>'version', COALESCE(s.completed_at, s.created_at) "
+        "FROM scan_sessions s, jsonb_array_elements(s.ports) p "
+        f"WHERE jsonb_typeof(s.ports) = 'array' AND {RESULT_SESSIONS}"
+    )
+    op.execute(
+        "INSERT INTO scan_findings (session_id, target, port, service, type, severity, description, created_at) "
+        "SELECT s.id, s.target, (v->>'port')::int, v->>'service', v->>'type', v->>'severity', "
+        "v->>'description', COALESCE(s.completed_at, s.created_at) "
+        "FROM scan_sessions s, jsonb_array_elements(s.vulnerabilities) v "
+        f"WHERE jsonb_typeof(s.vulnerabilities) = 'array' AND {RESULT_SESSIONS}"
+    )
+
+    # 2) 압축 저장소에 있는 결과는 압축을 풀어 삽입 (id 순서로 배치 처리)
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT s.id, s.target, COALESCE(s.completed_at, s.created_at) AS observed_at, "
+            "b.codec, b.data "
+            "FROM scan_sessions s JOIN scan_result_blobs b ON b.digest = s.result_digest "
+            f"WHERE {RESULT_SESSIONS} "
+            + ("AND s.id > :last_id " if last_id else "")
+            + "ORDER BY s.id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).mappings().all()
+        if not rows:
+            break
+
+        ports, findings = [], []
+        for row in rows:
+            payload = json.loads(_decompress(row["codec"], row["data"]))
+            common = {"session_id": row["id"], "target": row["target"], "created_at": row["observed_at"]}
+            for p in payload.get("ports") or []:
+                ports.append({
+                    **common,
+                    "port": p["port"],
+                    "state": p.get("state", "open"),
+                    "service": p.get("service"),
+                    "version": p.get("version"),
+                })
+            for v in payload.get("vulnerabilities") or []:
+                findings.append({
+                    **common,
+                    "port": v.get("port"),
+                    "service": v.get("service"),
+                    "type": v["type"],
+                    "severity": v["severity"],
+                    "description": v.get("description"),
+                })
+
+        if ports:
+            conn.execute(sa.text(
+                "INSERT INTO scan_ports (session_id, target, port, state, service, version, created_at) "
+                "VALUES (:session_id, :target, :port, :state, :service, :version, :created_at)"
+            ), ports)
+        if findings:
+            conn.execute(sa.text(
+                "INSERT INTO scan_findings (session_id, target, port, service, type, severity, description, created_at) "
+                "VALUES (:session_id, :target, :port, :service, :type, :severity, :description, :created_at)"
+            ), findings)
+
+        last_id = rows[-1]["id"]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_ports_target_created_at', table_name='scan_ports')
+    op.drop_index(op.f('ix_scan_ports_session_id'), table_name='scan_ports')
+    op.drop_index('ix_scan_ports_port_service', table_name='scan_ports')
+    op.drop_table('scan_ports')
+    op.drop_index('ix_scan_findings_target_created_at', table_name='scan_findings')
+    op.drop_index(op.f('ix_scan_findings_severity'), table_name='scan_findings')
+    op.drop_index(op.f('ix_scan_findings_session_id'), table_name='scan_findings')
+    op.drop_table('scan_findings')
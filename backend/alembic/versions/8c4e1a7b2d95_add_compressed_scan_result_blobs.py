@@ -0,0 +1,140 @@
+"""Add compressed scan_result_blobs store (backfill existing results when RESULT_STORE=compressed)
+
+Revision ID: 8c4e1a7b2d95
+Revises: 3f2b9c1d7a40
+Create Date: 2026-10-19 11:40:03.502117
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+import hashlib
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1a7b2d95'
+down_revision: Union[str, None] = '3f2b9c1d7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RESULT_FIELDS = ("ports", "vulnerabilities", "risk_assessment", "remediation", "report")
+BATCH_SIZE = 500
+
+
+def _compress(raw: bytes):
+    try:
+        import zstandard
+        return "zstd", zstandard.ZstdCompressor(level=9).compress(raw)
+    except ImportError:
+        return "zlib", zlib.compress(raw, 9)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False) if value is not None else None
+
+
+def upgrade() -> None:
+    op.create_table('scan_result_blobs',
+    sa.Column('digest', sa.String(length=64), nullable=False, comment='원본 JSON의 SHA-256 (content address)'),
+    sa.Column('codec', sa.String(length=16), nullable=False, comment='압축 방식 (zstd/zlib)'),
+    sa.Column('raw_size', sa.Integer(), nullable=False, comment='압축 전 크기 (bytes)'),
+    sa.Column('data', sa.LargeBinary(), nullable=False, comment='압축된 결과 JSON'),
+    sa.Column('created_at', sa.DateTime(), nullable=False, comment='생성 시간'),
+    sa.PrimaryKeyConstraint('digest')
+    )
+    op.add_column('scan_sessions', sa.Column('result_digest', sa.String(length=64), nullable=True, comment='압축 결과 digest (scan_result_blobs)'))
+    op.create_foreign_key('fk_scan_sessions_result_digest', 'scan_sessions', 'scan_result_blobs', ['result_digest'], ['digest'])
+    op.create_index(op.f('ix_scan_sessions_result_digest'), 'scan_sessions', ['result_digest'], unique=False)
+
+    # 기존 결과는 RESULT_STORE=compressed일 때만 압축 저장소로 옮긴다
+    # (inline이면 그대로 둔다. 나중에 compressed로 바꾸면 python -m app.services.result_backfill)
+    if settings.RESULT_STORE == "compressed":
+        _backfill()
+
+
+def _backfill() -> None:
+    # 기존 결과를 압축 저장소로 이동 (id 순서로 배치 처리)
+    # 테이블 공간은 이후 VACUUM FULL(또는 pg_repack)을 해야 반환된다
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, ports, vulnerabilities, risk_assessment, remediation, report "
+            "FROM scan_sessions "
+            "WHERE result_digest IS NULL "
+            "AND (ports IS NOT NULL OR report IS NOT NULL OR risk_assessment IS NOT NULL) "
+            + ("AND id > :last_id " if last_id else "")
+            + "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).mappings().all()
+        if not rows:
+            break
+
+        for row in rows:
+            payload = {field: row[field] for field in RESULT_FIELDS}
+            raw = json.dumps(
+                payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+            ).encode("utf-8")
+            digest = hashlib.sha256(raw).hexdigest()
+            codec, data = _compress(raw)
+
+            conn.execute(sa.text(
+                "INSERT INTO scan_result_blobs (digest, codec, raw_size, data, created_at) "
+                "VALUES (:digest, :codec, :raw_size, :data, :created_at) "
+                "ON CONFLICT (digest) DO NOTHING"
+            ), {
+                "digest": digest,
+                "codec": codec,
+                "raw_size": len(raw),
+                "data": data,
+                "created_at": datetime.utcnow(),
+            })
+            conn.execute(sa.text(
+                "UPDATE scan_sessions SET result_digest = :digest, ports = NULL, "
+                "vulnerabilities = NULL, risk_assessment = NULL, remediation = NULL, report = NULL "
+                "WHERE id = :id"
+            ), {"digest": digest, "id": row["id"]})
+
+        last_id = rows[-1]["id"]
+
+
+def downgrade() -> None:
+    # 압축 결과를 결과 컬럼으로 되돌린 후 저장소 제거
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT s.id, b.codec, b.data FROM scan_sessions s "
+        "JOIN scan_result_blobs b ON b.digest = s.result_digest"
+    )).mappings().all()
+    for row in rows:
+        payload = json.loads(_decompress(row["codec"], row["data"]))
+        conn.execute(sa.text(
+            "UPDATE scan_sessions SET ports = CAST(:ports AS JSONB), "
+            "vulnerabilities = CAST(:vulnerabilities AS JSONB), "
+            "risk_assessment = CAST(:risk_assessment AS JSONB), "
+            "remediation = CAST(:remediation AS JSONB), report = :report "
+            "WHERE id = :id"
+        ), {
+            "id": row["id"],
+            "ports": _dumps(payload["ports"]),
+            "vulnerabilities": _dumps(payload["vulnerabilities"]),
+            "risk_assessment": _dumps(payload["risk_assessment"]),
+            "remediation": _dumps(payload["remediation"]),
+            "report": payload["report"],
+        })
+
+    op.drop_index(op.f('ix_scan_sessions_result_digest'), table_name='scan_sessions')
+    op.drop_constraint('fk_scan_sessions_result_digest', 'scan_sessions', type_='foreignkey')
+    op.drop_column('scan_sessions', 'result_digest')
+    op.drop_table('scan_result_blobs')
@@ -0,0 +1,71 @@
+"""Add daily rollup tables for dashboard statistics and backfill them
+
+Revision ID: a3e8f2d6c915
+Revises: 5a9c3e7f1b24
+Create Date: 2026-10-19 04:31:12.840275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e8f2d6c915'
+down_revision: Union[str, None] = '5a9c3e7f1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('finding_severity_stats',
+    sa.Column('day', sa.Date(), nullable=False, comment='관측 날짜 (UTC)'),
+    sa.Column('severity', sa.String(length=16), nullable=False, comment='심각도'),
+    sa.Column('findings', sa.Integer(), nullable=False, comment='관측 수'),
+    sa.PrimaryKeyConstraint('day', 'severity')
+    )
+    op.create_table('open_service_stats',
+    sa.Column('day', sa.Date(), nullable=False, comment='관측 날짜 (UTC)'),
+    sa.Column('service', sa.String(length=64), nullable=False, comment='서비스 이름 (없으면 unknown)'),
+    sa.Column('port', sa.Integer(), nullable=False, comment='포트 번호'),
+    sa.Column('observations', sa.Integer(), nullable=False, comment='관측 수'),
+    sa.PrimaryKeyConstraint('day', 'service', 'port')
+    )
+    op.create_table('scan_outcome_stats',
+    sa.Column('day', sa.Date(), nullable=False, comment='완료 날짜 (UTC)'),
+    sa.Column('scan_type', postgresql.ENUM(name='scantype', create_type=False), nullable=False, comment='스캔 유형'),
+    sa.Column('status', postgresql.ENUM(name='scanstatus', create_type=False), nullable=False, comment='종료 상태'),
+    sa.Column('sessions', sa.Integer(), nullable=False, comment='세션 수'),
+    sa.Column('duration_count', sa.Integer(), nullable=False, comment='소요 시간이 있는 세션 수 (시작 시간이 있는 세션)'),
+    sa.Column('duration_sum', sa.Float(), nullable=False, comment='소요 시간 합계 (초)'),
+    sa.PrimaryKeyConstraint('day', 'scan_type', 'status')
+    )
+
+    # 기존 데이터로 초기 집계 (이후에는 crud가 상태 변경 시 증분 갱신)
+    op.execute(
+        "INSERT INTO scan_outcome_stats (day, scan_type, status, sessions, duration_count, duration_sum) "
+        "SELECT CAST(COALESCE(completed_at, updated_at) AS date), scan_type, status, count(*), "
+        "count(started_at), "
+        "COALESCE(sum(EXTRACT(EPOCH FROM COALESCE(completed_at, updated_at) - started_at)), 0) "
+        "FROM scan_sessions "
+        "WHERE status IN ('COMPLETED', 'FAILED', 'CANCELLED', 'TIMED_OUT') "
+        "GROUP BY 1, 2, 3"
+    )
+    op.execute(
+        "INSERT INTO open_service_stats (day, service, port, observations) "
+        "SELECT CAST(created_at AS date), COALESCE(service, 'unknown'), port, count(*) "
+        "FROM scan_ports GROUP BY 1, 2, 3"
+    )
+    op.execute(
+        "INSERT INTO finding_severity_stats (day, severity, findings) "
+        "SELECT CAST(created_at AS date), severity, count(*) "
+        "FROM scan_findings GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scan_outcome_stats')
+    op.drop_table('open_service_stats')
+    op.drop_table('finding_severity_stats')
@@ -0,0 +1,32 @@
+"""Add batch_id and linked_session_id to scan_sessions
+
+Revision ID: b7d3e5f1c208
+Revises: 8c4e1a7b2d95
+Create Date: 2026-10-19 13:05:27.681944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e5f1c208'
+down_revision: Union[str, None] = '8c4e1a7b2d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scan_sessions', sa.Column('batch_id', sa.UUID(), nullable=True, comment='배치 제출 ID (/scans:batch)'))
+    op.add_column('scan_sessions', sa.Column('linked_session_id', sa.UUID(), nullable=True, comment='결과를 공유하는 진행 중 세션 ID (중복 스캔 합류 시)'))
+    op.create_index(op.f('ix_scan_sessions_batch_id'), 'scan_sessions', ['batch_id'], unique=False)
+    op.create_index(op.f('ix_scan_sessions_linked_session_id'), 'scan_sessions', ['linked_session_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scan_sessions_linked_session_id'), table_name='scan_sessions')
+    op.drop_index(op.f('ix_scan_sessions_batch_id'), table_name='scan_sessions')
+    op.drop_column('scan_sessions', 'linked_session_id')
+    op.drop_column('scan_sessions', 'batch_id')
@@ -0,0 +1,37 @@
+"""Add CANCELLED and TIMED_OUT to scanstatus
+
+Revision ID: d41f6a2c9e73
+Revises: b7d3e5f1c208
+Create Date: 2026-10-19 15:42:10.214583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f6a2c9e73'
+down_revision: Union[str, None] = 'b7d3e5f1c208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE는 트랜잭션 블록 안에서 실행할 수 없다 (PostgreSQL < 12)
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE scanstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+        op.execute("ALTER TYPE scanstatus ADD VALUE IF NOT EXISTS 'TIMED_OUT'")
+
+
+def downgrade() -> None:
+    # enum 값은 삭제할 수 없으므로 타입을 다시 만든다 (취소/타임아웃 세션은 FAILED로 변환)
+    op.execute("UPDATE scan_sessions SET status = 'FAILED' WHERE status IN ('CANCELLED', 'TIMED_OUT')")
+    op.execute("ALTER TYPE scanstatus RENAME TO scanstatus_old")
+    sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='scanstatus').create(op.get_bind())
+    op.execute(
+        "ALTER TABLE scan_sessions ALTER COLUMN status TYPE scanstatus "
+        "USING status::text::scanstatus"
+    )
+    op.execute("DROP TYPE scanstatus_old")
@@ -0,0 +1,87 @@
+"""
+보관된 스캔 세션 조회 API
+
+retention 작업이 파티션 단위로 보관한 gzip NDJSON 파일을 요청 시 읽는다.
+파일 읽기가 블로킹이므로 핸들러는 동기 함수로 두어 스레드 풀에서 실행한다.
+"""
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+from datetime import date
+import itertools
+import logging
+
+from app.models.scan_session import ScanStatus
+from app.schemas.archive import ArchiveFile, ArchiveListResponse, ArchivedSessionListResponse
+from app.schemas.scan_request import SessionListItem
+from app.services.retention import iter_archived_sessions, list_archives
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+MONTH_PATTERN = r"^\d{4}-\d{2}$"
+
+
+def _parse_month(value: Optional[str]) -> Optional[date]:
+    if value is None:
+        return None
+    year, month = value.split("-")
+    if not 1 <= int(month) <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid month: {value}"
+        )
+    return date(int(year), int(month), 1)
+
+
+@router.get("", response_model=ArchiveListResponse)
+def get_archives():
+    """월별 보관 파일 목록"""
+    return ArchiveListResponse(archives=[ArchiveFile(**a) for a in list_archives()])
+
+
+@router.get("/sessions", response_model=ArchivedSessionListResponse)
+def list_archived_sessions(
+    month_from: Optional[str] = Query(None, alias="from", pattern=MONTH_PATTERN, description="시작 월 (YYYY-MM)"),
+    month_to: Optional[str] = Query(None, alias="to", pattern=MONTH_PATTERN, description="끝 월 (YYYY-MM, 포함)"),
+    target: Optional[str] = None,
+    status_filter: Optional[ScanStatus] = Query(None, alias="status"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    보관된 세션 목록 (생성 시간 오름차순)
+
+    월 범위를 지정하면 해당 월의 보관 파일만 읽습니다.
+    """
+    records = iter_archived_sessions(
+        month_from=_parse_month(month_from),
+        month_to=_parse_month(month_to),
+        target=target,
+        status=status_filter.value if status_filter else None,
+    )
+    return ArchivedSessionListResponse(
+        items=[SessionListItem(**record) for record in itertools.islice(records, limit)]
+    )
+
+
+@router.get("/sessions/{session_id}")
+def get_archived_session(
+    session_id: str,
+    month: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="생성 월을 알면 지정 (YYYY-MM)"),
+):
+    """
+    보관된 세션 하나 조회 (결과 포함)
+
+    month를 지정하지 않으면 세션 ID의 생성 시각으로 보관 파일을 고릅니다
+    (시각을 담지 않은 예전 ID는 모든 보관 파일을 읽습니다).
+    """
+    parsed = _parse_month(month)
+    record = next(
+        iter_archived_sessions(month_from=parsed, month_to=parsed, session_id=session_id),
+        None,
+    )
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Archived session not found: {session_id}"
+        )
+    return record
@@ -0,0 +1,67 @@
+"""
+배치 스캔 API 엔드포인트
+"""
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+import asyncio
+import logging
+import uuid
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.schemas.scan_request import BatchScanItem, BatchScanRequest, BatchScanResponse
+from app.services.batch_scan_service import batch_exists, stream_batch_results, submit_batch
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/scans:batch", response_model=BatchScanResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_batch_scan(request: BatchScanRequest, db: Session = Depends(get_db)):
+    """
+    여러 대상 스캔을 한 번에 등록
+
+    - **targets**: 스캔 대상 IP 주소 목록 (중복은 하나로 합침)
+    - **scan_type**: 모든 대상에 적용할 스캔 유형
+
+    결과는 `/scans:batch/{batch_id}/results`에서 NDJSON으로 스트리밍됩니다.
+    """
+    if len(request.targets) > settings.MAX_BATCH_TARGETS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many targets: {len(request.targets)} (max {settings.MAX_BATCH_TARGETS})"
+        )
+
+    batch_id, sessions = submit_batch(db, request.targets, request.scan_type)
+
+    return BatchScanResponse(
+        batch_id=batch_id,
+        scan_type=request.scan_type,
+        sessions=[BatchScanItem(**item) for item in sessions],
+    )
+
+
+@router.get("/scans:batch/{batch_id}/results")
+async def stream_batch_scan_results(batch_id: str):
+    """
+    배치 결과 스트리밍 (application/x-ndjson)
+
+    세션이 끝나는 순서대로 한 줄에 하나씩 결과를 보내고, 모든 세션이 끝나면 종료합니다.
+    """
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Batch not found: {batch_id}"
+    )
+    try:
+        batch_id = str(uuid.UUID(batch_id))
+    except ValueError:
+        raise not_found
+    if not await asyncio.to_thread(batch_exists, batch_id):
+        raise not_found
+
+    return StreamingResponse(
+        stream_batch_results(batch_id),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,141 @@
+"""
+스캔 진행 이벤트 스트리밍 엔드포인트 (WebSocket / SSE)
+"""
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
+import json
+import logging
+import uuid
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import TERMINAL_EVENTS, Subscription, get_event_bus, make_event, session_channel
+from app.models import crud
+from app.models.scan_session import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+TERMINAL_STATUS_VALUES = {scan_status.value for scan_status in TERMINAL_STATUSES}
+
+
+def _load_snapshot(session_id: str) -> Optional[dict]:
+    """현재 세션 상태를 스냅샷 이벤트로 반환 (스트림 동안 DB 연결을 잡지 않도록 즉시 닫음)"""
+    db = SessionLocal()
+    try:
+        db_session = crud.get_scan_session(db, session_id)
+        if not db_session:
+            return None
+        return make_event(
+            "snapshot",
+            session_id,
+            status=db_session.status.value,
+            step=db_session.current_step,
+            progress=db_session.progress,
+            error=db_session.error,
+        )
+    finally:
+        db.close()
+
+
+async def _subscribe(session_id: str) -> Tuple[Optional[Subscription], Optional[dict]]:
+    """
+    세션 채널을 구독하고 현재 상태 스냅샷을 읽는다 (세션이 없으면 (None, None))
+
+    스냅샷과 구독 사이에 발생한 이벤트를 놓치지 않도록 먼저 구독하고,
+    스냅샷을 읽지 못하면 구독을 닫는다. DB 조회는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+    try:
+        uuid.UUID(session_id)
+    except ValueError:
+        return None, None
+
+    subscription = await get_event_bus().subscribe(session_channel(session_id))
+    try:
+        snapshot = await asyncio.to_thread(_load_snapshot, session_id)
+    except BaseException:
+        await subscription.close()
+        raise
+    if snapshot is None:
+        await subscription.close()
+        return None, None
+    return subscription, snapshot
+
+
+async def _event_stream(session_id: str, snapshot: dict, subscription) -> AsyncIterator[Optional[dict]]:
+    """
+    스냅샷 이후 이벤트를 순서대로 반환
+    하트비트 주기 동안 이벤트가 없으면 None을 반환한다
+    """
+    async with subscription:
+        yield snapshot
+        if snapshot["status"] in TERMINAL_STATUS_VALUES:
+            return
+
+        while True:
+            event = await subscription.get(timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            yield event
+            if event and event["type"] in TERMINAL_EVENTS:
+                return
+
+
+@router.websocket("/scan/{session_id}/events")
+async def scan_events_websocket(websocket: WebSocket, session_id: str):
+    """
+    스캔 진행 상황 WebSocket
+
+    연결 직후 현재 상태(snapshot)를 보내고, 이후 단계 전환/부분 포트/완료 이벤트를 전송
+    """
+    subscription, snapshot = await _subscribe(session_id)
+    if snapshot is None:
+        await websocket.close(code=1008, reason="Session not found")
+        return
+
+    try:
+        await websocket.accept()
+        async for event in _event_stream(session_id, snapshot, subscription):
+            if event is None:
+                await websocket.send_json(make_event("heartbeat", session_id))
+            else:
+                await websocket.send_json(event)
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket disconnected for session {session_id}")
+    finally:
+        # 스트림을 시작하기 전에 끝난 경우에도 구독 해제
+        await subscription.close()
+
+
+@router.get("/scan/{session_id}/events")
+async def scan_events_sse(session_id: str):
+    """
+    스캔 진행 상황 Server-Sent Events
+
+    WebSocket과 동일한 이벤트를 text/event-stream으로 전송
+    """
+    subscription, snapshot = await _subscribe(session_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan session not found: {session_id}"
+        )
+
+    async def sse():
+        async for event in _event_stream(session_id, snapshot, subscription):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                data = json.dumps(event, ensure_ascii=False)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 본문을 보내기 전에 클라이언트가 끊으면 sse()가 시작되지 않으므로 응답이 끝난 뒤 해제
+        background=BackgroundTask(subscription.close),
+    )
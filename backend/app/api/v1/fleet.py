@@ -0,0 +1,89 @@
+"""
+여러 호스트에 걸친 포트/취약점 조회 API
+
+scan_ports/scan_findings 테이블을 인덱스로 조회한다 (스캔 결과 JSON은 읽지 않음).
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+import logging
+
+from app.core.database import get_read_db
+from app.models import crud
+from app.schemas.fleet import (
+    FindingItem,
+    FindingListResponse,
+    FindingSummaryResponse,
+    OpenPortItem,
+    OpenPortListResponse,
+    SeverityCount,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/ports", response_model=OpenPortListResponse)
+async def list_open_ports(
+    port: Optional[int] = Query(None, ge=1, le=65535, description="포트 번호"),
+    service: Optional[str] = Query(None, description="서비스 이름 (예: mysql)"),
+    target: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="관측 시간 하한 (포함)"),
+    until: Optional[datetime] = Query(None, description="관측 시간 상한 (미포함)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    """
+    열린 포트가 관측된 호스트 목록
+
+    예: `GET /ports?port=3306&since=2026-10-12T00:00:00` → 지난주 3306 포트가 열려 있던 호스트
+    """
+    rows = crud.query_open_ports(
+        db, limit, port=port, service=service, target=target, since=since, until=until
+    )
+    return OpenPortListResponse(items=[OpenPortItem(**row._asdict()) for row in rows])
+
+
+@router.get("/findings", response_model=FindingListResponse)
+async def list_findings(
+    severity: Optional[List[str]] = Query(None, description="심각도 (여러 번 지정 가능)"),
+    target: Optional[str] = None,
+    finding_type: Optional[str] = Query(None, alias="type", description="취약점 유형"),
+    since: Optional[datetime] = Query(None, description="관측 시간 하한 (포함)"),
+    until: Optional[datetime] = Query(None, description="관측 시간 상한 (미포함)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    """취약점 관측 목록 (최신순)"""
+    findings = crud.query_findings(
+        db, limit, severity=severity, target=target,
+        finding_type=finding_type, since=since, until=until,
+    )
+    return FindingListResponse(items=[
+        FindingItem(
+            session_id=str(f.session_id),
+            target=f.target,
+            port=f.port,
+            service=f.service,
+            type=f.type,
+            severity=f.severity,
+            description=f.description,
+            observed_at=f.created_at,
+        )
+        for f in findings
+    ])
+
+
+@router.get("/findings/summary", response_model=FindingSummaryResponse)
+async def summarize_findings(
+    target: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="관측 시간 하한 (포함)"),
+    until: Optional[datetime] = Query(None, description="관측 시간 상한 (미포함)"),
+    db: Session = Depends(get_read_db),
+):
+    """심각도별 취약점 관측 수와 호스트 수"""
+    rows = crud.count_findings_by_severity(db, target=target, since=since, until=until)
+    return FindingSummaryResponse(by_severity={
+        row.severity: SeverityCount(findings=row.findings, hosts=row.hosts) for row in rows
+    })
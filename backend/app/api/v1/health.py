@@ -1,29 +1,75 @@
 """
 헬스체크 API 엔드포인트
 """
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 from datetime import datetime
+import logging
+
+from app.core import health_probes
 from app.core.config import settings
+from app.core.database import engine, replica_router
+from app.core.db_metrics import pool_status
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.get("/health", status_code=status.HTTP_200_OK)
-async def health_check():
-    """서버 헬스 체크"""
+async def health_check(response: Response):
+    """
+    서버 헬스 체크
+
+    백그라운드 프로브의 마지막 결과로 판정한다 (요청마다 의존성을 확인하지 않음).
+    DB/Redis를 사용할 수 없거나 프로브가 멈췄으면 503 (unhealthy),
+    LLM/nmap만 사용할 수 없으면 200 (degraded).
+    """
+    overall = "healthy"
+    if settings.HEALTH_PROBE_INTERVAL > 0:
+        overall = health_probes.overall_status()
+    if overall == "unhealthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return {
-        "status": "healthy",
+        "status": overall,
         "timestamp": datetime.utcnow().isoformat(),
         "version": settings.APP_VERSION,
     }
 
 
 @router.get("/status", status_code=status.HTTP_200_OK)
-async def status():
-    """서비스 상태 확인"""
+async def service_status():
+    """
+    서비스 상태 확인
+
+    의존성별 마지막 확인 결과 (ok / unavailable / not_configured, 지연 ms, 오류, 확인 시각).
+    HEALTH_PROBE_INTERVAL=0이면 not_checked.
+    """
+    checks = health_probes.snapshot()
+
+    def state(name: str) -> str:
+        return checks[name]["status"] if name in checks else "not_checked"
+
     return {
         "api": "operational",
-        "database": "not_configured",  # Phase 2.4에서 구현
-        "redis": "not_configured",
-        "openai": "configured" if settings.OPENAI_API_KEY else "not_configured",
+        "database": state("database"),
+        "redis": state("redis"),
+        "cache": settings.CACHE_BACKEND,
+        "openai": state("llm"),
+        "nmap": state("nmap"),
+        "stale": settings.HEALTH_PROBE_INTERVAL > 0 and health_probes.is_stale(),
+        "checks": checks,
+    }
+
+
+@router.get("/health/db")
+def db_pool_status():
+    """
+    DB 연결 풀 상태
+
+    현재 체크아웃/오버플로 연결 수와 프로세스 시작 이후 누적 지표
+    (체크아웃 대기 시간, 대기 타임아웃, pre-ping 실패 등), replica별 마지막 복제 지연
+    """
+    return {
+        "role": settings.PROCESS_ROLE,
+        "pool": pool_status(engine),
+        "replicas": replica_router.status(),
     }
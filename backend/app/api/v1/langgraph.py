@@ -1,102 +1,158 @@
 """
 LangGraph 스캔 API 엔드포인트 (DB 연동)
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
-import logging
+from typing import Optional
 from datetime import datetime
+import asyncio
+import logging
 
 from app.schemas.scan_request import (
     ScanRequest,
     ScanResponse,
     ScanStatusResponse,
     ScanResultResponse,
+    SessionCountResponse,
+    SessionListItem,
+    SessionListResponse,
+)
+from app.services.async_scan_service import (
+    ScanNotCancellable,
+    ScanNotResumable,
+    cancel_scan,
+    resume_scan,
+    start_or_attach,
 )
-from app.services.langgraph_service import LangGraphService
-from app.core.database import get_db
-from app.models.scan_session import ScanSession, ScanStatus, ScanType
+from app.services import profiling, report_renderer, scan_cache
+from app.services.checkpointer import delete_checkpoint
+from app.core.database import get_db, get_read_db, with_primary_fallback
+from app.core.replicas import mark_written
+from app.models import crud
+from app.models.scan_session import RESULT_STATUSES, ScanStatus
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
+# 스캔을 실행하는 라우트 (APP_PROFILE=full에서만 등록)
+scan_router = APIRouter()
 
 
-@router.post("/scan", response_model=ScanResponse, status_code=status.HTTP_202_ACCEPTED)
+@scan_router.post("/scan", response_model=ScanResponse, status_code=status.HTTP_202_ACCEPTED)
 async def start_scan(request: ScanRequest, db: Session = Depends(get_db)):
     """
-    보안 스캔 시작
+    보안 스캔 시작 (백그라운드 실행)
 
     - **target**: 스캔 대상 IP 주소
     - **scan_type**: quick(1-1000포트), standard(1-10000포트), full(전체포트)
+
+    진행 상황은 `/scan/{session_id}/events` (WebSocket/SSE)로 구독할 수 있습니다.
+    같은 대상/유형의 스캔이 이미 진행 중이면 새로 실행하지 않고 해당 세션 ID를 반환합니다.
     """
-    # DB에 세션 생성
-    db_session = ScanSession(
-        target=request.target,
-        scan_type=ScanType(request.scan_type),  # 이미 소문자 값 (quick/standard/full)
-        status=ScanStatus.PENDING,
-        progress=0,
-        started_at=datetime.utcnow(),
+    # 세션 생성 후 워커 풀에서 실행 (진행 상황은 DB와 이벤트 버스로 전달)
+    session_id, future = start_or_attach(db, request.target, request.scan_type)
+    # 생성 직후 상태 조회가 replica에서 404가 나지 않도록 primary에서 읽게 한다
+    mark_written(session_id)
+
+    if future is None:
+        return ScanResponse(
+            session_id=session_id,
+            status=ScanStatus.RUNNING.value,
+            message="Attached to in-flight scan"
+        )
+
+    return ScanResponse(
+        session_id=session_id,
+        status=ScanStatus.PENDING.value,
+        message="Scan started"
     )
-    db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
 
-    session_id = str(db_session.id)
-    logger.info(f"Scan session created: {session_id} for target {request.target}")
 
-    # 동기 실행 (Phase 3에서 비동기로 변경)
+@scan_router.post(
+    "/scan/{session_id}/resume",
+    response_model=ScanResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def resume_scan_session(session_id: str, db: Session = Depends(get_db)):
+    """
+    실패했거나 중단된 스캔 재개
+
+    - **session_id**: 스캔 세션 ID
+
+    마지막으로 완료된 단계 다음부터 실행합니다 (포트 스캔이 끝났다면 다시 스캔하지 않음).
+    """
     try:
-        # 상태 업데이트: running
-        db_session.status = ScanStatus.RUNNING
-        db.commit()
-
-        # LangGraph 서비스 실행
-        service = LangGraphService()
-        result = service.run_scan(request.target, request.scan_type)
-
-        # 결과를 DB에 저장
-        db_session.status = ScanStatus.COMPLETED
-        db_session.progress = 100
-        db_session.completed_at = datetime.utcnow()
-        db_session.ports = result.get("ports")
-        db_session.vulnerabilities = result.get("vulnerabilities")
-        db_session.risk_assessment = result.get("risk_assessment")
-        db_session.remediation = result.get("remediation")
-        db_session.report = result.get("report")
-        db.commit()
-
-        logger.info(f"Scan completed for session {session_id}")
+        future = resume_scan(db, session_id)
+    except ScanNotResumable as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    mark_written(session_id)
 
-        return ScanResponse(
-            session_id=session_id,
-            status="completed",
-            message="Scan completed successfully"
+    if future is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan session not found: {session_id}"
         )
 
-    except Exception as e:
-        logger.error(f"Scan failed for session {session_id}: {e}")
+    return ScanResponse(
+        session_id=session_id,
+        status=ScanStatus.PENDING.value,
+        message="Scan resumed"
+    )
 
-        # 실패 상태로 업데이트
-        db_session.status = ScanStatus.FAILED
-        db_session.error = str(e)
-        db.commit()
 
+@scan_router.post(
+    "/scan/{session_id}/cancel",
+    response_model=ScanResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def cancel_scan_session(session_id: str, db: Session = Depends(get_db)):
+    """
+    스캔 취소
+
+    - **session_id**: 스캔 세션 ID
+
+    실행 중인 스캔은 nmap 프로세스를 종료하고, 그때까지의 부분 결과를 저장한 뒤 `cancelled`가 됩니다.
+    부분 결과는 `/scan/{session_id}/result`로 조회할 수 있고, `/resume`으로 이어서 실행할 수 있습니다.
+    """
+    try:
+        cancelled = cancel_scan(db, session_id)
+    except ScanNotCancellable as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    mark_written(session_id)
+
+    if cancelled is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Scan failed: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan session not found: {session_id}"
         )
 
+    if cancelled:
+        return ScanResponse(
+            session_id=session_id,
+            status=ScanStatus.CANCELLED.value,
+            message="Scan cancelled"
+        )
+
+    return ScanResponse(
+        session_id=session_id,
+        status=ScanStatus.RUNNING.value,
+        message="Cancellation requested"
+    )
+
 
 @router.get("/scan/{session_id}", response_model=ScanStatusResponse)
-async def get_scan_status(session_id: str, db: Session = Depends(get_db)):
+async def get_scan_status(session_id: str, db: Session = Depends(get_read_db)):
     """
     스캔 상태 조회
 
     - **session_id**: 스캔 세션 ID
+
+    상태는 짧은 TTL로 캐시되며, 실행 중에는 진행 이벤트가 캐시를 갱신합니다.
     """
-    db_session = db.query(ScanSession).filter(
-        ScanSession.id == session_id
-    ).first()
+    cached = scan_cache.get_status(session_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    db_session = with_primary_fallback(db, crud.get_scan_status, session_id)
 
     if not db_session:
         raise HTTPException(
@@ -104,25 +160,36 @@ async def get_scan_status(session_id: str, db: Session = Depends(get_db)):
             detail=f"Scan session not found: {session_id}"
         )
 
-    return ScanStatusResponse(
+    response = ScanStatusResponse(
         session_id=str(db_session.id),
         status=db_session.status.value,
         progress=db_session.progress,
         current_step=db_session.current_step,
         error=db_session.error,
     )
+    scan_cache.set_status(session_id, response.model_dump_json())
+    return response
 
 
 @router.get("/scan/{session_id}/result", response_model=ScanResultResponse)
-async def get_scan_result(session_id: str, db: Session = Depends(get_db)):
+async def get_scan_result(session_id: str, db: Session = Depends(get_read_db)):
     """
     스캔 결과 조회
 
     - **session_id**: 스캔 세션 ID
+
+    취소/타임아웃된 스캔은 중단 시점까지의 부분 결과를 반환합니다 (`status` 참고).
+    완료된 스캔의 결과는 바뀌지 않으므로 캐시됩니다.
     """
-    db_session = db.query(ScanSession).filter(
-        ScanSession.id == session_id
-    ).first()
+    cached = scan_cache.get_result(session_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # replica가 아직 종료 상태를 받지 못했으면 primary에서 다시 읽는다
+    db_session = with_primary_fallback(
+        db, crud.get_scan_session, session_id, with_result=True,
+        retry_if=lambda row: row.status not in RESULT_STATUSES,
+    )
 
     if not db_session:
         raise HTTPException(
@@ -130,42 +197,177 @@ async def get_scan_result(session_id: str, db: Session = Depends(get_db)):
             detail=f"Scan session not found: {session_id}"
         )
 
-    if db_session.status != ScanStatus.COMPLETED:
+    if db_session.status not in RESULT_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Scan not completed yet. Current status: {db_session.status.value}"
         )
 
-    return ScanResultResponse(
+    # 압축 저장소에 있는 결과는 여기서 압축 해제된다
+    result = db_session.result_payload()
+
+    # 보고서는 저장하지 않으므로 조회 시 렌더링 (캐시됨)
+    report = result["report"]
+    if report is None and db_session.status == ScanStatus.COMPLETED:
+        body, _ = await asyncio.to_thread(
+            report_renderer.render_report,
+            _report_meta(db_session), result, "markdown", db_session.result_digest,
+        )
+        report = body.decode("utf-8")
+
+    response = ScanResultResponse(
         session_id=str(db_session.id),
         target=db_session.target,
         scan_type=db_session.scan_type.value.lower(),
-        ports=db_session.ports,
-        vulnerabilities=db_session.vulnerabilities,
-        risk_assessment=db_session.risk_assessment,
-        remediation=db_session.remediation,
-        report=db_session.report,
+        status=db_session.status.value,
+        ports=result["ports"],
+        vulnerabilities=result["vulnerabilities"],
+        risk_assessment=result["risk_assessment"],
+        remediation=result["remediation"],
+        report=report,
     )
+    # 부분 결과(취소/타임아웃)는 재개하면 바뀌므로 캐시하지 않는다
+    if db_session.status == ScanStatus.COMPLETED:
+        scan_cache.set_result(session_id, response.model_dump_json())
+    return response
+
+
+def _report_meta(db_session) -> dict:
+    """보고서 헤더에 들어가는 세션 정보"""
+    return {
+        "session_id": str(db_session.id),
+        "target": db_session.target,
+        "scan_type": db_session.scan_type.value.lower(),
+        "completed_at": db_session.completed_at.isoformat() if db_session.completed_at else None,
+    }
+
+
+@router.get("/scan/{session_id}/report")
+async def get_scan_report(
+    session_id: str,
+    request: Request,
+    format: str = Query("markdown", pattern="^(markdown|html|json|pdf)$"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    스캔 보고서 조회
 
+    - **session_id**: 스캔 세션 ID
+    - **format**: markdown / html / json / pdf
 
-@router.get("/sessions", response_model=List[dict])
-async def list_sessions(db: Session = Depends(get_db)):
+    결과가 바뀌지 않는 한 같은 ETag를 반환하므로 If-None-Match로 재요청하면 304를 받습니다.
     """
-    모든 스캔 세션 목록 조회
+    db_session = with_primary_fallback(
+        db, crud.get_scan_session, session_id, with_result=True,
+        retry_if=lambda row: row.status != ScanStatus.COMPLETED,
+    )
+
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan session not found: {session_id}"
+        )
+
+    if db_session.status != ScanStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Scan not completed yet. Current status: {db_session.status.value}"
+        )
+
+    meta = _report_meta(db_session)
+    result = db_session.result_payload()
+    etag = f'"{report_renderer.result_hash(meta, result, db_session.result_digest)}-{format}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    try:
+        # PDF 등 렌더링은 CPU를 쓰므로 이벤트 루프 밖에서 실행
+        body, _ = await asyncio.to_thread(
+            report_renderer.render_report, meta, result, format, db_session.result_digest
+        )
+    except report_renderer.ReportFormatUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if format == "pdf":
+        headers["Content-Disposition"] = f'attachment; filename="scan-report-{session_id}.pdf"'
+    return Response(
+        content=body,
+        media_type=report_renderer.MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.get("/sessions", response_model=SessionListResponse)
+async def list_sessions(
+    limit: int = Query(50, ge=1, le=500, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    status_filter: Optional[ScanStatus] = Query(None, alias="status"),
+    target: Optional[str] = None,
+    created_from: Optional[datetime] = Query(None, description="생성 시간 하한 (포함)"),
+    created_to: Optional[datetime] = Query(None, description="생성 시간 상한 (미포함)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    스캔 세션 목록 조회 (최신순, 커서 기반 페이지네이션)
+
+    다음 페이지는 응답의 `next_cursor`를 `cursor`로 넘겨 조회합니다.
+    """
+    try:
+        rows, next_cursor = crud.list_sessions(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+            target=target,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return SessionListResponse(
+        items=[
+            SessionListItem(
+                session_id=str(row.id),
+                target=row.target,
+                scan_type=row.scan_type.value,
+                status=row.status.value,
+                progress=row.progress or 0,
+                created_at=row.created_at,
+                started_at=row.started_at,
+                completed_at=row.completed_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/sessions/count", response_model=SessionCountResponse)
+async def count_sessions(
+    exact: bool = Query(False, description="true면 항상 정확한 COUNT 수행"),
+    status_filter: Optional[ScanStatus] = Query(None, alias="status"),
+    target: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+):
     """
-    sessions = db.query(ScanSession).order_by(
-        ScanSession.created_at.desc()
-    ).all()
+    스캔 세션 개수 조회
 
-    return [
-        {
-            "session_id": str(session.id),
-            "target": session.target,
-            "status": session.status.value,
-            "started_at": session.started_at.isoformat() if session.started_at else None,
-        }
-        for session in sessions
-    ]
+    행이 많은 경우 플래너 통계 기반 추정치를 반환합니다 (`estimated=true`).
+    """
+    count, estimated = crud.count_sessions(
+        db,
+        exact=exact,
+        status=status_filter,
+        target=target,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return SessionCountResponse(count=count, estimated=estimated)
 
 
 @router.delete("/scan/{session_id}")
@@ -175,19 +377,17 @@ async def delete_scan(session_id: str, db: Session = Depends(get_db)):
 
     - **session_id**: 스캔 세션 ID
     """
-    db_session = db.query(ScanSession).filter(
-        ScanSession.id == session_id
-    ).first()
-
-    if not db_session:
+    if not crud.delete_scan_session(db, session_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Scan session not found: {session_id}"
         )
 
-    db.delete(db_session)
-    db.commit()
-
+    delete_checkpoint(session_id)
+    profiling.delete_profiles(session_id)
+    report_renderer.delete_reports(session_id)
+    scan_cache.invalidate(session_id)
+    mark_written(session_id)
     logger.info(f"Scan session deleted: {session_id}")
 
     return {"message": f"Scan session {session_id} deleted successfully"}
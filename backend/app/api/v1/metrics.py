@@ -0,0 +1,18 @@
+"""
+Prometheus 지표 엔드포인트 (GET /metrics)
+"""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+from app.core.database import engine
+from app.core.metrics import DBPoolCollector
+
+router = APIRouter()
+
+REGISTRY.register(DBPoolCollector(engine))
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -6,11 +6,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import json
 
 from app.core.database import get_db
-from app.services.langgraph_service import LangGraphService
-from app.models.scan_session import ScanSession, ScanStatus, ScanType
+from app.schemas.scan_request import validate_scan_target
+from app.services.async_scan_service import start_or_attach, wait_for_result
+from app.services.batch_scan_service import submit_batch
+from app.services.intent_parser import expand_targets, parse_intent
 
 router = APIRouter()
 
@@ -86,51 +89,47 @@ async def chat_completions(request: ChatCompletionRequest, db: Session = Depends
 
     last_message = user_messages[-1].content
 
-    # 간단한 파싱 (실제로는 LLM으로 파싱하거나 정규식 사용)
-    target = "127.0.0.1"  # 기본값
-    scan_type = "quick"
-
-    # "127.0.0.1", "192.168.1.1" 같은 IP 주소 추출
-    import re
-    ip_match = re.search(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', last_message)
-    if ip_match:
-        target = ip_match.group(0)
-
-    # "quick", "standard", "full" 추출
-    if "full" in last_message.lower():
-        scan_type = "full"
-    elif "standard" in last_message.lower():
-        scan_type = "standard"
-
-    # DB에 세션 생성
-    db_session = ScanSession(
-        target=target,
-        scan_type=ScanType(scan_type),
-        status=ScanStatus.PENDING,
-        progress=0,
-    )
-    db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
-
-    session_id = str(db_session.id)
+    # 대상/스캔 유형 파싱 (정규식 우선, 모호할 때만 LLM)
+    intent = await parse_intent(last_message)
+    if intent is None:
+        return _assistant_reply(
+            "error",
+            "스캔 대상을 찾지 못했습니다. IP 주소나 대역을 지정해주세요. "
+            "예: '192.168.0.5 풀스캔', '10.0.0.0/28 빠른 스캔'"
+        )
 
-    # 스캔 실행 (동기)
     try:
-        db_session.status = ScanStatus.RUNNING
-        db.commit()
+        targets = [validate_scan_target(t) for t in expand_targets(intent.targets)]
+    except ValueError as e:
+        return _assistant_reply("error", f"❌ 스캔할 수 없는 대상입니다: {e}")
+
+    scan_type = intent.scan_type
+
+    # 여러 대상(CIDR 등)은 배치로 제출하고 결과 스트림 주소를 안내
+    if len(targets) > 1:
+        batch_id, items = submit_batch(db, targets, scan_type)
+        return _assistant_reply(
+            batch_id,
+            f"""🚀 배치 스캔 시작
+
+**배치 ID**: {batch_id}
+**대상**: {", ".join(intent.targets)} ({len(items)}개 호스트)
+**스캔 유형**: {scan_type}
 
-        service = LangGraphService()
-        result = service.run_scan(target, scan_type)
+완료되는 순서대로 `/api/v1/langgraph/scans:batch/{batch_id}/results`에서 확인하세요.
+""",
+        )
+
+    target = targets[0]
 
-        # 결과 저장
-        db_session.status = ScanStatus.COMPLETED
-        db_session.progress = 100
-        db_session.ports = result.get("ports")
-        db_session.vulnerabilities = result.get("vulnerabilities")
-        db_session.risk_assessment = result.get("risk_assessment")
-        db_session.report = result.get("report")
-        db.commit()
+    # 스캔 실행 (워커 풀에서 실행하고 완료까지 대기, 진행 상황은 이벤트로 발행)
+    # 같은 대상/유형의 스캔이 진행 중이면 그 결과를 함께 받는다 (재시도 요청 등)
+    session_id, future = start_or_attach(db, target, scan_type)
+    try:
+        if future is not None:
+            result = await asyncio.wrap_future(future)
+        else:
+            result = await wait_for_result(session_id)
 
         # OpenAI 형식으로 응답
         response_text = f"""✅ 스캔 완료!
@@ -164,10 +163,7 @@ async def chat_completions(request: ChatCompletionRequest, db: Session = Depends
         )
 
     except Exception as e:
-        db_session.status = ScanStatus.FAILED
-        db_session.error = str(e)
-        db.commit()
-
+        # 실패 상태는 AsyncScanService에서 저장됨
         return ChatCompletionResponse(
             id=session_id,
             choices=[{
@@ -180,6 +176,21 @@ async def chat_completions(request: ChatCompletionRequest, db: Session = Depends
         )
 
 
+def _assistant_reply(response_id: str, content: str) -> ChatCompletionResponse:
+    """assistant 메시지 하나로 구성된 응답"""
+    return ChatCompletionResponse(
+        id=response_id,
+        choices=[{
+            "index": 0,
+            "message": {
+                "role": "assistant",
+                "content": content
+            },
+            "finish_reason": "stop"
+        }]
+    )
+
+
 def _format_ports(ports):
     """포트 리스트를 문자열로 포맷"""
     if not ports:
@@ -0,0 +1,154 @@
+"""
+프로파일링 API (PROFILING_ENABLED=true일 때만 등록)
+
+- 스캔 프로파일 예약/다운로드 (pstats, speedscope JSON)
+- X-Profile 헤더로 프로파일링한 요청의 프로파일 다운로드
+- tracemalloc 스냅샷 (장시간 실행 중인 워커의 메모리 증가 위치)
+
+프로세스 단위이므로 API 워커가 여러 개면 스캔을 실행한 워커에 요청해야 예약이 적용된다
+(저장된 프로파일은 PROFILING_DIR를 공유하면 어느 워커에서나 조회 가능).
+파일 읽기와 tracemalloc 스냅샷이 블로킹이므로 핸들러는 동기 함수로 둔다.
+"""
+import logging
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import crud
+from app.models.scan_session import ScanStatus
+from app.schemas.profiling import ProfileInfo, ProfileListResponse, TracemallocResponse
+from app.services import profiling
+
+logger = logging.getLogger(__name__)
+
+
+def verify_token(x_profile_token: Optional[str] = Header(None)):
+    """PROFILING_TOKEN이 설정되어 있으면 X-Profile-Token 헤더 확인"""
+    if not profiling.token_matches(x_profile_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+router = APIRouter(dependencies=[Depends(verify_token)])
+
+FORMAT_PATTERN = "^(pstats|speedscope)$"
+MODE_PATTERN = "^(sampling|cprofile)$"
+
+
+def _profile_id(value: str) -> str:
+    """경로에 쓰는 ID 검증 (UUID만 허용)"""
+    try:
+        return str(uuid.UUID(value)) if "-" in value else uuid.UUID(value).hex
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid profile id: {value}"
+        )
+
+
+def _download(kind: str, profile_id: str, format: str) -> FileResponse:
+    path = profiling.profile_path(kind, profile_id, format)
+    if not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No {format} profile for {profile_id}"
+        )
+    return FileResponse(
+        path,
+        media_type=profiling.MEDIA_TYPES[format],
+        filename=path.name,
+    )
+
+
+@router.get("", response_model=ProfileListResponse)
+def get_profiles():
+    """저장된 프로파일 목록 (최근 순)"""
+    return ProfileListResponse(profiles=[ProfileInfo(**p) for p in profiling.list_profiles()])
+
+
+@router.post("/scans/{session_id}", status_code=status.HTTP_202_ACCEPTED)
+def arm_scan_profile(
+    session_id: str,
+    mode: str = Query("sampling", pattern=MODE_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """
+    세션의 다음 실행을 프로파일링하도록 예약
+
+    대기 중인 스캔은 시작할 때, 실패/취소된 스캔은 /scan/{id}/resume으로 재개할 때 적용된다.
+
+    - **mode**: sampling / cprofile
+    """
+    session_id = _profile_id(session_id)
+    db_session = crud.get_scan_session(db, session_id)
+    if db_session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scan session not found: {session_id}"
+        )
+    if db_session.status == ScanStatus.RUNNING:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Scan session {session_id} is already running"
+        )
+    profiling.arm_scan(session_id, mode)
+    logger.info(f"Profiling armed for session {session_id} ({mode})")
+    return {"message": f"Next run of scan session {session_id} will be profiled ({mode})"}
+
+
+@router.get("/scans/{session_id}")
+def get_scan_profile(
+    session_id: str,
+    format: str = Query("speedscope", pattern=FORMAT_PATTERN),
+):
+    """
+    스캔 프로파일 다운로드
+
+    - **format**: speedscope (https://www.speedscope.app) / pstats (`python -m pstats`, snakeviz)
+    """
+    return _download("scans", _profile_id(session_id), format)
+
+
+@router.get("/requests/{profile_id}")
+def get_request_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern=FORMAT_PATTERN),
+):
+    """X-Profile 헤더로 프로파일링한 요청의 프로파일 다운로드 (profile_id: 응답의 X-Profile-Id)"""
+    return _download("requests", _profile_id(profile_id), format)
+
+
+@router.post("/tracemalloc/start")
+def start_tracemalloc(frames: int = Query(10, ge=1, le=100)):
+    """
+    tracemalloc 시작
+
+    - **frames**: 할당마다 기록할 호출 스택 깊이 (클수록 메모리/CPU 오버헤드 증가)
+    """
+    profiling.start_tracemalloc(frames)
+    return {"message": f"tracemalloc tracing ({frames} frames)"}
+
+
+@router.post("/tracemalloc/stop")
+def stop_tracemalloc():
+    """tracemalloc 중지 (추적 메모리 해제)"""
+    profiling.stop_tracemalloc()
+    return {"message": "tracemalloc stopped"}
+
+
+@router.get("/tracemalloc", response_model=TracemallocResponse)
+def get_tracemalloc_snapshot(
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    compare: bool = Query(False, description="이전 스냅샷 대비 증가량 순으로 정렬"),
+):
+    """
+    tracemalloc 스냅샷 (할당 상위 위치)
+
+    - **group_by**: lineno / filename / traceback
+    - **compare**: true면 직전 스냅샷과 비교 (주기적으로 호출해 계속 증가하는 위치를 찾는다)
+    """
+    return TracemallocResponse(**profiling.tracemalloc_snapshot(limit, group_by, compare))
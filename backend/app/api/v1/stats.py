@@ -0,0 +1,63 @@
+"""
+대시보드 집계 API
+
+세션/결과를 읽어 계산하지 않고, 스캔 종료 시 갱신되는 일별 rollup 테이블을 읽는다.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+import logging
+
+from app.core.database import get_read_db
+from app.models import crud
+from app.schemas.stats import DashboardStatsResponse, DurationStats, ServiceCount
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _duration(count: int, total: float) -> DurationStats:
+    return DurationStats(scans=count, mean_seconds=round(total / count, 3) if count else None)
+
+
+@router.get("", response_model=DashboardStatsResponse)
+async def get_dashboard_stats(
+    since: Optional[date] = Query(None, description="완료 날짜 하한 (UTC, 포함)"),
+    until: Optional[date] = Query(None, description="완료 날짜 상한 (UTC, 포함)"),
+    top: int = Query(10, ge=1, le=100, description="top_services 개수"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    상태별 세션 수, 심각도 분포, 많이 열린 서비스, 평균 스캔 시간
+
+    날짜 범위를 지정하지 않으면 전체 기간을 집계합니다.
+    """
+    stats = crud.get_dashboard_stats(db, since=since, until=until, top_services=top)
+
+    by_status = {}
+    by_scan_type = {}
+    total_count, total_sum = 0, 0.0
+    for row in stats["outcomes"]:
+        by_status[row.status.value] = by_status.get(row.status.value, 0) + row.sessions
+        count, total = by_scan_type.get(row.scan_type.value, (0, 0.0))
+        by_scan_type[row.scan_type.value] = (count + row.duration_count, total + row.duration_sum)
+        total_count += row.duration_count
+        total_sum += row.duration_sum
+    for row in stats["active"]:
+        by_status[row.status.value] = row.sessions
+
+    return DashboardStatsResponse(
+        since=since,
+        until=until,
+        by_status=by_status,
+        by_severity={row.severity: row.findings for row in stats["severities"]},
+        top_services=[
+            ServiceCount(service=row.service, port=row.port, observations=row.observations)
+            for row in stats["services"]
+        ],
+        duration=_duration(total_count, total_sum),
+        duration_by_scan_type={
+            scan_type: _duration(count, total) for scan_type, (count, total) in by_scan_type.items()
+        },
+    )
@@ -0,0 +1,134 @@
+"""
+키-값 캐시 (문자열 값 + TTL)
+
+- local: 프로세스 내부 캐시 (단일 노드, 테스트용 대체 구현)
+- redis: 여러 API 워커가 공유
+- none: 캐시 사용 안 함
+
+캐시 오류는 요청을 실패시키지 않고 캐시 미스로 처리한다 (호출자는 DB에서 읽음).
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 오류 후 다시 시도하기까지 캐시를 건너뛰는 시간 (초)
+REDIS_RETRY_AFTER_SECONDS = 5.0
+
+
+class LocalCache:
+    """프로세스 내부 TTL + LRU 캐시"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Redis 캐시 (오류가 나면 잠시 캐시를 건너뛴다)"""
+
+    def __init__(self):
+        self._skip_until = 0.0
+
+    def _client(self):
+        if time.monotonic() < self._skip_until:
+            return None
+        from app.core.redis import get_redis
+
+        return get_redis()
+
+    def _failed(self, operation: str, e: Exception) -> None:
+        self._skip_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+        logger.warning(f"Redis cache {operation} failed, bypassing cache for {REDIS_RETRY_AFTER_SECONDS:.0f}s: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            return client.get(key)
+        except Exception as e:
+            self._failed("get", e)
+            return None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.set(key, value, px=int(ttl * 1000))
+        except Exception as e:
+            self._failed("set", e)
+
+    def delete(self, *keys: str) -> None:
+        # 무효화는 건너뛰지 않는다 (삭제된 데이터가 남지 않도록)
+        from app.core.redis import get_redis
+
+        try:
+            get_redis().delete(*keys)
+        except Exception as e:
+            self._failed("delete", e)
+
+
+class NullCache:
+    """캐시 사용 안 함 (CACHE_BACKEND=none)"""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+
+_cache = None
+
+
+def get_cache():
+    """설정된 캐시 반환"""
+    global _cache
+    if _cache is None:
+        if settings.CACHE_BACKEND == "redis":
+            _cache = RedisCache()
+        elif settings.CACHE_BACKEND == "none":
+            _cache = NullCache()
+        else:
+            _cache = LocalCache(settings.LOCAL_CACHE_MAX_ENTRIES)
+        logger.info(f"Cache initialized: {settings.CACHE_BACKEND}")
+    return _cache
@@ -0,0 +1,53 @@
+"""
+결과 압축 유틸리티
+
+zstandard가 설치되어 있으면 zstd, 없으면 zlib을 사용한다.
+압축 데이터와 함께 codec 이름을 저장해 두고 해제 시 사용한다.
+"""
+import zlib
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+
+def default_codec() -> str:
+    """사용 가능한 기본 codec"""
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def compress(data: bytes, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    데이터 압축
+
+    Returns:
+        (codec, 압축된 바이트)
+    """
+    codec = codec or default_codec()
+    level = settings.RESULT_COMPRESSION_LEVEL
+
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return codec, zstandard.ZstdCompressor(level=level).compress(data)
+    if codec == CODEC_ZLIB:
+        return codec, zlib.compress(data, min(level, 9))
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """codec에 맞게 압축 해제"""
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed results")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
@@ -12,14 +12,42 @@ class Settings(BaseSettings):
     APP_NAME: str = "3VI Security Scanner"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
+    APP_PROFILE: str = "full"  # full(조회 + 스캔 제출/실행) / api(조회 전용: 스캔 제출 라우트 없음, LangGraph 미로드)
 
     # Database
     DATABASE_URL: str
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Database pool (PROCESS_ROLE별 크기/재사용 시간)
+    PROCESS_ROLE: str = "api"  # api(HTTP 요청 + 스캔 워커) / worker(배치 작업: retention 등)
+    DB_POOL_SIZE_API: int = 10
+    DB_MAX_OVERFLOW_API: int = 10
+    DB_POOL_RECYCLE_API: int = 1800  # 연결 재사용 최대 시간 (초, -1이면 사용 안 함)
+    DB_POOL_SIZE_WORKER: int = 0  # 0이면 MAX_CONCURRENT_SCANS + 2
+    DB_MAX_OVERFLOW_WORKER: int = 2
+    DB_POOL_RECYCLE_WORKER: int = 3600
+    DB_POOL_TIMEOUT: int = 10  # 풀에서 연결을 기다리는 최대 시간 (초)
+    DB_POOL_PRE_PING: bool = True  # 체크아웃 시 연결 확인 (끊긴 연결 재연결)
+    DB_POOL_WARMUP: bool = True  # 시작 시 pool_size만큼 연결을 미리 연다
+    DB_POOL_WAIT_WARN_MS: int = 100  # 체크아웃 대기가 이보다 길면 경고 로그
+
+    # Read replicas (읽기 전용 조회 라우팅)
+    DATABASE_REPLICA_URLS: str = ""  # 쉼표로 구분 (비어 있으면 모든 읽기가 primary)
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # 이보다 뒤처진 replica는 사용하지 않음
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0  # 복제 지연 확인 주기 (초)
+    READ_YOUR_WRITES_SECONDS: float = 10.0  # API가 쓴 세션을 primary에서 읽는 시간 (초)
+
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    LLM_PROVIDER: str = "openai"  # openai / fake (결정적인 가짜 모델, 부하 테스트용)
+    FAKE_LLM_LATENCY_MS: float = 300.0  # 가짜 모델의 첫 토큰까지 지연 (ms)
+    FAKE_LLM_TOKEN_DELAY_MS: float = 10.0  # 가짜 모델의 토큰당 지연 (ms)
+
+    # Chat intent parsing (OpenAI 호환 어댑터)
+    INTENT_LLM_FALLBACK: bool = True  # 정규식으로 확정할 수 없을 때만 LLM 사용
+    INTENT_LLM_TIMEOUT: int = 10
+    INTENT_CACHE_SIZE: int = 1024  # 단계별 메모이즈 항목 수
 
     # Security
     SECRET_KEY: str
@@ -31,14 +59,78 @@ class Settings(BaseSettings):
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
     # Scanning
-    SCAN_TIMEOUT: int = 300
+    SCAN_TIMEOUT: int = 300  # 스캔 전체 기한 (초, 초과 시 timed_out)
+    PORT_SCAN_TIMEOUT: int = 240  # 포트 스캔 단계 기한 (초, 0이면 전체 기한만 적용)
+    LLM_TIMEOUT: int = 60  # LLM 호출당 제한 시간 (초)
     MAX_CONCURRENT_SCANS: int = 5
     ALLOWED_TARGET_NETWORKS: str = "127.0.0.1,localhost,192.168.0.0/16,10.0.0.0/8"
+    PORT_SCAN_CHUNK_SIZE: int = 4096  # 부분 결과를 보내기 위한 nmap 호출당 포트 수
+    SCANNER_BACKEND: str = "nmap"  # nmap / stub (nmap 없이 정해진 포트 반환, 부하 테스트용)
+    STUB_SCANNER_DELAY_MS: float = 200.0  # stub 스캐너의 호출당 지연 (ms)
+    SCAN_DEDUP_ENABLED: bool = True  # 같은 (target, scan_type) 진행 중 스캔에 합류
+    SCAN_REGISTRY_BACKEND: str = "memory"  # memory(단일 노드) / redis(다중 워커)
+    MAX_BATCH_TARGETS: int = 10000  # /scans:batch 요청당 최대 대상 수
+    SCAN_CHECKPOINTER: str = "memory"  # postgres / sqlite / memory / none (노드 단위 재개)
+    SCAN_CHECKPOINT_PATH: str = "checkpoints/scans.sqlite"  # SCAN_CHECKPOINTER=sqlite일 때
+
+    # Result storage
+    RESULT_STORE: str = "inline"  # inline(JSONB 컬럼) / compressed(압축 저장소)
+    RESULT_COMPRESSION_LEVEL: int = 9
+    REPORT_CACHE_DIR: str = "cache/reports"  # 렌더링된 보고서 캐시 (결과 해시 단위)
+    REPORT_CACHE_MAX_MB: int = 512  # 보고서 캐시 최대 크기 (넘으면 오래 읽지 않은 것부터 삭제)
+    REPORT_CACHE_MAX_AGE_HOURS: int = 168  # 이보다 오래된 보고서는 삭제 (0이면 크기로만 정리)
+    BULK_WRITE_ENABLED: bool = True  # 배치 스캔의 결과/진행률을 모아서 한 트랜잭션으로 저장
+    BULK_WRITE_MAX_BATCH: int = 500  # 한 번에 저장할 최대 결과 수
+    BULK_WRITE_FLUSH_MS: int = 50  # 결과를 모으는 최대 대기 시간 (밀리초)
+    BULK_COPY_MIN_ROWS: int = 200  # 이 행 수 이상이면 multi-row INSERT 대신 COPY 사용
+
+    # Retention (scan_sessions 월별 파티션)
+    SCAN_RETENTION_MONTHS: int = 12  # 현재 달 외에 유지할 개월 수 (0이면 보관하지 않음)
+    SCAN_PARTITION_PREMAKE_MONTHS: int = 3  # 미리 만들어 둘 미래 월 파티션 수
+    SCAN_ARCHIVE_DIR: str = "archive/scan_sessions"  # 보관 파일(gzip NDJSON) 경로
+    SCAN_RETENTION_INTERVAL_HOURS: int = 24  # 앱 내 보관 작업 주기 (0이면 cron으로만 실행)
+
+    # Cache (스캔 상태/결과 read-through)
+    CACHE_BACKEND: str = "local"  # local(단일 노드/테스트) / redis(다중 워커) / none
+    STATUS_CACHE_TTL: float = 2.0  # 상태 캐시 TTL (초, 실행 중에는 진행 이벤트가 갱신)
+    RESULT_CACHE_TTL: int = 3600  # 완료된 결과 캐시 TTL (초)
+    LOCAL_CACHE_MAX_ENTRIES: int = 10000  # CACHE_BACKEND=local일 때 최대 항목 수
+
+    # Scan events (진행 상황 pub/sub)
+    EVENT_BACKEND: str = "memory"  # memory(단일 노드) / redis(다중 워커)
+    EVENT_HEARTBEAT_SECONDS: int = 15
+
+    # Metrics (Prometheus /metrics)
+    METRICS_ENABLED: bool = True  # /metrics 노출 및 HTTP/DB 계측
+    METRICS_DB_QUERIES: bool = True  # SQL 실행 시간 히스토그램 (쿼리마다 이벤트 2회)
+
+    # Dependency health probes (/health, /status는 캐시된 결과만 반환)
+    HEALTH_PROBE_INTERVAL: float = 15.0  # 확인 주기 (초, 0이면 프로브를 끄고 /health는 항상 healthy)
+    HEALTH_PROBE_TIMEOUT: float = 2.0  # 의존성별 확인 제한 시간 (초)
+    HEALTH_LLM_URL: str = "https://api.openai.com/v1/models"  # LLM 엔드포인트 확인 (비어 있으면 확인 안 함)
+
+    # Tracing (OpenTelemetry, opentelemetry-sdk 필요)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"  # otlp(collector로 전송) / file(OTLP JSON 파일) / console
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP
+    TRACING_FILE_PATH: str = "traces/spans.jsonl"  # file exporter 출력 (한 줄에 span 묶음 하나)
+    TRACING_SAMPLE_RATIO: float = 1.0  # 새 trace 샘플링 비율 (상위 trace가 있으면 그 결정을 따름)
+
+    # Profiling (온디맨드 스캔/요청 프로파일, tracemalloc)
+    PROFILING_ENABLED: bool = False  # /api/v1/profiling 및 X-Profile 헤더
+    PROFILING_TOKEN: str = ""  # 설정하면 X-Profile-Token 헤더가 일치해야 함
+    PROFILING_DIR: str = "profiles"  # 프로파일 저장 경로 (scans/{session_id}.*, requests/{profile_id}.*)
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0  # sampling 모드 스택 기록 주기
+    PROFILING_TRACEMALLOC_FRAMES: int = 0  # 시작 시 tracemalloc 추적 (기록할 프레임 수, 0이면 요청 시 시작)
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/app.log"
-    LOG_JSON_FORMAT: bool = False
+    LOG_JSON_FORMAT: bool = False  # 한 줄에 JSON 객체 하나 (session_id, node, trace_id, duration_ms 포함)
+    LOG_QUEUE_SIZE: int = 10000  # 리스너 스레드로 넘기는 큐 크기 (가득 차면 버리고 개수를 경고)
+    LOG_ROTATE_WHEN: str = "midnight"  # 파일 교체 주기 (TimedRotatingFileHandler의 when: S/M/H/D/midnight/W0-W6)
+    LOG_ROTATE_MAX_BYTES: int = 50 * 1024 * 1024  # 주기 전이라도 이 크기를 넘으면 교체 (0이면 주기만)
+    LOG_ROTATE_BACKUP_COUNT: int = 14  # 보관할 교체 파일 수 (0이면 모두 보관)
 
     # Celery (Phase 3+)
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
@@ -1,22 +1,58 @@
 """
 데이터베이스 연결 및 세션 관리
 """
-from sqlalchemy import create_engine
+import math
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from fastapi import Request
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedQueuePool, instrument_engine
+from app.core.metrics import instrument_queries
+from app.core.replicas import ReplicaRouter, recently_written
 import logging
 
 logger = logging.getLogger(__name__)
 
+PROCESS_ROLES = ("api", "worker")
+
+
+def pool_config() -> dict:
+    """
+    PROCESS_ROLE별 연결 풀 설정
+
+    - api: HTTP 요청 + 프로세스 내 스캔 워커 (폴링 부하를 받으므로 크게)
+    - worker: 배치 작업 (동시 스캔 수 + 결과 저장/보관 스레드)
+    """
+    if settings.PROCESS_ROLE not in PROCESS_ROLES:
+        raise ValueError(f"Unknown PROCESS_ROLE: {settings.PROCESS_ROLE} (expected one of {PROCESS_ROLES})")
+
+    if settings.PROCESS_ROLE == "worker":
+        return {
+            "pool_size": settings.DB_POOL_SIZE_WORKER or settings.MAX_CONCURRENT_SCANS + 2,
+            "max_overflow": settings.DB_MAX_OVERFLOW_WORKER,
+            "pool_recycle": settings.DB_POOL_RECYCLE_WORKER,
+        }
+    return {
+        "pool_size": settings.DB_POOL_SIZE_API,
+        "max_overflow": settings.DB_MAX_OVERFLOW_API,
+        "pool_recycle": settings.DB_POOL_RECYCLE_API,
+    }
+
+
 # DB 엔진 생성
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # 연결 상태 확인
-    echo=settings.DEBUG,  # SQL 로그 출력
-    pool_size=5,  # 연결 풀 크기
-    max_overflow=10,  # 최대 추가 연결 수
+    poolclass=InstrumentedQueuePool,  # 체크아웃 대기 시간 기록
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # 연결 상태 확인
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # 연결을 기다리는 최대 시간 (초)
+    echo=settings.SQL_ECHO,  # SQL 로그 출력 (DEBUG와 별도)
+    **pool_config(),
 )
+instrument_engine(engine)
+instrument_queries(engine)
 
 # 세션 팩토리
 SessionLocal = sessionmaker(
@@ -25,6 +61,13 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 읽기 전용 replica (DATABASE_REPLICA_URLS가 비어 있으면 모든 읽기가 primary)
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    pool_size=pool_config()["pool_size"],
+    max_overflow=pool_config()["max_overflow"],
+)
+
 # Base 클래스 (모든 모델의 부모)
 Base = declarative_base()
 
@@ -41,6 +84,47 @@ def get_db():
         db.close()
 
 
+def get_read_db(request: Request):
+    """
+    읽기 전용 DB 세션 의존성 (replica가 있으면 replica)
+
+    경로에 session_id가 있고 이 API가 방금 쓴 세션이면 primary를 사용한다 (read-your-writes).
+    """
+    session_id = request.path_params.get("session_id")
+    replica = None
+    if session_id is None or not recently_written(session_id):
+        replica = replica_router.choose()
+
+    if replica is None:
+        db = SessionLocal()
+    else:
+        db = SessionLocal(bind=replica.engine)
+        db.info["replica"] = replica.name
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def with_primary_fallback(db: Session, read, *args, retry_if=None, **kwargs):
+    """
+    read(db, ...) 결과가 없거나 retry_if(결과)가 참이면 primary에서 다시 읽는다
+
+    replica에 아직 복제되지 않은 새 세션이나 종료 상태를 읽기 위해 사용한다.
+    db가 primary 세션이면 한 번만 읽는다.
+    """
+    value = read(db, *args, **kwargs)
+    stale = value is None or (retry_if is not None and retry_if(value))
+    if not stale or "replica" not in db.info:
+        return value
+
+    primary = SessionLocal()
+    try:
+        return read(primary, *args, **kwargs)
+    finally:
+        primary.close()
+
+
 def init_db():
     """
     데이터베이스 초기화
@@ -54,15 +138,63 @@ def init_db():
         raise
 
 
-def check_db_connection():
+def warmup_pool() -> int:
+    """
+    풀 크기만큼 연결을 미리 열어 둔다 (시작 직후 요청이 연결 생성을 기다리지 않도록)
+
+    Returns:
+        열어 둔 연결 수 (DB에 연결할 수 없으면 그때까지 연 수)
+    """
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connections.append(engine.connect())
+    except Exception as e:
+        logger.warning(f"DB pool warmup stopped after {len(connections)} connections: {e}")
+    finally:
+        for connection in connections:
+            connection.close()
+    logger.info(f"DB pool warmed up: {len(connections)} connections ({settings.PROCESS_ROLE} role)")
+    return len(connections)
+
+
+_probe_engine = None
+
+
+def _get_probe_engine():
+    """
+    헬스 프로브 전용 엔진 (풀 없이 매번 새 연결)
+
+    요청/스캔이 연결 풀을 모두 쓰고 있어도 DB 자체의 상태를 확인할 수 있도록 풀을 거치지 않는다.
+    """
+    global _probe_engine
+    if _probe_engine is None:
+        _probe_engine = create_engine(
+            settings.DATABASE_URL,
+            poolclass=NullPool,
+            connect_args={"connect_timeout": max(1, math.ceil(settings.HEALTH_PROBE_TIMEOUT))},
+        )
+    return _probe_engine
+
+
+def ping_database() -> None:
+    """
+    primary에 SELECT 1 (연결 풀을 거치지 않는 전용 연결 사용)
+
+    Raises:
+        연결하거나 실행할 수 없으면 드라이버 예외
+    """
+    with _get_probe_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def check_db_connection() -> bool:
     """
     데이터베이스 연결 상태 확인
-    헬스체크에서 사용
+    헬스체크는 health_probes의 캐시된 결과를 사용한다
     """
     try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
+        ping_database()
         return True
     except Exception as e:
         logger.error(f"Database connection check failed: {e}")
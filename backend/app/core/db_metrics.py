@@ -0,0 +1,140 @@
+"""
+DB 연결 풀 계측
+
+- 체크아웃 대기 시간 (풀에서 연결을 받을 때까지), 대기 타임아웃 수
+- pre-ping 실패 수 (끊긴 연결 감지), 새 연결/무효화 수
+- 현재 체크아웃/오버플로 연결 수와 최대 동시 체크아웃 수
+
+/api/v1/health/db에서 조회한다.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """연결 풀 누적 지표 (프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.wait_count = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_timeouts = 0
+            self.pre_ping_failures = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.checked_out_peak = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.wait_timeouts += 1
+
+    def record_checkout(self, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out_peak = max(self.checked_out_peak, checked_out)
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checked_out_peak": self.checked_out_peak,
+                "wait_count": self.wait_count,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 1),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.wait_count, 2) if self.wait_count else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 1),
+                "wait_timeouts": self.wait_timeouts,
+                "pre_ping_failures": self.pre_ping_failures,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """연결을 받을 때까지 기다린 시간을 기록하는 QueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            logger.error(
+                f"DB pool exhausted: waited {settings.DB_POOL_TIMEOUT}s "
+                f"({self.checkedout()} checked out, size={self.size()}, overflow={self.overflow()})"
+            )
+            raise
+
+        waited = time.perf_counter() - started
+        pool_metrics.record_wait(waited)
+        if waited * 1000 >= settings.DB_POOL_WAIT_WARN_MS:
+            logger.warning(
+                f"Slow DB pool checkout: {waited * 1000:.0f}ms "
+                f"({self.checkedout()} checked out, size={self.size()}, overflow={self.overflow()})"
+            )
+        return connection
+
+
+def instrument_engine(engine: Engine) -> None:
+    """엔진에 풀 이벤트 리스너 등록 (풀이 다시 만들어져도 유지된다)"""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.record_checkout(engine.pool.checkedout())
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_metrics.increment("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.increment("invalidations")
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.is_pre_ping:
+            pool_metrics.increment("pre_ping_failures")
+            logger.warning(f"DB pre-ping failed, reconnecting: {context.original_exception}")
+
+
+def pool_status(engine: Engine) -> dict:
+    """현재 풀 상태 + 누적 지표"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout": pool.timeout(),
+        })
+    status.update(pool_metrics.snapshot())
+    return status
@@ -0,0 +1,184 @@
+"""
+스캔 진행 이벤트 pub/sub
+
+워커 스레드에서 발생한 진행 이벤트를 WebSocket/SSE 구독자에게 전달한다.
+- memory: 단일 프로세스용 (기본값)
+- redis: 여러 API 워커 간 fan-out
+"""
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 구독자 큐 크기 (느린 클라이언트는 오래된 이벤트부터 버린다)
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# 종료 이벤트 유형 (구독자가 스트림을 닫는 기준)
+TERMINAL_EVENTS = {"completed", "failed", "cancelled", "timed_out"}
+
+
+def session_channel(session_id: str) -> str:
+    """세션별 이벤트 채널 이름"""
+    return f"scan:events:{session_id}"
+
+
+def batch_channel(batch_id: str) -> str:
+    """배치 단위 이벤트 채널 이름 (세션 종료 이벤트만 발행)"""
+    return f"scan:batch:{batch_id}"
+
+
+def make_event(event_type: str, session_id: str, **fields) -> dict:
+    """이벤트 페이로드 생성"""
+    return {
+        "type": event_type,
+        "session_id": session_id,
+        "timestamp": time.time(),
+        **fields,
+    }
+
+
+class Subscription(ABC):
+    """이벤트 구독 핸들"""
+
+    @abstractmethod
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """다음 이벤트 반환 (timeout 내에 없으면 None)"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """구독 해제 (여러 번 호출해도 된다)"""
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+class InProcessSubscription(Subscription):
+    """InProcessEventBus 구독"""
+
+    def __init__(self, bus: "InProcessEventBus", channel: str):
+        self.bus = bus
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, event: dict) -> None:
+        """이벤트 루프 스레드에서 호출됨"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+
+class InProcessEventBus:
+    """프로세스 내부 이벤트 버스 (단일 노드)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[InProcessSubscription]] = {}
+
+    def publish(self, channel: str, event: dict) -> None:
+        """이벤트 발행 (어느 스레드에서든 호출 가능)"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 구독자
+                self._unsubscribe(sub)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        sub = InProcessSubscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: InProcessSubscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.channel]
+
+
+class RedisSubscription(Subscription):
+    """RedisEventBus 구독"""
+
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+        self.closed = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            message = await self.pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message and message.get("type") == "message":
+                return json.loads(message["data"])
+
+    async def close(self) -> None:
+        # 닫힌 pubsub에 unsubscribe하면 다시 연결하므로 한 번만 닫는다
+        if self.closed:
+            return
+        self.closed = True
+        await self.pubsub.unsubscribe()
+        await self.pubsub.close()
+
+
+class RedisEventBus:
+    """Redis pub/sub 기반 이벤트 버스 (다중 워커)"""
+
+    def publish(self, channel: str, event: dict) -> None:
+        from app.core.redis import get_redis
+
+        try:
+            get_redis().publish(channel, json.dumps(event, ensure_ascii=False))
+        except Exception as e:
+            # 이벤트 전송 실패가 스캔 자체를 실패시키지 않도록 한다
+            logger.warning(f"Failed to publish event to {channel}: {e}")
+
+    async def subscribe(self, channel: str) -> Subscription:
+        from app.core.redis import get_async_redis
+
+        pubsub = get_async_redis().pubsub()
+        await pubsub.subscribe(channel)
+        return RedisSubscription(pubsub)
+
+
+_bus = None
+
+
+def get_event_bus():
+    """설정된 이벤트 버스 반환"""
+    global _bus
+    if _bus is None:
+        if settings.EVENT_BACKEND == "redis":
+            _bus = RedisEventBus()
+        else:
+            _bus = InProcessEventBus()
+        logger.info(f"Event bus initialized: {settings.EVENT_BACKEND}")
+    return _bus
@@ -0,0 +1,204 @@
+"""
+의존성 헬스 프로브
+
+HEALTH_PROBE_INTERVAL마다 백그라운드 태스크가 DB, Redis, LLM 엔드포인트, nmap을 확인하고
+마지막 결과(상태, 지연, 오류)를 메모리에 둔다. /health와 /status는 이 결과만 읽으므로
+오케스트레이터가 자주 확인해도 DB에 부하를 주지 않고 응답이 막히지 않는다.
+
+- database: primary에 SELECT 1 (연결 풀을 거치지 않는 전용 연결, 풀이 모두 사용 중이어도 unhealthy가 아님)
+- redis:    PING (Redis를 쓰는 백엔드가 설정된 경우만)
+- llm:      HEALTH_LLM_URL 모델 목록 조회 (토큰 소모 없음, LLM_PROVIDER=fake이면 확인 생략)
+- nmap:     nmap --version (SCANNER_BACKEND=stub이면 확인 생략)
+
+APP_PROFILE=api(스캔을 실행하지 않는 조회 전용 프로세스)에서는 llm/nmap을 not_configured로 둔다.
+
+상태는 ok / unavailable / not_configured. 결과는 dependency_up, dependency_probe_latency_seconds 지표로도 노출된다.
+"""
+import asyncio
+import logging
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import ping_database
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+UNAVAILABLE = "unavailable"
+NOT_CONFIGURED = "not_configured"
+
+# 실패하면 요청을 처리할 수 없는 의존성 (/health가 503). 나머지는 degraded
+# (LLM이나 nmap이 없어도 API는 응답하고 스캔은 기본 평가/포트 스캔 오류로 끝난다)
+CRITICAL = ("database", "redis")
+
+_results: Dict[str, dict] = {}
+_last_probed: Optional[float] = None
+
+
+class NotConfigured(Exception):
+    """확인할 대상이 설정되지 않음"""
+
+
+def uses_redis() -> bool:
+    """Redis를 사용하는 백엔드가 하나라도 설정되어 있는지"""
+    return "redis" in (
+        settings.CACHE_BACKEND,
+        settings.EVENT_BACKEND,
+        settings.SCAN_REGISTRY_BACKEND,
+    )
+
+
+async def _probe_database() -> Optional[str]:
+    # wait_for가 시간 초과로 끝나도 스레드의 쿼리는 연결 제한 시간까지 계속된다
+    await asyncio.to_thread(ping_database)
+    return None
+
+
+async def _probe_redis() -> Optional[str]:
+    if not uses_redis():
+        raise NotConfigured()
+    await get_async_redis().ping()
+    return None
+
+
+async def _probe_llm() -> Optional[str]:
+    if settings.APP_PROFILE == "api":
+        raise NotConfigured()
+    if settings.LLM_PROVIDER == "fake":
+        return "fake"
+    if not settings.OPENAI_API_KEY or not settings.HEALTH_LLM_URL:
+        raise NotConfigured()
+    import httpx
+
+    async with httpx.AsyncClient(timeout=settings.HEALTH_PROBE_TIMEOUT) as client:
+        response = await client.get(
+            settings.HEALTH_LLM_URL,
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+        )
+    response.raise_for_status()
+    return settings.OPENAI_MODEL
+
+
+async def _probe_nmap() -> Optional[str]:
+    if settings.APP_PROFILE == "api":
+        raise NotConfigured()
+    if settings.SCANNER_BACKEND == "stub":
+        return "stub"
+    path = shutil.which("nmap")
+    if path is None:
+        raise FileNotFoundError("nmap not found on PATH")
+    process = await asyncio.create_subprocess_exec(
+        path, "--version", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors="replace").strip() or f"exit code {process.returncode}")
+    lines = stdout.decode(errors="replace").splitlines()
+    return lines[0] if lines else None
+
+
+PROBES = {
+    "database": _probe_database,
+    "redis": _probe_redis,
+    "llm": _probe_llm,
+    "nmap": _probe_nmap,
+}
+
+
+async def _run_probe(name: str, probe) -> dict:
+    """프로브 하나 실행 (HEALTH_PROBE_TIMEOUT 제한, 예외는 결과로 기록)"""
+    started = time.perf_counter()
+    detail, error = None, None
+    try:
+        detail = await asyncio.wait_for(probe(), timeout=settings.HEALTH_PROBE_TIMEOUT)
+        status = OK
+    except NotConfigured:
+        status = NOT_CONFIGURED
+    except asyncio.TimeoutError:
+        status = UNAVAILABLE
+        error = f"timed out after {settings.HEALTH_PROBE_TIMEOUT:g}s"
+    except Exception as e:
+        status = UNAVAILABLE
+        error = (str(e).splitlines() or [""])[0] or type(e).__name__
+    latency = time.perf_counter() - started
+
+    previous = _results.get(name, {}).get("status")
+    if status == UNAVAILABLE and previous != UNAVAILABLE:
+        logger.warning(f"Dependency {name} unavailable: {error}")
+    elif status == OK and previous == UNAVAILABLE:
+        logger.info(f"Dependency {name} recovered ({latency * 1000:.0f}ms)")
+
+    if status != NOT_CONFIGURED:
+        metrics.DEPENDENCY_UP.labels(name).set(1 if status == OK else 0)
+        metrics.DEPENDENCY_LATENCY.labels(name).set(latency)
+    return {
+        "status": status,
+        "latency_ms": round(latency * 1000, 2) if status != NOT_CONFIGURED else None,
+        "detail": detail,
+        "error": error,
+        "checked_at": datetime.utcnow().isoformat(),
+    }
+
+
+async def probe_all() -> Dict[str, dict]:
+    """모든 의존성을 동시에 확인하고 결과를 갱신"""
+    global _last_probed
+    names = list(PROBES)
+    results = await asyncio.gather(*(_run_probe(name, PROBES[name]) for name in names))
+    _results.update(zip(names, results))
+    _last_probed = time.monotonic()
+    return snapshot()
+
+
+async def run_periodically() -> None:
+    """HEALTH_PROBE_INTERVAL마다 probe_all 실행 (첫 확인은 시작 시 호출자가 수행)"""
+    while True:
+        await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL)
+        try:
+            await probe_all()
+        except Exception as e:
+            logger.error(f"Health probe round failed: {e}", exc_info=True)
+
+
+def snapshot() -> Dict[str, dict]:
+    """마지막 확인 결과 (의존성 이름 -> 결과 복사본)"""
+    return {name: dict(result) for name, result in _results.items()}
+
+
+def is_stale() -> bool:
+    """
+    마지막 확인이 너무 오래됨 (프로브 태스크가 멈췄거나 종료됨)
+
+    주기의 3배와 주기 + 제한 시간 2배 중 긴 쪽을 넘으면 stale.
+    """
+    if _last_probed is None:
+        return True
+    limit = max(3 * settings.HEALTH_PROBE_INTERVAL, settings.HEALTH_PROBE_INTERVAL + 2 * settings.HEALTH_PROBE_TIMEOUT)
+    return time.monotonic() - _last_probed > limit
+
+
+def overall_status() -> str:
+    """
+    healthy / degraded / unhealthy
+
+    - unhealthy: 필수 의존성(CRITICAL)을 사용할 수 없거나 결과가 stale
+    - degraded: LLM/nmap 등 나머지 의존성을 사용할 수 없음
+    """
+    if is_stale():
+        return "unhealthy"
+    unavailable = {name for name, result in _results.items() if result["status"] == UNAVAILABLE}
+    if unavailable & set(CRITICAL):
+        return "unhealthy"
+    if unavailable:
+        return "degraded"
+    return "healthy"
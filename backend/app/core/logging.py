@@ -1,42 +1,237 @@
 """
 로깅 설정
+
+로그 호출은 큐에 넣기만 하고 (QueueHandler) 포맷/콘솔 출력/파일 쓰기는 별도 리스너 스레드가 처리한다.
+이벤트 루프와 스캔 워커가 디스크 I/O를 기다리지 않는다.
+
+- LOG_JSON_FORMAT=true이면 한 줄에 JSON 객체 하나 (timestamp, level, logger, message, session_id, node,
+  trace_id 및 extra로 넘긴 duration_ms 등)
+- 파일은 LOG_ROTATE_WHEN 주기와 LOG_ROTATE_MAX_BYTES 크기 중 먼저 도달하는 쪽에서 교체
+- 큐가 가득 차면 (LOG_QUEUE_SIZE) 기다리지 않고 버리고, 버린 개수를 다음 로그와 함께 경고로 남긴다
+
+session_id/node는 log_context()로 묶은 범위 안의 모든 로그에 붙는다.
+
+    with log_context(session_id=session_id):
+        logger.info("Scan completed", extra={"duration_ms": 1234.5})
 """
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
+
+from app.core import tracing
 from app.core.config import settings
 
+# 스캔 단위 로그 필드 (session_id, batch_id, node)
+_log_context: contextvars.ContextVar[dict] = contextvars.ContextVar("log_context", default={})
+
+# LogRecord 기본 속성 (이 밖의 속성은 extra로 넘긴 필드로 보고 JSON에 포함)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@contextmanager
+def log_context(**fields):
+    """범위 안에서 남기는 로그에 필드 추가 (스레드/태스크별, 중첩 가능)"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """로그 호출 스레드에서 컨텍스트 필드를 레코드에 복사 (리스너 스레드에서는 알 수 없으므로)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        if not hasattr(record, "trace_id"):
+            ids = tracing.current_ids()
+            if ids is not None:
+                record.trace_id, record.span_id = ids
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        메시지와 예외만 문자열로 만들어 넘긴다
+
+        기본 구현은 여기서 전체 포맷을 적용하므로 리스너 쪽 포맷터(JSON)가 예외를 따로 다룰 수 없다.
+        """
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+
+        if self.dropped:
+            with self._dropped_lock:
+                dropped, self.dropped = self.dropped, 0
+            warning = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full: dropped {dropped} records",
+                "dropped": dropped,
+            })
+            try:
+                self.queue.put_nowait(warning)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += dropped
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """주기(when)와 크기(max_bytes) 중 먼저 도달하는 쪽에서 교체"""
+
+    def __init__(self, filename: str, when: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+
+    def rotation_filename(self, default_name: str) -> str:
+        """같은 주기 안에서 크기로 여러 번 교체하면 app.log.2025-01-01.001, .002, ..."""
+        if not os.path.exists(default_name):
+            return default_name
+        index = 1
+        while os.path.exists(f"{default_name}.{index:03d}"):
+            index += 1
+        return f"{default_name}.{index:03d}"
+
 
 def setup_logging():
     """구조화된 로깅 설정"""
+    global _listener
 
     # 로그 디렉토리 생성
     log_dir = Path(settings.LOG_FILE).parent
-    log_dir.mkdir(exist_ok=True)
+    log_dir.mkdir(parents=True, exist_ok=True)
 
     # 로거 설정
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, settings.LOG_LEVEL))
 
-    # 기존 핸들러 제거
+    # 기존 핸들러 제거 (다시 호출되면 이전 리스너를 멈추고 남은 로그를 비운다)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
     logger.handlers.clear()
 
     # 포맷터
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if settings.LOG_JSON_FORMAT:
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
 
     # 콘솔 핸들러
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
 
-    # 파일 핸들러
-    file_handler = logging.FileHandler(settings.LOG_FILE)
+    # 파일 핸들러 (주기/크기 교체)
+    file_handler = SizedTimedRotatingFileHandler(
+        settings.LOG_FILE,
+        when=settings.LOG_ROTATE_WHEN,
+        max_bytes=settings.LOG_ROTATE_MAX_BYTES,
+        backup_count=settings.LOG_ROTATE_BACKUP_COUNT,
+    )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # 로그 호출 스레드는 큐에 넣기만 한다
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler)
+    _listener.start()
 
     logger.info("Logging configured successfully")
 
     return logger
+
+
+def shutdown_logging() -> None:
+    """
+    큐에 남은 로그를 내보내고 리스너 스레드 종료 (앱 종료 시)
+
+    이후의 로그는 콘솔/파일 핸들러로 바로 쓴다.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
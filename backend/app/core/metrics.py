@@ -0,0 +1,197 @@
+"""
+Prometheus 지표
+
+/metrics에서 텍스트 형식으로 노출한다 (프로세스 단위, API 워커가 여러 개면 워커별로 수집).
+
+- scan_node_duration_seconds: LangGraph 노드별 실행 시간
+- llm_request_duration_seconds / llm_tokens_total: LLM 호출 시간과 토큰 수
+- scanner_ports_probed_total / scanner_invocation_duration_seconds: 스캐너 처리량 (rate로 초당 포트 수)
+- scan_queue_depth / scans_running: 워커 풀 대기/실행 중 스캔 수
+- db_query_duration_seconds: SQL 실행 시간 (문장 종류별)
+- http_request_duration_seconds: HTTP 요청 처리 시간 (라우트 템플릿별)
+- db_pool_*: 연결 풀 상태 (/api/v1/health/db와 같은 값)
+- dependency_up / dependency_probe_latency_seconds: 헬스 프로브의 마지막 의존성 확인 결과
+
+관측은 호출 경로에서 perf_counter 두 번과 히스토그램 observe 한 번만 수행한다.
+"""
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# 스캔 단계는 수 초~수 분
+NODE_BUCKETS = (0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+SCANNER_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+NODE_DURATION = Histogram(
+    "scan_node_duration_seconds",
+    "LangGraph node execution time",
+    ["node", "outcome"],
+    buckets=NODE_BUCKETS,
+)
+LLM_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "LLM call latency",
+    ["operation", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM tokens used",
+    ["operation", "kind"],
+)
+SCANNER_PORTS = Counter(
+    "scanner_ports_probed_total",
+    "Ports probed by the scanner",
+    ["scanner"],
+)
+SCANNER_DURATION = Histogram(
+    "scanner_invocation_duration_seconds",
+    "Scanner process run time per invocation",
+    ["scanner"],
+    buckets=SCANNER_BUCKETS,
+)
+SCAN_QUEUE_DEPTH = Gauge(
+    "scan_queue_depth",
+    "Scans submitted to the worker pool and not started yet",
+)
+SCANS_RUNNING = Gauge(
+    "scans_running",
+    "Scans currently running in this process",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["operation"],
+    buckets=DB_BUCKETS,
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency (streaming responses include the stream)",
+    ["method", "route", "status"],
+)
+DEPENDENCY_UP = Gauge(
+    "dependency_up",
+    "Whether the last health probe of the dependency succeeded",
+    ["dependency"],
+)
+DEPENDENCY_LATENCY = Gauge(
+    "dependency_probe_latency_seconds",
+    "Latency of the last health probe of the dependency",
+    ["dependency"],
+)
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def observe_llm(operation: str, seconds: float, response=None, outcome: str = "ok") -> None:
+    """LLM 호출 시간과 토큰 수 기록 (response.usage_metadata가 있으면 토큰 포함)"""
+    LLM_DURATION.labels(operation, outcome).observe(seconds)
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        LLM_TOKENS.labels(operation, "input").inc(usage.get("input_tokens", 0))
+        LLM_TOKENS.labels(operation, "output").inc(usage.get("output_tokens", 0))
+
+
+def count_ports(ports: str) -> int:
+    """"1-1000,8080" 형태의 포트 지정에 포함된 포트 수"""
+    total = 0
+    for part in ports.split(","):
+        low, _, high = part.strip().partition("-")
+        if low:
+            total += int(high or low) - int(low) + 1
+    return total
+
+
+def instrument_queries(engine: Engine) -> None:
+    """SQL 실행 시간 기록 (커서 실행 이벤트)"""
+    if not (settings.METRICS_ENABLED and settings.METRICS_DB_QUERIES):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        operation = statement.lstrip()[:6].upper()
+        DB_QUERY_DURATION.labels(operation if operation in _SQL_OPERATIONS else "OTHER").observe(
+            time.perf_counter() - started
+        )
+
+
+class DBPoolCollector:
+    """연결 풀 상태를 수집 시점에 읽어 노출"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def collect(self):
+        from app.core.db_metrics import pool_status
+
+        status = pool_status(self.engine)
+        for name, help_text in (
+            ("size", "Configured pool size"),
+            ("checked_out", "Connections currently checked out"),
+            ("overflow", "Overflow connections currently open"),
+            ("checked_out_peak", "Highest concurrent checkouts since start"),
+        ):
+            if name in status:
+                yield GaugeMetricFamily(f"db_pool_{name}", help_text, value=status[name])
+        for name, help_text in (
+            ("checkouts", "Connection checkouts"),
+            ("wait_timeouts", "Checkouts that timed out waiting for a connection"),
+            ("pre_ping_failures", "Stale connections detected by pre-ping"),
+            ("invalidations", "Invalidated connections"),
+        ):
+            yield CounterMetricFamily(f"db_pool_{name}", help_text, value=status[name])
+        yield CounterMetricFamily(
+            "db_pool_wait_seconds", "Total time spent waiting for a connection",
+            value=status["wait_ms_total"] / 1000,
+        )
+
+
+class HTTPMetricsMiddleware:
+    """
+    HTTP 요청 처리 시간 기록 (ASGI 미들웨어)
+
+    라벨은 실제 경로가 아닌 라우트 템플릿(/scan/{session_id})을 사용한다.
+    BaseHTTPMiddleware와 달리 응답 본문을 감싸지 않으므로 스트리밍 응답에 영향이 없다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,51 @@
+"""
+Redis 클라이언트 관리
+"""
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_async_client = None
+
+
+def get_redis():
+    """
+    동기 Redis 클라이언트 반환 (프로세스당 1개, 지연 생성)
+    워커 스레드에서 publish 등에 사용
+    """
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        logger.info("Redis client created")
+    return _client
+
+
+def get_async_redis():
+    """
+    비동기 Redis 클라이언트 반환 (이벤트 루프에서 subscribe 등에 사용)
+    """
+    global _async_client
+    if _async_client is None:
+        import redis.asyncio
+
+        _async_client = redis.asyncio.Redis.from_url(
+            settings.REDIS_URL, decode_responses=True
+        )
+        logger.info("Async Redis client created")
+    return _async_client
+
+
+async def close_redis() -> None:
+    """Redis 연결 정리 (애플리케이션 종료 시)"""
+    global _client, _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -0,0 +1,132 @@
+"""
+읽기 전용 replica 라우팅
+
+DATABASE_REPLICA_URLS가 설정되어 있으면 읽기 전용 요청(get_read_db)을 replica로 보낸다.
+
+- 복제 지연(lag)을 REPLICA_LAG_CHECK_INTERVAL마다 확인해 REPLICA_MAX_LAG_SECONDS보다
+  뒤처졌거나 연결할 수 없는 replica는 건너뛴다 (모두 사용할 수 없으면 primary)
+- 사용할 수 있는 replica가 여럿이면 번갈아 사용
+- API가 방금 쓴 세션(생성/재개/취소/삭제)은 READ_YOUR_WRITES_SECONDS 동안 primary에서 읽는다
+  (표시는 캐시에 남기므로 CACHE_BACKEND=redis이면 API 워커끼리 공유된다)
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.cache import get_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# replica 연결 제한 시간 (초, 연결할 수 없는 replica 때문에 요청이 오래 걸리지 않도록)
+REPLICA_CONNECT_TIMEOUT = 2
+
+# 복제 지연 (초). primary(복구 모드가 아님)는 0, 알 수 없으면 NULL
+LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """replica 엔진과 마지막으로 확인한 복제 지연"""
+
+    def __init__(self, url: str, pool_size: int, max_overflow: int):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine: Engine = create_engine(
+            url,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            echo=settings.SQL_ECHO,
+            connect_args={"connect_timeout": REPLICA_CONNECT_TIMEOUT},
+        )
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at = 0.0
+        self._checking = threading.Lock()
+
+    @property
+    def usable(self) -> bool:
+        return self.lag is not None and self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    def refresh(self) -> None:
+        """확인 주기가 지났으면 복제 지연 확인 (다른 스레드가 확인 중이면 마지막 값 사용)"""
+        if time.monotonic() - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return
+        if not self._checking.acquire(blocking=False):
+            return
+        try:
+            with self.engine.connect() as conn:
+                lag = conn.execute(LAG_QUERY).scalar()
+            self.lag = float(lag) if lag is not None else None
+            self.error = None if lag is not None else "replication lag unknown"
+        except Exception as e:
+            self.lag = None
+            self.error = str(e).splitlines()[0]
+            logger.warning(f"Replica {self.name} unavailable, reading from primary: {self.error}")
+        finally:
+            self.checked_at = time.monotonic()
+            self._checking.release()
+
+        if self.lag is not None and not self.usable:
+            logger.warning(
+                f"Replica {self.name} lagging {self.lag:.1f}s "
+                f"(> {settings.REPLICA_MAX_LAG_SECONDS}s), reading from primary"
+            )
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "usable": self.usable,
+            "lag_seconds": round(self.lag, 3) if self.lag is not None else None,
+            "error": self.error,
+        }
+
+
+class ReplicaRouter:
+    """사용할 수 있는 replica를 번갈아 고른다"""
+
+    def __init__(self, urls: List[str], pool_size: int, max_overflow: int):
+        self.replicas = [Replica(url, pool_size, max_overflow) for url in urls]
+        self._next = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        """읽기에 사용할 replica (없으면 None → primary)"""
+        if not self.replicas:
+            return None
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            replica.refresh()
+            if replica.usable:
+                return replica
+        return None
+
+    def status(self) -> List[dict]:
+        return [replica.status() for replica in self.replicas]
+
+
+def _written_key(session_id: str) -> str:
+    return f"db:written:{session_id}"
+
+
+def mark_written(session_id: str) -> None:
+    """방금 쓴 세션 표시 (READ_YOUR_WRITES_SECONDS 동안 primary에서 읽는다)"""
+    if settings.DATABASE_REPLICA_URLS:
+        get_cache().set(_written_key(session_id), "1", settings.READ_YOUR_WRITES_SECONDS)
+
+
+def recently_written(session_id: str) -> bool:
+    """READ_YOUR_WRITES_SECONDS 안에 쓴 세션인지 (replica가 없으면 캐시를 조회하지 않음)"""
+    if not settings.DATABASE_REPLICA_URLS:
+        return False
+    return get_cache().get(_written_key(session_id)) is not None
@@ -0,0 +1,278 @@
+"""
+스캔 추적 (OpenTelemetry)
+
+TRACING_ENABLED=true이고 opentelemetry-sdk가 설치되어 있을 때만 동작한다 (없으면 모든 함수가 no-op).
+
+span 구조:
+    HTTP {method} {route}              (TracingMiddleware, traceparent 헤더를 이어받음)
+    └─ scan                            (세션마다 하나, 워커 스레드에서 요청 컨텍스트를 이어받음)
+       ├─ node_port_scan               (LangGraph 노드)
+       │  └─ nmap                      (nmap 실행마다)
+       ├─ node_risk
+       │  └─ llm.invoke                (LLM 호출마다, 토큰 수 포함)
+       └─ db.UPDATE ...                (상위 span이 있을 때만 SQL 실행마다)
+
+내보내기 (TRACING_EXPORTER):
+- otlp: OTLP/HTTP로 collector에 전송 (TRACING_OTLP_ENDPOINT)
+- file: OTLP JSON(ExportTraceServiceRequest)을 한 줄씩 파일에 기록 (TRACING_FILE_PATH, 오프라인 분석용)
+- console: 표준 출력 (개발용)
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# db.statement 속성에 남기는 최대 길이
+MAX_STATEMENT_LENGTH = 2000
+
+_tracer = None
+
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 span 대신 사용"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _file_exporter(path: str):
+    """OTLP JSON 파일 exporter (collector의 file exporter와 같은 형식, 한 줄에 요청 하나)"""
+    from google.protobuf import json_format
+    from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class OTLPJsonFileExporter(SpanExporter):
+        def __init__(self):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._lock = threading.Lock()
+            self._file = open(path, "a", encoding="utf-8")
+
+        def export(self, spans):
+            line = json.dumps(json_format.MessageToDict(encode_spans(spans)), separators=(",", ":"))
+            with self._lock:
+                self._file.write(line + "\n")
+                self._file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            with self._lock:
+                self._file.close()
+
+    return OTLPJsonFileExporter()
+
+
+def setup_tracing() -> bool:
+    """
+    TracerProvider 설정 (앱 시작 시 한 번)
+
+    Returns:
+        추적을 사용하면 True
+    """
+    global _tracer
+    if not settings.TRACING_ENABLED or _tracer is not None:
+        return _tracer is not None
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return False
+
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    elif settings.TRACING_EXPORTER == "file":
+        exporter = _file_exporter(settings.TRACING_FILE_PATH)
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.APP_NAME,
+            "service.version": settings.APP_VERSION,
+            "process.role": settings.PROCESS_ROLE,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("app")
+    logger.info(f"Tracing enabled: {settings.TRACING_EXPORTER} exporter")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """남은 span 내보내기 (앱 종료 시)"""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+
+    trace.get_tracer_provider().shutdown()
+
+
+def current_context():
+    """
+    현재 추적 컨텍스트 (다른 스레드로 넘길 때 사용, 추적이 꺼져 있으면 None)
+
+    워커 풀은 contextvars를 복사하지 않으므로 제출 시점에 잡아서 넘긴다.
+    """
+    if _tracer is None:
+        return None
+    from opentelemetry import context
+
+    return context.get_current()
+
+
+def current_ids():
+    """현재 span의 (trace_id, span_id) 16진 문자열 (로그 상관관계용, 없으면 None)"""
+    if _tracer is None:
+        return None
+    from opentelemetry import trace
+
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid:
+        return None
+    return f"{span_context.trace_id:032x}", f"{span_context.span_id:016x}"
+
+
+def span(name: str, attributes: Optional[dict] = None, parent=None, kind=None):
+    """
+    span 컨텍스트 매니저 (with tracing.span("nmap", {"scanner.ports": ports}) as s)
+
+    parent: current_context()로 잡은 컨텍스트 (없으면 현재 스레드의 컨텍스트)
+    추적이 꺼져 있으면 NOOP_SPAN을 돌려주는 nullcontext.
+    """
+    if _tracer is None:
+        return nullcontext(NOOP_SPAN)
+    return _start_span(name, parent, kind, attributes or {})
+
+
+@contextmanager
+def _start_span(name: str, parent, kind, attributes: dict):
+    from opentelemetry.trace import SpanKind
+
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with _tracer.start_as_current_span(
+        name,
+        context=parent,
+        kind=kind or SpanKind.INTERNAL,
+        attributes=attributes,
+    ) as current:
+        yield current
+
+
+def set_llm_usage(current, response) -> None:
+    """LLM 응답의 토큰 수를 span 속성으로 기록"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        current.set_attribute("gen_ai.usage.input_tokens", usage.get("input_tokens", 0))
+        current.set_attribute("gen_ai.usage.output_tokens", usage.get("output_tokens", 0))
+
+
+def instrument_queries(engine) -> None:
+    """SQL 실행마다 db span 생성 (상위 span이 있는 경우에만, 스캔/요청 밖의 쿼리는 건너뜀)"""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is None or not trace.get_current_span().is_recording():
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        context._trace_span = _tracer.start_span(
+            f"db.{operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        current = getattr(context, "_trace_span", None)
+        if current is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                current.set_attribute("db.rows", cursor.rowcount)
+            current.end()
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        current = getattr(exception_context.execution_context, "_trace_span", None)
+        if current is not None:
+            current.record_exception(exception_context.original_exception)
+            current.set_status(Status(StatusCode.ERROR))
+            current.end()
+            exception_context.execution_context._trace_span = None
+
+
+class TracingMiddleware:
+    """
+    HTTP 요청 span (ASGI 미들웨어)
+
+    traceparent 헤더가 있으면 호출자의 trace를 이어받는다.
+    span 이름은 라우팅이 끝난 뒤 라우트 템플릿으로 바꾼다 (HTTP GET /api/v1/langgraph/scan/{session_id}).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if _tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry import propagate
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        parent = propagate.extract(headers)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with _tracer.start_as_current_span(
+            f"HTTP {scope['method']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as current:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    current.update_name(f"HTTP {scope['method']} {route.path}")
+                    current.set_attribute("http.route", route.path)
+                current.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    current.set_status(Status(StatusCode.ERROR))
@@ -3,16 +3,29 @@ FastAPI 애플리케이션 진입점
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
 
 from app.core.config import settings
-from app.core.logging import setup_logging
-from app.api.v1 import health, langgraph, openai_adapter
+from app.core import health_probes, tracing
+from app.core.database import engine, warmup_pool
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.metrics import HTTPMetricsMiddleware
+from app.core.redis import close_redis
+from app.services import retention
+from app.services.checkpointer import close_checkpointer
+from app.services.profiling import ProfilingMiddleware, start_tracemalloc
+from app.services.result_writer import close_result_writer
+from app.api.v1 import (
+    archive, batch, events, fleet, health, langgraph, metrics, openai_adapter, profiling, stats,
+)
 
-# 로깅 설정
-setup_logging()
 logger = logging.getLogger(__name__)
 
+APP_PROFILES = ("full", "api")
+if settings.APP_PROFILE not in APP_PROFILES:
+    raise ValueError(f"Unknown APP_PROFILE: {settings.APP_PROFILE} (expected one of {APP_PROFILES})")
+
 # FastAPI 앱 생성
 app = FastAPI(
     title=settings.APP_NAME,
@@ -31,23 +44,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# HTTP 요청 처리 시간 지표 (라우트별)
+if settings.METRICS_ENABLED:
+    app.add_middleware(HTTPMetricsMiddleware)
+
+# X-Profile 헤더로 요청/스캔 프로파일링
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# 요청 span (가장 바깥, traceparent 헤더를 이어받아 스캔 워커까지 전달)
+if settings.TRACING_ENABLED:
+    app.add_middleware(tracing.TracingMiddleware)
+
 # 라우터 등록
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(langgraph.router, prefix="/api/v1/langgraph", tags=["langgraph"])
-app.include_router(openai_adapter.router, prefix="/api", tags=["openai"])  # OpenAI 호환 API
+app.include_router(events.router, prefix="/api/v1/langgraph", tags=["events"])  # WebSocket/SSE
+app.include_router(fleet.router, prefix="/api/v1/fleet", tags=["fleet"])
+app.include_router(archive.router, prefix="/api/v1/archive", tags=["archive"])
+app.include_router(stats.router, prefix="/api/v1/stats", tags=["stats"])
+# 스캔 제출/실행 (APP_PROFILE=api인 조회 전용 프로세스에는 등록하지 않음)
+if settings.APP_PROFILE == "full":
+    app.include_router(langgraph.scan_router, prefix="/api/v1/langgraph", tags=["langgraph"])
+    app.include_router(batch.router, prefix="/api/v1/langgraph", tags=["batch"])
+    app.include_router(openai_adapter.router, prefix="/api", tags=["openai"])  # OpenAI 호환 API
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])  # Prometheus
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling.router, prefix="/api/v1/profiling", tags=["profiling"])
 
 
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행"""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    # 로깅 설정 (import 시점이 아닌 시작 시점에 리스너 스레드와 파일 핸들러를 만든다)
+    setup_logging()
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION} ({settings.APP_PROFILE} profile)")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
+    # 추적 설정 (opentelemetry-sdk가 없으면 비활성화)
+    if tracing.setup_tracing():
+        tracing.instrument_queries(engine)
+
+    # 장시간 실행되는 워커의 메모리 증가 추적 (/api/v1/profiling/tracemalloc)
+    if settings.PROFILING_ENABLED and settings.PROFILING_TRACEMALLOC_FRAMES > 0:
+        start_tracemalloc(settings.PROFILING_TRACEMALLOC_FRAMES)
+
+    # 연결 풀 미리 채우기 (시작 직후 폴링 요청이 연결 생성을 기다리지 않도록)
+    if settings.DB_POOL_WARMUP:
+        await asyncio.to_thread(warmup_pool)
+
+    # 의존성 헬스 프로브 (첫 확인을 마친 뒤 요청을 받는다)
+    if settings.HEALTH_PROBE_INTERVAL > 0:
+        await health_probes.probe_all()
+        app.state.health_task = asyncio.create_task(health_probes.run_periodically())
+
+    # 월 파티션 생성 및 오래된 파티션 보관 (0이면 cron으로 실행)
+    if settings.SCAN_RETENTION_INTERVAL_HOURS > 0:
+        app.state.retention_task = asyncio.create_task(retention.run_periodically())
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("Shutting down application")
+    for name in ("retention_task", "health_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    close_result_writer()
+    await close_redis()
+    close_checkpointer()
+    tracing.shutdown_tracing()
+    shutdown_logging()
 
 
 @app.get("/")
@@ -1,6 +1,17 @@
 """
 Database models
 """
+from app.models.scan_findings import ScanFinding, ScanPort
+from app.models.scan_result import ScanResultBlob
 from app.models.scan_session import ScanSession
+from app.models.scan_stats import FindingSeverityStats, OpenServiceStats, ScanOutcomeStats
 
-__all__ = ["ScanSession"]
+__all__ = [
+    "ScanSession",
+    "ScanResultBlob",
+    "ScanPort",
+    "ScanFinding",
+    "ScanOutcomeStats",
+    "FindingSeverityStats",
+    "OpenServiceStats",
+]
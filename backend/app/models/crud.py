@@ -0,0 +1,937 @@
+"""
+스캔 세션 CRUD 함수
+"""
+import base64
+import enum
+import io
+import json
+import uuid
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, column, delete, func, select, text, tuple_, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.orm import Session, joinedload, undefer_group
+
+from app.core.config import settings
+from app.models.scan_findings import ScanFinding, ScanPort
+from app.models.scan_result import RESULT_FIELDS, ScanResultBlob
+from app.models.scan_session import TERMINAL_STATUSES, ScanSession, ScanStatus, ScanType, created_at_range
+from app.models.scan_stats import FindingSeverityStats, OpenServiceStats, ScanOutcomeStats
+
+
+def created_at_bounds(ids: Iterable) -> list:
+    """
+    세션/배치 ID(UUIDv7)에 담긴 생성 시각으로 만든 created_at 범위 조건
+
+    ID 조건에 함께 걸면 해당 월 파티션만 읽는다 (기본 키가 (id, created_at)이므로
+    ID만으로는 모든 파티션의 인덱스를 확인한다). 기존 uuid4 ID가 섞여 있으면 조건 없음.
+    """
+    ranges = [created_at_range(value) for value in ids]
+    if not ranges or None in ranges:
+        return []
+    return [
+        ScanSession.created_at >= min(lower for lower, _ in ranges),
+        ScanSession.created_at <= max(upper for _, upper in ranges),
+    ]
+
+
+def _by_id(session_id) -> list:
+    return [ScanSession.id == session_id, *created_at_bounds([session_id])]
+
+
+def _by_ids(session_ids: Iterable) -> list:
+    session_ids = list(session_ids)
+    return [ScanSession.id.in_(session_ids), *created_at_bounds(session_ids)]
+
+
+def create_scan_session(
+    db: Session,
+    target: str,
+    scan_type: str,
+    started_at: Optional[datetime] = None,
+    session_id: Optional[str] = None,
+) -> ScanSession:
+    """PENDING 상태의 스캔 세션 생성"""
+    db_session = ScanSession(
+        id=uuid.UUID(session_id) if session_id else None,
+        target=target,
+        scan_type=ScanType(scan_type),
+        status=ScanStatus.PENDING,
+        progress=0,
+        started_at=started_at,
+    )
+    db.add(db_session)
+    db.commit()
+    db.refresh(db_session)
+    return db_session
+
+
+def create_scan_sessions_bulk(db: Session, rows: List[dict]) -> None:
+    """
+    여러 스캔 세션을 한 번의 multi-row INSERT로 생성 (커밋 1회)
+
+    각 row는 id, target, scan_type, batch_id, linked_session_id 등을 담는다.
+    BULK_COPY_MIN_ROWS 이상이면 COPY로 삽입한다 (CIDR 대역 등).
+    """
+    if not rows:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {
+            "status": ScanStatus.PENDING,
+            "progress": 0,
+            "created_at": now,
+            "updated_at": now,
+            **row,
+        }
+        for row in rows
+    ]
+    if len(rows) >= settings.BULK_COPY_MIN_ROWS:
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+        copy_rows(db, ScanSession, [{key: row.get(key) for key in keys} for row in rows])
+    else:
+        db.execute(insert(ScanSession), rows)
+    db.commit()
+
+
+def get_scan_session(
+    db: Session,
+    session_id: str,
+    with_result: bool = False,
+) -> Optional[ScanSession]:
+    """
+    세션 ID로 스캔 세션 조회
+
+    결과 컬럼(ports, report 등)은 지연 로딩되므로,
+    결과를 읽을 경우 with_result=True로 한 번에 가져온다 (압축 결과 포함).
+    결과는 ScanSession.result_payload()로 읽는다.
+    """
+    query = db.query(ScanSession).filter(*_by_id(session_id))
+    if with_result:
+        query = query.options(
+            undefer_group("result"),
+            joinedload(ScanSession.result_blob),
+        )
+    return query.first()
+
+
+def get_scan_status(db: Session, session_id: str):
+    """상태 조회용 경량 프로젝션 (결과 컬럼을 읽지 않음)"""
+    return db.query(
+        ScanSession.id,
+        ScanSession.status,
+        ScanSession.progress,
+        ScanSession.current_step,
+        ScanSession.error,
+    ).filter(*_by_id(session_id)).first()
+
+
+def get_scan_statuses(db: Session, session_ids: Iterable) -> List:
+    """여러 세션의 (id, status) 목록 (없는 세션은 빠진다)"""
+    return db.query(ScanSession.id, ScanSession.status).filter(*_by_ids(session_ids)).all()
+
+
+def get_batch_statuses(db: Session, batch_id: str) -> List:
+    """배치에 속한 세션의 (id, status) 목록"""
+    return db.query(ScanSession.id, ScanSession.status).filter(
+        ScanSession.batch_id == batch_id, *created_at_bounds([batch_id])
+    ).all()
+
+
+def get_sessions_with_result(db: Session, session_ids: Iterable) -> List[ScanSession]:
+    """여러 세션을 결과 컬럼까지 한 번에 조회"""
+    return (
+        db.query(ScanSession)
+        .filter(*_by_ids(session_ids))
+        .options(undefer_group("result"), joinedload(ScanSession.result_blob))
+        .all()
+    )
+
+
+def sync_linked_sessions(db: Session, owner_id: str) -> List:
+    """
+    진행 중 세션에 합류한 세션(linked_session_id)에 소유 세션의 최종 상태와 결과를 복사
+
+    소유 세션이 아직 끝나지 않았으면 아무것도 하지 않는다.
+
+    Returns:
+        갱신된 세션의 (id, batch_id, status) 목록
+    """
+    owner = get_scan_session(db, owner_id, with_result=True)
+    if owner is None or owner.status not in TERMINAL_STATUSES:
+        return []
+
+    values = {
+        "status": owner.status,
+        "progress": owner.progress,
+        "current_step": owner.current_step,
+        "error": owner.error,
+        "completed_at": owner.completed_at,
+        "result_digest": owner.result_digest,
+        "updated_at": datetime.utcnow(),
+        **{field: getattr(owner, field) for field in RESULT_FIELDS},
+    }
+    rows = db.execute(
+        update(ScanSession)
+        .where(
+            ScanSession.linked_session_id == owner.id,
+            ScanSession.status == ScanStatus.PENDING,
+            # 합류 세션은 소유 세션보다 나중에 만들어진다
+            ScanSession.created_at >= owner.created_at,
+        )
+        .values(**values)
+        .returning(
+            ScanSession.id,
+            ScanSession.batch_id,
+            ScanSession.status,
+            ScanSession.scan_type,
+            ScanSession.started_at,
+            ScanSession.completed_at,
+            ScanSession.updated_at,
+        )
+    ).all()
+    # 합류 세션은 PENDING에서 종료 상태로만 바뀐다
+    _rollup_outcomes(db, [
+        (row.status, row.scan_type, row.started_at, row.completed_at or row.updated_at, 1)
+        for row in rows
+    ])
+    db.commit()
+    return rows
+
+
+def delete_scan_session(db: Session, session_id: str) -> bool:
+    """
+    스캔 세션 삭제 (행을 로드하지 않고 삭제, 참조가 없어진 압축 결과도 정리)
+
+    scan_ports/scan_findings는 FK가 없으므로 (파티션 테이블) 여기서 함께 지운다.
+    """
+    deleted = db.execute(
+        delete(ScanSession)
+        .where(*_by_id(session_id))
+        .returning(ScanSession.result_digest)
+    ).first()
+
+    if deleted is not None:
+        db.execute(delete(ScanPort).where(ScanPort.session_id == session_id))
+        db.execute(delete(ScanFinding).where(ScanFinding.session_id == session_id))
+
+    if deleted is not None and deleted.result_digest is not None:
+        db.execute(
+            delete(ScanResultBlob).where(
+                ScanResultBlob.digest == deleted.result_digest,
+                ~select(ScanSession.id)
+                .where(ScanSession.result_digest == deleted.result_digest)
+                .exists(),
+            )
+        )
+
+    db.commit()
+    return deleted is not None
+
+
+def update_scan_status(
+    db: Session,
+    session_id: str,
+    status: ScanStatus,
+    **fields,
+) -> None:
+    """
+    스캔 상태 및 부가 필드(progress, current_step, error 등) 업데이트
+
+    종료 상태로 바뀌거나(재개 등으로) 종료 상태에서 벗어나면 일별 집계도 같은 트랜잭션에서 갱신한다.
+    """
+    values = {"status": status, "updated_at": datetime.utcnow(), **fields}
+
+    # 이전 상태를 함께 읽기 위해 같은 행을 잠그고 UPDATE ... FROM으로 갱신
+    old = (
+        select(
+            ScanSession.id,
+            ScanSession.created_at,
+            ScanSession.status,
+            ScanSession.started_at,
+            ScanSession.completed_at,
+            ScanSession.updated_at,
+        )
+        .where(*_by_id(session_id))
+        .with_for_update()
+        .subquery()
+    )
+    row = db.execute(
+        update(ScanSession)
+        .where(ScanSession.id == old.c.id, ScanSession.created_at == old.c.created_at)
+        .values(**values)
+        .returning(
+            old.c.status.label("old_status"),
+            old.c.started_at.label("old_started_at"),
+            (func.coalesce(old.c.completed_at, old.c.updated_at)).label("old_ended_at"),
+            ScanSession.scan_type,
+            ScanSession.started_at,
+            (func.coalesce(ScanSession.completed_at, ScanSession.updated_at)).label("ended_at"),
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if row is not None:
+        _rollup_outcomes(db, [
+            (row.old_status, row.scan_type, row.old_started_at, row.old_ended_at, -1),
+            (status, row.scan_type, row.started_at, row.ended_at, 1),
+        ])
+    db.commit()
+
+
+def _upsert_increments(db: Session, model, counters: dict, key_columns: Tuple[str, ...]) -> None:
+    """
+    {키 튜플: {컬럼: 증감}}을 집계 테이블에 더한다 (INSERT ... ON CONFLICT DO UPDATE)
+
+    동시에 같은 행을 갱신하는 트랜잭션끼리 교착되지 않도록 키 순서로 정렬해 삽입한다.
+    """
+    if not counters:
+        return
+    rows = [
+        {**dict(zip(key_columns, key)), **deltas}
+        for key, deltas in sorted(counters.items(), key=lambda item: tuple(map(str, item[0])))
+    ]
+    stmt = insert(model).values(rows)
+    value_columns = [column for column in rows[0] if column not in key_columns]
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                column: getattr(model, column) + getattr(stmt.excluded, column)
+                for column in value_columns
+            },
+        )
+    )
+
+
+def _rollup_outcomes(db: Session, changes: Iterable[tuple]) -> None:
+    """
+    종료 상태 집계 갱신 (커밋은 호출자가 수행)
+
+    changes: (status, scan_type, started_at, ended_at, sign) 목록, 종료 상태가 아닌 항목은 무시
+    """
+    counters = {}
+    for status, scan_type, started_at, ended_at, sign in changes:
+        if status not in TERMINAL_STATUSES or ended_at is None:
+            continue
+        deltas = counters.setdefault(
+            (ended_at.date(), scan_type, status),
+            {"sessions": 0, "duration_count": 0, "duration_sum": 0.0},
+        )
+        deltas["sessions"] += sign
+        if started_at is not None:
+            deltas["duration_count"] += sign
+            deltas["duration_sum"] += sign * (ended_at - started_at).total_seconds()
+
+    _upsert_increments(db, ScanOutcomeStats, counters, ("day", "scan_type", "status"))
+
+
+def _rollup_observations(db: Session, ports: Iterable, findings: Iterable, sign: int) -> None:
+    """열린 서비스/심각도 집계 갱신 (ports/findings: created_at, service, port / created_at, severity)"""
+    services, severities = {}, {}
+    for p in ports:
+        key = (p["created_at"].date(), p["service"] or "unknown", p["port"])
+        services.setdefault(key, {"observations": 0})["observations"] += sign
+    for f in findings:
+        key = (f["created_at"].date(), f["severity"])
+        severities.setdefault(key, {"findings": 0})["findings"] += sign
+
+    _upsert_increments(db, OpenServiceStats, services, ("day", "service", "port"))
+    _upsert_increments(db, FindingSeverityStats, severities, ("day", "severity"))
+
+
+def update_scan_progress(
+    db: Session,
+    session_id: str,
+    step: str,
+    progress: int,
+) -> None:
+    """진행 단계/진행률만 업데이트 (상태는 유지)"""
+    db.query(ScanSession).filter(*_by_id(session_id)).update(
+        {
+            "current_step": step,
+            "progress": progress,
+            "updated_at": datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def store_result_blob(db: Session, result: dict) -> str:
+    """
+    결과를 압축 저장소에 저장하고 digest 반환
+    같은 내용이 이미 있으면 새로 저장하지 않는다 (커밋은 호출자가 수행)
+    """
+    values = ScanResultBlob.encode(result)
+    db.execute(
+        insert(ScanResultBlob)
+        .values(created_at=datetime.utcnow(), **values)
+        .on_conflict_do_nothing(index_elements=["digest"])
+    )
+    return values["digest"]
+
+
+def save_scan_result(
+    db: Session,
+    session_id: str,
+    result: dict,
+    status: ScanStatus = ScanStatus.COMPLETED,
+    **extra,
+) -> None:
+    """
+    스캔 결과 저장 및 종료 상태 처리
+
+    취소/타임아웃된 스캔은 status와 함께 부분 결과를 저장한다 (진행률은 유지).
+    RESULT_STORE=compressed이면 결과 컬럼 대신 압축 저장소에 저장한다.
+    """
+    if settings.RESULT_STORE == "compressed":
+        fields = {field: None for field in RESULT_FIELDS}
+        fields["result_digest"] = store_result_blob(db, result)
+    else:
+        fields = {field: result.get(field) for field in RESULT_FIELDS}
+
+    if status == ScanStatus.COMPLETED:
+        extra.setdefault("progress", 100)
+
+    completed_at = datetime.utcnow()
+    replace_scan_observations(db, session_id, result, completed_at)
+
+    # 결과, 정규화 테이블, 상태를 한 번에 커밋
+    update_scan_status(
+        db,
+        session_id,
+        status,
+        completed_at=completed_at,
+        **fields,
+        **extra,
+    )
+
+
+def replace_scan_observations(
+    db: Session,
+    session_id: str,
+    result: dict,
+    observed_at: datetime,
+) -> None:
+    """
+    결과의 ports/vulnerabilities를 scan_ports/scan_findings에 저장 (커밋은 호출자가 수행)
+
+    재개된 스캔이 다시 저장하는 경우를 위해 세션의 기존 행은 지운다.
+    """
+    target = result.get("target")
+    if target is None:
+        target = db.query(ScanSession.target).filter(*_by_id(session_id)).scalar()
+
+    # 이전에 저장한 관측(재개 전 부분 결과 등)은 집계에서도 뺀다
+    old_ports = db.execute(
+        delete(ScanPort)
+        .where(ScanPort.session_id == session_id)
+        .returning(ScanPort.created_at, ScanPort.service, ScanPort.port)
+    ).mappings().all()
+    old_findings = db.execute(
+        delete(ScanFinding)
+        .where(ScanFinding.session_id == session_id)
+        .returning(ScanFinding.created_at, ScanFinding.severity)
+    ).mappings().all()
+    _rollup_observations(db, old_ports, old_findings, -1)
+
+    ports, findings = _observation_rows(session_id, target, result, observed_at)
+
+    # multi-row INSERT로 한 번에 삽입
+    if ports:
+        db.execute(insert(ScanPort), ports)
+    if findings:
+        db.execute(insert(ScanFinding), findings)
+    _rollup_observations(db, ports, findings, 1)
+
+
+def _observation_rows(session_id, target: str, result: dict, observed_at: datetime) -> Tuple[List[dict], List[dict]]:
+    """결과의 ports/vulnerabilities를 scan_ports/scan_findings 행으로 변환"""
+    common = {"session_id": session_id, "target": target, "created_at": observed_at}
+    ports = [
+        {
+            **common,
+            "port": p["port"],
+            "state": p.get("state", "open"),
+            "service": p.get("service"),
+            "version": p.get("version"),
+        }
+        for p in result.get("ports") or []
+    ]
+    findings = [
+        {
+            **common,
+            "port": v.get("port"),
+            "service": v.get("service"),
+            "type": v["type"],
+            "severity": v["severity"],
+            "description": v.get("description"),
+        }
+        for v in result.get("vulnerabilities") or []
+    ]
+    return ports, findings
+
+
+# COPY 텍스트 형식에서 이스케이프해야 하는 문자
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    """COPY 텍스트 형식 값 (NULL은 \\N, Enum은 DB에 저장되는 이름)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):
+        value = value.name
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_rows(db: Session, model, rows: List[dict]) -> None:
+    """
+    여러 행을 COPY FROM STDIN으로 삽입 (커밋은 호출자가 수행)
+
+    모든 행은 같은 키를 가져야 한다. COPY를 지원하지 않는 드라이버이면 multi-row INSERT로 대신한다.
+    """
+    if not rows:
+        return
+    cursor = db.connection().connection.cursor()
+    try:
+        if not hasattr(cursor, "copy_expert"):
+            db.execute(insert(model), rows)
+            return
+
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        quote = db.get_bind().dialect.identifier_preparer.quote
+        cursor.copy_expert(
+            f"COPY {quote(model.__tablename__)} ({', '.join(map(quote, columns))}) FROM STDIN",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def save_scan_results_bulk(db: Session, items: List[Tuple[str, dict, ScanStatus, dict]]) -> None:
+    """
+    여러 스캔의 결과 저장 및 종료 상태 처리를 한 트랜잭션으로 수행 (커밋 1회)
+
+    save_scan_result를 건별로 호출하는 것과 결과는 같다.
+    - 세션 행은 ID 순서로 한 번에 잠그고, 상태/결과는 기본 키 기준 executemany UPDATE로 갱신
+    - scan_ports/scan_findings는 기존 행을 한 번에 지우고 COPY로 삽입
+    - 일별 집계는 모든 세션의 증감을 합쳐 한 번씩 upsert
+
+    items: (session_id, result, status, extra) 목록. extra는 error만 지원한다.
+    """
+    if not items:
+        return
+
+    by_id = {uuid.UUID(str(session_id)): (result, status, extra) for session_id, result, status, extra in items}
+    ids = sorted(by_id)
+    old_rows = db.execute(
+        select(
+            ScanSession.id,
+            ScanSession.created_at,
+            ScanSession.target,
+            ScanSession.scan_type,
+            ScanSession.status,
+            ScanSession.progress,
+            ScanSession.error,
+            ScanSession.started_at,
+            ScanSession.completed_at,
+            ScanSession.updated_at,
+        )
+        .where(*_by_ids(ids))
+        .order_by(ScanSession.id)
+        .with_for_update()
+    ).all()
+    if not old_rows:
+        db.commit()
+        return
+    found = [row.id for row in old_rows]
+
+    completed_at = datetime.utcnow()
+
+    # 압축 저장소: 같은 내용은 한 번만 삽입
+    digests = {}
+    if settings.RESULT_STORE == "compressed":
+        blobs = {}
+        for session_id in found:
+            blob = ScanResultBlob.encode(by_id[session_id][0])
+            digests[session_id] = blob["digest"]
+            blobs.setdefault(blob["digest"], {"created_at": completed_at, **blob})
+        db.execute(
+            insert(ScanResultBlob)
+            .values(sorted(blobs.values(), key=lambda blob: blob["digest"]))
+            .on_conflict_do_nothing(index_elements=["digest"])
+        )
+
+    # 정규화 테이블 교체 (기존 관측은 집계에서 뺀다)
+    old_ports = db.execute(
+        delete(ScanPort)
+        .where(ScanPort.session_id.in_(found))
+        .returning(ScanPort.created_at, ScanPort.service, ScanPort.port)
+    ).mappings().all()
+    old_findings = db.execute(
+        delete(ScanFinding)
+        .where(ScanFinding.session_id.in_(found))
+        .returning(ScanFinding.created_at, ScanFinding.severity)
+    ).mappings().all()
+    _rollup_observations(db, old_ports, old_findings, -1)
+
+    ports, findings = [], []
+    for row in old_rows:
+        result = by_id[row.id][0]
+        session_ports, session_findings = _observation_rows(
+            row.id, result.get("target") or row.target, result, completed_at
+        )
+        ports.extend(session_ports)
+        findings.extend(session_findings)
+    copy_rows(db, ScanPort, ports)
+    copy_rows(db, ScanFinding, findings)
+    _rollup_observations(db, ports, findings, 1)
+
+    # 상태/결과 갱신 (모든 행이 같은 키를 갖도록 채운다)
+    params, changes = [], []
+    for row in old_rows:
+        result, status, extra = by_id[row.id]
+        if row.id in digests:
+            fields = {field: None for field in RESULT_FIELDS}
+            fields["result_digest"] = digests[row.id]
+        else:
+            fields = {field: result.get(field) for field in RESULT_FIELDS}
+            fields["result_digest"] = None
+        params.append({
+            "id": row.id,
+            "created_at": row.created_at,
+            "status": status,
+            "progress": 100 if status == ScanStatus.COMPLETED else row.progress,
+            "error": extra.get("error", row.error),
+            "completed_at": completed_at,
+            "updated_at": completed_at,
+            **fields,
+        })
+        changes.append((row.status, row.scan_type, row.started_at, row.completed_at or row.updated_at, -1))
+        changes.append((status, row.scan_type, row.started_at, completed_at, 1))
+
+    db.execute(update(ScanSession), params)
+    _rollup_outcomes(db, changes)
+    db.commit()
+
+
+def update_scan_progress_bulk(db: Session, progress: dict) -> None:
+    """
+    여러 세션의 진행 단계/진행률을 UPDATE ... FROM (VALUES ...) 한 번으로 갱신 (커밋은 호출자가 수행)
+
+    progress: {session_id: (step, progress)}
+    늦게 반영된 진행률이 종료 상태를 덮지 않도록 실행 중(RUNNING)인 세션만 갱신한다.
+    """
+    if not progress:
+        return
+    rows = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("current_step", String),
+        column("progress", Integer),
+        name="v",
+    ).data([
+        (uuid.UUID(str(session_id)), step, percent)
+        for session_id, (step, percent) in sorted(progress.items())
+    ])
+    db.execute(
+        update(ScanSession)
+        .where(ScanSession.id == rows.c.id, ScanSession.status == ScanStatus.RUNNING, *created_at_bounds(progress))
+        .values(current_step=rows.c.current_step, progress=rows.c.progress, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def query_open_ports(
+    db: Session,
+    limit: int,
+    port: Optional[int] = None,
+    service: Optional[str] = None,
+    target: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List:
+    """
+    열린 포트가 관측된 (target, port, service) 목록
+
+    같은 호스트/포트가 여러 번 관측되면 하나로 묶고 마지막 관측 시간과 횟수를 반환한다.
+    """
+    conditions = []
+    if port is not None:
+        conditions.append(ScanPort.port == port)
+    if service is not None:
+        conditions.append(ScanPort.service == service)
+    if target is not None:
+        conditions.append(ScanPort.target == target)
+    if since is not None:
+        conditions.append(ScanPort.created_at >= since)
+    if until is not None:
+        conditions.append(ScanPort.created_at < until)
+
+    last_seen = func.max(ScanPort.created_at).label("last_seen")
+    return (
+        db.query(
+            ScanPort.target,
+            ScanPort.port,
+            ScanPort.service,
+            func.min(ScanPort.created_at).label("first_seen"),
+            last_seen,
+            func.count().label("observations"),
+        )
+        .filter(*conditions)
+        .group_by(ScanPort.target, ScanPort.port, ScanPort.service)
+        .order_by(last_seen.desc(), ScanPort.target, ScanPort.port)
+        .limit(limit)
+        .all()
+    )
+
+
+def _finding_filters(
+    severity: Optional[List[str]] = None,
+    target: Optional[str] = None,
+    finding_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list:
+    conditions = []
+    if severity:
+        conditions.append(ScanFinding.severity.in_(severity))
+    if target is not None:
+        conditions.append(ScanFinding.target == target)
+    if finding_type is not None:
+        conditions.append(ScanFinding.type == finding_type)
+    if since is not None:
+        conditions.append(ScanFinding.created_at >= since)
+    if until is not None:
+        conditions.append(ScanFinding.created_at < until)
+    return conditions
+
+
+def query_findings(db: Session, limit: int, **filters) -> List[ScanFinding]:
+    """취약점 관측 목록 (최신순)"""
+    return (
+        db.query(ScanFinding)
+        .filter(*_finding_filters(**filters))
+        .order_by(ScanFinding.created_at.desc(), ScanFinding.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def count_findings_by_severity(db: Session, **filters) -> List:
+    """심각도별 (관측 수, 호스트 수)"""
+    return (
+        db.query(
+            ScanFinding.severity,
+            func.count().label("findings"),
+            func.count(func.distinct(ScanFinding.target)).label("hosts"),
+        )
+        .filter(*_finding_filters(**filters))
+        .group_by(ScanFinding.severity)
+        .all()
+    )
+
+
+def _day_filters(model, since: Optional[date], until: Optional[date]) -> list:
+    conditions = []
+    if since is not None:
+        conditions.append(model.day >= since)
+    if until is not None:
+        conditions.append(model.day <= until)
+    return conditions
+
+
+def get_dashboard_stats(
+    db: Session,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    top_services: int = 10,
+) -> dict:
+    """
+    대시보드 집계 (일별 rollup 테이블만 읽음, 진행 중 세션 수만 scan_sessions에서 조회)
+
+    Returns:
+        {"outcomes", "active", "severities", "services"} 행 목록
+    """
+    outcomes = (
+        db.query(
+            ScanOutcomeStats.scan_type,
+            ScanOutcomeStats.status,
+            func.sum(ScanOutcomeStats.sessions).label("sessions"),
+            func.sum(ScanOutcomeStats.duration_count).label("duration_count"),
+            func.sum(ScanOutcomeStats.duration_sum).label("duration_sum"),
+        )
+        .filter(*_day_filters(ScanOutcomeStats, since, until))
+        .group_by(ScanOutcomeStats.scan_type, ScanOutcomeStats.status)
+        .all()
+    )
+
+    # 진행 중 세션은 적으므로 status 인덱스로 바로 센다
+    active = (
+        db.query(ScanSession.status, func.count().label("sessions"))
+        .filter(ScanSession.status.in_([ScanStatus.PENDING, ScanStatus.RUNNING]))
+        .group_by(ScanSession.status)
+        .all()
+    )
+
+    severities = (
+        db.query(
+            FindingSeverityStats.severity,
+            func.sum(FindingSeverityStats.findings).label("findings"),
+        )
+        .filter(*_day_filters(FindingSeverityStats, since, until))
+        .group_by(FindingSeverityStats.severity)
+        .all()
+    )
+
+    observations = func.sum(OpenServiceStats.observations).label("observations")
+    services = (
+        db.query(OpenServiceStats.service, OpenServiceStats.port, observations)
+        .filter(*_day_filters(OpenServiceStats, since, until))
+        .group_by(OpenServiceStats.service, OpenServiceStats.port)
+        .order_by(observations.desc(), OpenServiceStats.port)
+        .limit(top_services)
+        .all()
+    )
+
+    return {
+        "outcomes": outcomes,
+        "active": active,
+        "severities": severities,
+        "services": services,
+    }
+
+
+# 세션 목록에서 조회하는 컬럼 (JSONB 결과 컬럼은 읽지 않는다)
+SESSION_LIST_COLUMNS = (
+    ScanSession.id,
+    ScanSession.target,
+    ScanSession.scan_type,
+    ScanSession.status,
+    ScanSession.progress,
+    ScanSession.created_at,
+    ScanSession.started_at,
+    ScanSession.completed_at,
+)
+
+# 이보다 많으면 정확한 COUNT 대신 플래너 통계를 사용
+COUNT_ESTIMATE_THRESHOLD = 100_000
+
+
+def encode_cursor(created_at: datetime, session_id) -> str:
+    """(created_at, id) 키를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps([created_at.isoformat(), str(session_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """커서 디코딩 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(session_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _session_filters(
+    status: Optional[ScanStatus] = None,
+    target: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> list:
+    conditions = []
+    if status is not None:
+        conditions.append(ScanSession.status == status)
+    if target is not None:
+        conditions.append(ScanSession.target == target)
+    if created_from is not None:
+        conditions.append(ScanSession.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(ScanSession.created_at < created_to)
+    return conditions
+
+
+def list_sessions(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    **filters,
+) -> Tuple[List, Optional[str]]:
+    """
+    세션 목록 조회 (created_at, id 내림차순 keyset 페이지네이션)
+
+    Returns:
+        (rows, next_cursor) - 마지막 페이지면 next_cursor는 None
+    """
+    query = db.query(*SESSION_LIST_COLUMNS).filter(*_session_filters(**filters))
+
+    if cursor:
+        created_at, session_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(ScanSession.created_at, ScanSession.id) < tuple_(created_at, session_id)
+        )
+
+    rows = (
+        query.order_by(ScanSession.created_at.desc(), ScanSession.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def count_sessions(db: Session, exact: bool = False, **filters) -> Tuple[int, bool]:
+    """
+    세션 개수 조회
+
+    큰 테이블에서는 COUNT(*) 대신 플래너 추정치를 사용한다
+    (필터 없음: 파티션별 pg_class.reltuples 합계, 필터 있음: EXPLAIN 추정 행 수).
+
+    Returns:
+        (count, estimated)
+    """
+    conditions = _session_filters(**filters)
+    count_query = select(func.count()).select_from(ScanSession).where(*conditions)
+
+    if not exact:
+        if conditions:
+            compiled = select(ScanSession.id).where(*conditions).compile(
+                dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+        else:
+            # 파티션 테이블(부모)의 reltuples는 항상 -1이므로 파티션 값을 합산
+            # (ANALYZE 전 파티션은 -1이므로 0으로 계산)
+            estimate = int(
+                db.execute(
+                    text(
+                        "SELECT sum(greatest(c.reltuples, 0)) FROM pg_inherits i "
+                        "JOIN pg_class c ON c.oid = i.inhrelid "
+                        "WHERE i.inhparent = 'scan_sessions'::regclass"
+                    )
+                ).scalar()
+                or -1
+            )
+
+        if estimate >= COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+
+    return db.execute(count_query).scalar(), False
@@ -0,0 +1,147 @@
+"""
+정규화된 포트/취약점 모델 (여러 호스트에 걸친 조회용)
+
+스캔 결과의 ports/vulnerabilities를 행 단위로 저장한다.
+"지난주 3306 포트가 열려 있던 호스트" 같은 조회를 JSON 파싱 없이 인덱스로 처리한다.
+
+scan_sessions는 파티션 테이블(기본 키 (id, created_at))이라 session_id에 FK를 걸지 않는다.
+세션 삭제/보관 시 관측 행은 crud/retention에서 함께 지운다.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class ScanPort(Base):
+    """스캔에서 발견된 열린 포트"""
+    __tablename__ = "scan_ports"
+    __table_args__ = (
+        Index("ix_scan_ports_port_service", "port", "service"),
+        Index("ix_scan_ports_target_created_at", "target", "created_at"),
+    )
+
+    id = Column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="행 ID"
+    )
+
+    session_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True,
+        comment="스캔 세션 ID"
+    )
+
+    target = Column(
+        String(255),
+        nullable=False,
+        comment="스캔 대상 IP 주소"
+    )
+
+    port = Column(
+        Integer,
+        nullable=False,
+        comment="포트 번호"
+    )
+
+    state = Column(
+        String(16),
+        nullable=False,
+        default="open",
+        comment="포트 상태"
+    )
+
+    service = Column(
+        String(64),
+        nullable=True,
+        comment="서비스 이름"
+    )
+
+    version = Column(
+        String(255),
+        nullable=True,
+        comment="서비스 버전"
+    )
+
+    created_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        comment="관측 시간 (스캔 완료 시간)"
+    )
+
+    def __repr__(self):
+        return f"<ScanPort(target={self.target}, port={self.port}, service={self.service})>"
+
+
+class ScanFinding(Base):
+    """스캔에서 발견된 취약점"""
+    __tablename__ = "scan_findings"
+    __table_args__ = (
+        Index("ix_scan_findings_target_created_at", "target", "created_at"),
+    )
+
+    id = Column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="행 ID"
+    )
+
+    session_id = Column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True,
+        comment="스캔 세션 ID"
+    )
+
+    target = Column(
+        String(255),
+        nullable=False,
+        comment="스캔 대상 IP 주소"
+    )
+
+    port = Column(
+        Integer,
+        nullable=True,
+        comment="포트 번호"
+    )
+
+    service = Column(
+        String(64),
+        nullable=True,
+        comment="서비스 이름"
+    )
+
+    type = Column(
+        String(64),
+        nullable=False,
+        comment="취약점 유형 (예: MySQL, Telnet)"
+    )
+
+    severity = Column(
+        String(16),
+        nullable=False,
+        index=True,
+        comment="심각도 (Low/Medium/High/Critical)"
+    )
+
+    description = Column(
+        Text,
+        nullable=True,
+        comment="설명"
+    )
+
+    created_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        comment="관측 시간 (스캔 완료 시간)"
+    )
+
+    def __repr__(self):
+        return f"<ScanFinding(target={self.target}, type={self.type}, severity={self.severity})>"
@@ -0,0 +1,76 @@
+"""
+압축 스캔 결과 저장소 모델
+"""
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary
+from datetime import datetime
+import hashlib
+import json
+
+from app.core.compression import compress, decompress
+from app.core.database import Base
+
+# 압축 저장소에 보관하는 결과 필드
+RESULT_FIELDS = ("ports", "vulnerabilities", "risk_assessment", "remediation", "report")
+
+
+class ScanResultBlob(Base):
+    """
+    압축 스캔 결과 모델
+
+    결과 필드를 하나의 JSON으로 직렬화해 압축 저장한다.
+    내용의 SHA-256을 키로 사용하므로 동일한 결과는 한 번만 저장된다.
+    """
+    __tablename__ = "scan_result_blobs"
+
+    digest = Column(
+        String(64),
+        primary_key=True,
+        comment="원본 JSON의 SHA-256 (content address)"
+    )
+
+    codec = Column(
+        String(16),
+        nullable=False,
+        comment="압축 방식 (zstd/zlib)"
+    )
+
+    raw_size = Column(
+        Integer,
+        nullable=False,
+        comment="압축 전 크기 (bytes)"
+    )
+
+    data = Column(
+        LargeBinary,
+        nullable=False,
+        comment="압축된 결과 JSON"
+    )
+
+    created_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        comment="생성 시간"
+    )
+
+    def __repr__(self):
+        return f"<ScanResultBlob(digest={self.digest[:12]}, codec={self.codec}, raw_size={self.raw_size})>"
+
+    @staticmethod
+    def encode(result: dict) -> dict:
+        """결과 dict를 저장할 행 값으로 변환 (digest, codec, raw_size, data)"""
+        payload = {field: result.get(field) for field in RESULT_FIELDS}
+        raw = json.dumps(
+            payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+        ).encode("utf-8")
+        codec, data = compress(raw)
+        return {
+            "digest": hashlib.sha256(raw).hexdigest(),
+            "codec": codec,
+            "raw_size": len(raw),
+            "data": data,
+        }
+
+    def load(self) -> dict:
+        """압축 해제한 결과 dict 반환"""
+        return json.loads(decompress(self.codec, self.data))
@@ -1,13 +1,18 @@
 """
 스캔 세션 데이터베이스 모델
 """
-from sqlalchemy import Column, String, Integer, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index, ForeignKey, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from datetime import datetime
+from sqlalchemy.orm import deferred, relationship
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import os
+import time
 import uuid
 import enum
 
 from app.core.database import Base
+from app.models.scan_result import RESULT_FIELDS
 
 
 class ScanStatus(str, enum.Enum):
@@ -16,6 +21,57 @@ class ScanStatus(str, enum.Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+
+# 더 이상 진행되지 않는 상태
+TERMINAL_STATUSES = frozenset({
+    ScanStatus.COMPLETED,
+    ScanStatus.FAILED,
+    ScanStatus.CANCELLED,
+    ScanStatus.TIMED_OUT,
+})
+
+# 결과(부분 결과 포함)를 조회할 수 있는 상태
+RESULT_STATUSES = frozenset({
+    ScanStatus.COMPLETED,
+    ScanStatus.CANCELLED,
+    ScanStatus.TIMED_OUT,
+})
+
+
+# ID에 담긴 생성 시각과 created_at의 최대 차이 (ID를 만든 뒤 INSERT하기까지의 여유)
+SESSION_ID_SKEW = timedelta(hours=1)
+
+
+def new_session_id() -> uuid.UUID:
+    """
+    시간순 세션 ID (UUIDv7: 앞 48비트가 생성 시각 ms, 나머지는 난수)
+
+    ID만으로 created_at 범위를 알 수 있어 ID 조회에도 파티션 pruning이 된다 (created_at_range).
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # version 7, variant 10
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def created_at_range(session_id) -> Optional[Tuple[datetime, datetime]]:
+    """
+    new_session_id()로 만든 ID(세션/배치)의 created_at 범위
+
+    기존 uuid4 ID나 형식이 잘못된 값이면 None (범위를 알 수 없음).
+    """
+    try:
+        value = session_id if isinstance(session_id, uuid.UUID) else uuid.UUID(str(session_id))
+    except ValueError:
+        return None
+    if value.version != 7:
+        return None
+    created = datetime.utcfromtimestamp((value.int >> 80) / 1000)
+    return created - SESSION_ID_SKEW, created + SESSION_ID_SKEW
 
 
 class ScanType(str, enum.Enum):
@@ -30,16 +86,24 @@ class ScanSession(Base):
     스캔 세션 모델
 
     스캔 요청부터 완료까지의 전체 정보를 저장
+
+    created_at 기준 월별 RANGE 파티션 테이블이다 (파티션 관리/보관은 app.services.retention).
+    파티션 키를 포함해야 하므로 기본 키는 (id, created_at)이다.
+    ID는 생성 시각을 담은 UUIDv7이므로 ID 조회에 created_at 범위를 함께 걸어 해당 파티션만 읽는다.
     """
     __tablename__ = "scan_sessions"
+    __table_args__ = (
+        # 세션 목록 keyset 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_scan_sessions_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     # 기본 정보
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
-        comment="세션 ID (UUID)"
+        default=new_session_id,
+        comment="세션 ID (UUIDv7)"
     )
 
     # 스캔 대상 정보
@@ -57,6 +121,21 @@ class ScanSession(Base):
         comment="스캔 유형 (quick/standard/full)"
     )
 
+    # 배치 제출 정보
+    batch_id = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        index=True,
+        comment="배치 제출 ID (/scans:batch)"
+    )
+
+    linked_session_id = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        index=True,
+        comment="결과를 공유하는 진행 중 세션 ID (중복 스캔 합류 시)"
+    )
+
     # 상태 정보
     status = Column(
         SQLEnum(ScanStatus),
@@ -85,42 +164,55 @@ class ScanSession(Base):
     )
 
     # 스캔 결과 (JSON 형태로 저장)
-    ports = Column(
+    # 용량이 큰 컬럼은 지연 로딩한다 (상태/목록 조회는 읽지 않음).
+    # 하나에 접근하면 "result" 그룹 전체를 한 번의 쿼리로 가져온다.
+    ports = deferred(Column(
         JSONB,
         nullable=True,
         comment="발견된 포트 목록"
-    )
+    ), group="result")
 
-    vulnerabilities = Column(
+    vulnerabilities = deferred(Column(
         JSONB,
         nullable=True,
         comment="발견된 취약점 목록"
-    )
+    ), group="result")
 
-    risk_assessment = Column(
+    risk_assessment = deferred(Column(
         JSONB,
         nullable=True,
         comment="위험도 평가 결과"
-    )
+    ), group="result")
 
-    remediation = Column(
+    remediation = deferred(Column(
         JSONB,
         nullable=True,
         comment="해결 방안"
-    )
+    ), group="result")
 
-    report = Column(
+    report = deferred(Column(
         Text,
         nullable=True,
         comment="최종 보고서 (Markdown)"
+    ), group="result")
+
+    # 압축 결과 저장소 참조 (RESULT_STORE=compressed인 경우 위 결과 컬럼 대신 사용)
+    result_digest = Column(
+        String(64),
+        ForeignKey("scan_result_blobs.digest"),
+        nullable=True,
+        index=True,
+        comment="압축 결과 digest (scan_result_blobs)"
     )
 
+    result_blob = relationship("ScanResultBlob", lazy="select")
+
     # 타임스탬프
     created_at = Column(
         DateTime,
+        primary_key=True,
         default=datetime.utcnow,
         nullable=False,
-        index=True,
         comment="생성 시간"
     )
 
@@ -147,21 +239,33 @@ class ScanSession(Base):
     def __repr__(self):
         return f"<ScanSession(id={self.id}, target={self.target}, status={self.status})>"
 
+    def result_payload(self) -> dict:
+        """
+        스캔 결과 필드 반환
+        압축 저장소에 있으면 압축을 풀고, 아니면 결과 컬럼을 그대로 사용
+        """
+        if self.result_digest is not None:
+            return self.result_blob.load()
+        return {field: getattr(self, field) for field in RESULT_FIELDS}
+
     def to_dict(self):
         """모델을 딕셔너리로 변환"""
+        result = self.result_payload()
         return {
             "session_id": str(self.id),
             "target": self.target,
             "scan_type": self.scan_type.value if self.scan_type else None,
+            "batch_id": str(self.batch_id) if self.batch_id else None,
+            "linked_session_id": str(self.linked_session_id) if self.linked_session_id else None,
             "status": self.status.value if self.status else None,
             "progress": self.progress,
             "current_step": self.current_step,
             "error": self.error,
-            "ports": self.ports,
-            "vulnerabilities": self.vulnerabilities,
-            "risk_assessment": self.risk_assessment,
-            "remediation": self.remediation,
-            "report": self.report,
+            "ports": result["ports"],
+            "vulnerabilities": result["vulnerabilities"],
+            "risk_assessment": result["risk_assessment"],
+            "remediation": result["remediation"],
+            "report": result["report"],
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -0,0 +1,117 @@
+"""
+대시보드용 일별 집계(rollup) 모델
+
+스캔이 종료 상태가 될 때 crud에서 upsert로 증분 갱신한다 (요청마다 계산하지 않음).
+날짜는 스캔 완료 시간(UTC) 기준이며, 세션 삭제/보관과 관계없이 유지되는 이력 집계다.
+"""
+from sqlalchemy import Column, Date, Float, Integer, String, Enum as SQLEnum
+
+from app.core.database import Base
+from app.models.scan_session import ScanStatus, ScanType
+
+
+class ScanOutcomeStats(Base):
+    """일별 스캔 종료 상태 집계"""
+    __tablename__ = "scan_outcome_stats"
+
+    day = Column(
+        Date,
+        primary_key=True,
+        comment="완료 날짜 (UTC)"
+    )
+
+    scan_type = Column(
+        SQLEnum(ScanType),
+        primary_key=True,
+        comment="스캔 유형"
+    )
+
+    status = Column(
+        SQLEnum(ScanStatus),
+        primary_key=True,
+        comment="종료 상태"
+    )
+
+    sessions = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="세션 수"
+    )
+
+    duration_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="소요 시간이 있는 세션 수 (시작 시간이 있는 세션)"
+    )
+
+    duration_sum = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="소요 시간 합계 (초)"
+    )
+
+    def __repr__(self):
+        return f"<ScanOutcomeStats(day={self.day}, status={self.status}, sessions={self.sessions})>"
+
+
+class FindingSeverityStats(Base):
+    """일별 심각도별 취약점 관측 수"""
+    __tablename__ = "finding_severity_stats"
+
+    day = Column(
+        Date,
+        primary_key=True,
+        comment="관측 날짜 (UTC)"
+    )
+
+    severity = Column(
+        String(16),
+        primary_key=True,
+        comment="심각도"
+    )
+
+    findings = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="관측 수"
+    )
+
+    def __repr__(self):
+        return f"<FindingSeverityStats(day={self.day}, severity={self.severity}, findings={self.findings})>"
+
+
+class OpenServiceStats(Base):
+    """일별 열린 서비스(포트) 관측 수"""
+    __tablename__ = "open_service_stats"
+
+    day = Column(
+        Date,
+        primary_key=True,
+        comment="관측 날짜 (UTC)"
+    )
+
+    service = Column(
+        String(64),
+        primary_key=True,
+        comment="서비스 이름 (없으면 unknown)"
+    )
+
+    port = Column(
+        Integer,
+        primary_key=True,
+        comment="포트 번호"
+    )
+
+    observations = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="관측 수"
+    )
+
+    def __repr__(self):
+        return f"<OpenServiceStats(day={self.day}, service={self.service}, port={self.port})>"
@@ -0,0 +1,25 @@
+"""
+보관된 스캔 세션 조회 스키마
+"""
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import date, datetime
+
+from app.schemas.scan_request import SessionListItem
+
+
+class ArchiveFile(BaseModel):
+    """월별 보관 파일"""
+    month: date = Field(..., description="보관된 파티션의 월 (1일)")
+    size_bytes: int
+    archived_at: datetime
+
+
+class ArchiveListResponse(BaseModel):
+    """보관 파일 목록 응답"""
+    archives: List[ArchiveFile]
+
+
+class ArchivedSessionListResponse(BaseModel):
+    """보관된 세션 목록 응답"""
+    items: List[SessionListItem]
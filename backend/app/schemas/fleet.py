@@ -0,0 +1,49 @@
+"""
+여러 호스트에 걸친 포트/취약점 조회 스키마
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class OpenPortItem(BaseModel):
+    """열린 포트 관측 항목 (target, port, service 단위)"""
+    target: str
+    port: int
+    service: Optional[str] = None
+    first_seen: datetime = Field(..., description="조회 기간 내 첫 관측 시간")
+    last_seen: datetime = Field(..., description="조회 기간 내 마지막 관측 시간")
+    observations: int = Field(..., description="관측된 스캔 수")
+
+
+class OpenPortListResponse(BaseModel):
+    """열린 포트 목록 응답"""
+    items: List[OpenPortItem]
+
+
+class FindingItem(BaseModel):
+    """취약점 관측 항목"""
+    session_id: str
+    target: str
+    port: Optional[int] = None
+    service: Optional[str] = None
+    type: str
+    severity: str
+    description: Optional[str] = None
+    observed_at: datetime
+
+
+class FindingListResponse(BaseModel):
+    """취약점 목록 응답"""
+    items: List[FindingItem]
+
+
+class SeverityCount(BaseModel):
+    """심각도별 집계"""
+    findings: int = Field(..., description="관측 수")
+    hosts: int = Field(..., description="해당 심각도가 관측된 호스트 수")
+
+
+class FindingSummaryResponse(BaseModel):
+    """심각도별 취약점 요약"""
+    by_severity: Dict[str, SeverityCount]
@@ -0,0 +1,40 @@
+"""
+프로파일링 API 스키마
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class ProfileInfo(BaseModel):
+    """저장된 프로파일"""
+    kind: str = Field(..., description="scans / requests")
+    profile_id: str = Field(..., description="세션 ID (scans) 또는 X-Profile-Id (requests)")
+    mode: str = Field(..., description="sampling / cprofile")
+    formats: List[str] = Field(..., description="다운로드할 수 있는 형식 (pstats, speedscope)")
+    size_bytes: int
+    created_at: datetime
+
+
+class ProfileListResponse(BaseModel):
+    """프로파일 목록 응답"""
+    profiles: List[ProfileInfo]
+
+
+class TracemallocStat(BaseModel):
+    """위치별 할당 메모리"""
+    location: List[str] = Field(..., description="파일:줄 (group_by=traceback이면 호출 스택)")
+    size_bytes: int
+    count: int
+    size_diff_bytes: Optional[int] = Field(None, description="이전 스냅샷 대비 증가량")
+    count_diff: Optional[int] = None
+
+
+class TracemallocResponse(BaseModel):
+    """tracemalloc 스냅샷 응답"""
+    tracing: bool
+    traceback_limit: int = Field(0, description="할당마다 기록하는 프레임 수")
+    current_bytes: int = Field(0, description="추적 중인 메모리")
+    peak_bytes: int = Field(0, description="추적 시작 이후 최대 메모리")
+    compared_to: Optional[datetime] = Field(None, description="diff 기준 스냅샷 시각 (compare=true)")
+    stats: List[TracemallocStat] = []
@@ -3,9 +3,26 @@
 """
 from pydantic import BaseModel, Field, validator
 from typing import Literal, Optional, List, Dict
+from datetime import datetime
 import ipaddress
 
 
+def validate_scan_target(v: str) -> str:
+    """IP 주소 형식 검증"""
+    if not v:
+        raise ValueError("Target IP is required")
+
+    # IP 주소 형식 확인
+    try:
+        ipaddress.ip_address(v)
+    except ValueError:
+        # hostname일 수도 있으니 localhost는 허용
+        if v not in ["localhost", "127.0.0.1"]:
+            raise ValueError(f"Invalid IP address format: {v}")
+
+    return v
+
+
 class ScanRequest(BaseModel):
     """스캔 요청"""
     target: str = Field(..., description="스캔 대상 IP 주소")
@@ -17,18 +34,37 @@ class ScanRequest(BaseModel):
     @validator("target")
     def validate_target(cls, v):
         """IP 주소 형식 검증"""
-        if not v:
-            raise ValueError("Target IP is required")
+        return validate_scan_target(v)
+
+
+class BatchScanRequest(BaseModel):
+    """배치 스캔 요청"""
+    targets: List[str] = Field(..., min_length=1, description="스캔 대상 IP 주소 목록")
+    scan_type: Literal["quick", "standard", "full"] = Field(
+        default="standard",
+        description="스캔 유형 (모든 대상에 동일하게 적용)"
+    )
+
+    @validator("targets", each_item=True)
+    def validate_targets(cls, v):
+        """IP 주소 형식 검증"""
+        return validate_scan_target(v)
+
+
+class BatchScanItem(BaseModel):
+    """배치 내 대상별 세션"""
+    target: str
+    session_id: str
+    linked_session_id: Optional[str] = Field(
+        default=None, description="이미 진행 중인 스캔에 합류한 경우 해당 세션 ID"
+    )
 
-        # IP 주소 형식 확인
-        try:
-            ipaddress.ip_address(v)
-        except ValueError:
-            # hostname일 수도 있으니 localhost는 허용
-            if v not in ["localhost", "127.0.0.1"]:
-                raise ValueError(f"Invalid IP address format: {v}")
 
-        return v
+class BatchScanResponse(BaseModel):
+    """배치 스캔 응답"""
+    batch_id: str
+    scan_type: str
+    sessions: List[BatchScanItem]
 
 
 class ScanResponse(BaseModel):
@@ -52,8 +88,38 @@ class ScanResultResponse(BaseModel):
     session_id: str
     target: str
     scan_type: str
+    status: str = Field(
+        default="completed",
+        description="completed, 또는 부분 결과인 경우 cancelled/timed_out"
+    )
     ports: Optional[List[Dict]] = None
     vulnerabilities: Optional[List[Dict]] = None
     risk_assessment: Optional[Dict] = None
     remediation: Optional[Dict] = None
     report: Optional[str] = None
+
+
+class SessionListItem(BaseModel):
+    """세션 목록 항목"""
+    session_id: str
+    target: str
+    scan_type: str
+    status: str
+    progress: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class SessionListResponse(BaseModel):
+    """세션 목록 응답 (keyset 페이지네이션)"""
+    items: List[SessionListItem]
+    next_cursor: Optional[str] = Field(
+        default=None, description="다음 페이지 커서 (마지막 페이지면 null)"
+    )
+
+
+class SessionCountResponse(BaseModel):
+    """세션 개수 응답"""
+    count: int
+    estimated: bool = Field(..., description="통계 기반 추정치 여부")
@@ -8,6 +8,7 @@ class SecurityScanState(TypedDict):
     """보안 스캔 상태 (LangGraph용 TypedDict)"""
     target: str
     scan_type: str
+    port_range: Optional[str]  # 스키마에 없는 키는 노드 사이에서 전달되지 않는다
     ports: Optional[List[Dict]]
     vulnerabilities: Optional[List[Dict]]
     risk_assessment: Optional[Dict]
@@ -0,0 +1,32 @@
+"""
+대시보드 집계 스키마
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class DurationStats(BaseModel):
+    """스캔 소요 시간"""
+    scans: int = Field(..., description="소요 시간이 집계된 스캔 수")
+    mean_seconds: Optional[float] = Field(default=None, description="평균 소요 시간 (초)")
+
+
+class ServiceCount(BaseModel):
+    """열린 서비스 관측 수"""
+    service: str
+    port: int
+    observations: int
+
+
+class DashboardStatsResponse(BaseModel):
+    """대시보드 집계 응답"""
+    since: Optional[date] = None
+    until: Optional[date] = None
+    by_status: Dict[str, int] = Field(
+        ..., description="상태별 세션 수 (종료 상태는 기간 내 완료 기준, pending/running은 현재 값)"
+    )
+    by_severity: Dict[str, int] = Field(..., description="심각도별 취약점 관측 수")
+    top_services: List[ServiceCount] = Field(..., description="가장 많이 관측된 열린 서비스")
+    duration: DurationStats = Field(..., description="전체 평균 소요 시간")
+    duration_by_scan_type: Dict[str, DurationStats]
@@ -0,0 +1,599 @@
+"""
+백그라운드 스캔 실행 서비스
+
+스캔을 워커 스레드에서 실행하면서 진행 상황을 DB에 저장하고
+이벤트 버스로 발행한다 (WebSocket/SSE 구독자에게 전달).
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core import metrics, tracing
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging import log_context
+from app.core.events import (
+    TERMINAL_EVENTS,
+    batch_channel,
+    get_event_bus,
+    make_event,
+    session_channel,
+)
+from app.models import crud
+from app.models.scan_session import TERMINAL_STATUSES, ScanStatus, new_session_id
+from app.schemas.scan_state import SecurityScanState
+from app.services.cancellation import (
+    CancellationToken,
+    ScanCancelled,
+    ScanTimedOut,
+    clear_remote_cancel,
+    register_token,
+    request_cancel,
+    request_remote_cancel,
+    unregister_token,
+)
+from app.services import profiling, scan_cache
+from app.services.checkpointer import delete_checkpoint, get_checkpointer, release_checkpoint
+from app.services.result_writer import get_result_writer
+from app.services.scan_registry import REGISTRY_CLAIM_GRACE_SECONDS, Claim, get_scan_registry
+
+logger = logging.getLogger(__name__)
+
+# 스캔 워커 풀 (동시 스캔 수 제한)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.MAX_CONCURRENT_SCANS,
+    thread_name_prefix="scan-worker",
+)
+metrics.SCAN_QUEUE_DEPTH.set_function(lambda: _executor._work_queue.qsize())
+
+
+class ScanNotResumable(Exception):
+    """재개할 수 없는 상태의 스캔 (완료됨, 실행 중 등)"""
+
+
+class ScanNotCancellable(Exception):
+    """이미 종료된 스캔"""
+
+
+class CancelledWhileQueued(ScanCancelled):
+    """대기 중에 취소되어 cancel_scan이 이미 종료 상태를 기록하고 종료 이벤트를 발행한 스캔"""
+
+
+class AsyncScanService:
+    """백그라운드 스캔 서비스"""
+
+    def __init__(
+        self,
+        session_id: str,
+        target: str,
+        scan_type: str,
+        batch_id: Optional[str] = None,
+        resume: bool = False,
+    ):
+        self.session_id = session_id
+        self.target = target
+        self.scan_type = scan_type
+        self.batch_id = batch_id
+        self.resume = resume
+        self.cancel_token = CancellationToken(session_id, timeout=settings.SCAN_TIMEOUT)
+
+        self._bus = get_event_bus()
+        self._channel = session_channel(session_id)
+        self._db = None
+        self._started: Optional[float] = None
+        self._step: Optional[str] = None
+        self._step_started: Optional[float] = None
+        self._last_progress: Optional[tuple] = None
+        # 워커 스레드에서 요청의 trace를 이어받기 위해 생성 시점(요청 처리 중)의 컨텍스트를 잡아 둔다
+        self._trace_context = tracing.current_context()
+        # X-Profile 헤더로 제출한 스캔은 프로파일링 (없으면 실행 시점에 예약 여부 확인)
+        self._profile_mode = profiling.requested_mode()
+        self._profiler: Optional[profiling.Profiler] = None
+        # 배치 스캔은 결과/진행률을 묶음 저장 (단건 스캔은 지연 없이 바로 커밋)
+        self._writer = get_result_writer() if batch_id and settings.BULK_WRITE_ENABLED else None
+
+    def submit(self) -> Future:
+        """
+        워커 풀에 스캔 제출
+        실패는 run()에서 DB 저장/이벤트 발행까지 처리되므로 Future는 무시해도 된다
+        """
+        # 대기 중에도 취소할 수 있도록 제출 시점에 토큰 등록
+        register_token(self.cancel_token)
+        try:
+            return _executor.submit(self.run)
+        except Exception:
+            unregister_token(self.session_id)
+            raise
+
+    @metrics.SCANS_RUNNING.track_inprogress()
+    def run(self) -> SecurityScanState:
+        """스캔 실행 (블로킹, 워커 스레드에서 호출)"""
+        attributes = {
+            "scan.session_id": self.session_id,
+            "scan.target": self.target,
+            "scan.type": self.scan_type,
+            "scan.batch_id": self.batch_id,
+            "scan.resume": self.resume,
+        }
+        fields = {"session_id": self.session_id}
+        if self.batch_id:
+            fields["batch_id"] = self.batch_id
+        with log_context(**fields), tracing.span("scan", attributes, parent=self._trace_context) as scan_span:
+            mode = self._profile_mode or profiling.take_armed(self.session_id)
+            if mode:
+                self._profiler = profiling.Profiler(mode, f"scan {self.session_id} ({self.target})")
+            try:
+                result = self._execute()
+            except ScanCancelled as e:
+                scan_span.set_attribute(
+                    "scan.status",
+                    ScanStatus.TIMED_OUT.value if isinstance(e, ScanTimedOut) else ScanStatus.CANCELLED.value,
+                )
+                raise
+            except Exception:
+                scan_span.set_attribute("scan.status", ScanStatus.FAILED.value)
+                raise
+            finally:
+                if self._profiler is not None:
+                    self._save_profile()
+            scan_span.set_attribute("scan.status", ScanStatus.COMPLETED.value)
+            return result
+
+    def _save_profile(self):
+        """프로파일 저장 (실패해도 스캔 결과에는 영향 없음)"""
+        try:
+            self._profiler.save("scans", self.session_id)
+        except Exception as e:
+            logger.warning(f"Failed to save profile for session {self.session_id}: {e}")
+
+    def _execute(self) -> SecurityScanState:
+        logger.info(f"Starting background scan for session {self.session_id}")
+        self._db = SessionLocal()
+        self._started = time.perf_counter()
+        self.cancel_token.start()
+
+        try:
+            # 대기 중에 취소된 경우 (cancel_scan이 이미 CANCELLED로 기록했으면 다시 기록하지 않는다)
+            if self.cancel_token.cancelled:
+                current = crud.get_scan_status(self._db, self.session_id)
+                if current is not None and current.status in TERMINAL_STATUSES:
+                    raise CancelledWhileQueued(f"Scan already {current.status.value}")
+            self.cancel_token.check()
+
+            # 대기열에서 기다린 시간과 관계없이 실행 시간만큼 중복 제거 키를 유지
+            if settings.SCAN_DEDUP_ENABLED:
+                get_scan_registry().refresh(self.target, self.scan_type, self.session_id)
+
+            crud.update_scan_status(
+                self._db,
+                self.session_id,
+                ScanStatus.RUNNING,
+                started_at=datetime.utcnow(),
+            )
+            self._publish("status", status=ScanStatus.RUNNING.value, progress=0)
+
+            # LangGraph/LangChain은 첫 스캔에서 로드 (API 프로세스 시작 시간 단축)
+            from app.services.langgraph_service import LangGraphService
+
+            # 노드마다 체크포인트를 남겨 실패 시 /scan/{id}/resume으로 이어서 실행
+            service = LangGraphService(
+                progress_callback=self._on_progress,
+                checkpointer=get_checkpointer(),
+                cancel_token=self.cancel_token,
+                profiler=self._profiler,
+            )
+            result = service.run_scan(
+                self.target,
+                self.scan_type,
+                thread_id=self.session_id,
+                resume=self.resume,
+            )
+
+            self._save_result(result)
+            delete_checkpoint(self.session_id)
+            self._publish(
+                "completed",
+                status=ScanStatus.COMPLETED.value,
+                progress=100,
+                open_ports=len(result.get("ports") or []),
+                vulnerabilities=len(result.get("vulnerabilities") or []),
+            )
+            self._finish_linked()
+            logger.info(
+                f"Scan completed for session {self.session_id}",
+                extra={"duration_ms": round((time.perf_counter() - self._started) * 1000, 1)},
+            )
+            return result
+
+        except CancelledWhileQueued as e:
+            logger.info(f"Skipping scan for session {self.session_id}: {e}")
+            raise
+
+        except ScanCancelled as e:
+            # 부분 결과는 저장하고 체크포인트는 남겨 둔다 (postgres/sqlite이면 resume 가능)
+            stopped = ScanStatus.TIMED_OUT if isinstance(e, ScanTimedOut) else ScanStatus.CANCELLED
+            logger.warning(f"Scan {stopped.value} for session {self.session_id}: {e}")
+            self._db.rollback()
+            self._save_result(e.partial, status=stopped, error=str(e))
+            release_checkpoint(self.session_id)
+            self._publish(
+                stopped.value,
+                status=stopped.value,
+                error=str(e),
+                open_ports=len(e.partial.get("ports") or []),
+            )
+            self._finish_linked()
+            raise
+
+        except Exception as e:
+            logger.error(f"Scan failed for session {self.session_id}: {e}")
+            self._db.rollback()
+            crud.update_scan_status(
+                self._db, self.session_id, ScanStatus.FAILED, error=str(e)
+            )
+            release_checkpoint(self.session_id)
+            self._publish("failed", status=ScanStatus.FAILED.value, error=str(e))
+            self._finish_linked()
+            raise
+
+        finally:
+            unregister_token(self.session_id)
+            get_scan_registry().release(self.target, self.scan_type, self.session_id)
+            self._clear_cancel_flag()
+            self._db.close()
+            self._db = None
+
+    def _clear_cancel_flag(self):
+        """처리한(또는 쓰이지 않은) Redis 취소 플래그 삭제 (실패해도 스캔 결과에는 영향 없음)"""
+        try:
+            clear_remote_cancel(self.session_id)
+        except Exception as e:
+            logger.warning(f"Failed to clear cancel flag for session {self.session_id}: {e}")
+
+    def _on_progress(self, step: str, progress: int, data: dict):
+        """LangGraph 진행 상황 콜백 (워커 스레드)"""
+        now = time.perf_counter()
+        fields = {}
+
+        # 단계 전환 시 이전 단계 소요 시간 기록
+        if step != self._step:
+            if self._step is not None:
+                fields["previous_step"] = self._step
+                fields["previous_step_ms"] = int((now - self._step_started) * 1000)
+            self._step = step
+            self._step_started = now
+
+        # 진행률이 바뀐 경우에만 DB 반영
+        if (step, progress) != self._last_progress:
+            if self._writer is not None:
+                self._writer.update_progress(self.session_id, step, progress)
+            else:
+                crud.update_scan_progress(self._db, self.session_id, step, progress)
+            self._last_progress = (step, progress)
+
+        event_type = "ports" if data.get("ports") is not None else "progress"
+        self._publish(
+            event_type,
+            status=ScanStatus.RUNNING.value,
+            step=step,
+            progress=progress,
+            **fields,
+            **data,
+        )
+
+    def _save_result(self, result: dict, status: ScanStatus = ScanStatus.COMPLETED, **extra):
+        """결과 저장 (묶음 저장이면 커밋될 때까지 기다린다)"""
+        if self._writer is not None:
+            self._writer.save_result(self.session_id, result, status, **extra).result()
+        else:
+            crud.save_scan_result(self._db, self.session_id, result, status=status, **extra)
+
+    def _finish_linked(self):
+        """이 스캔에 합류한 세션들에 결과를 복사하고 종료 이벤트 발행"""
+        finish_linked(self._db, self.session_id)
+
+    def _publish(self, event_type: str, **fields):
+        elapsed_ms = (
+            int((time.perf_counter() - self._started) * 1000)
+            if self._started is not None
+            else 0
+        )
+        event = make_event(event_type, self.session_id, elapsed_ms=elapsed_ms, **fields)
+        if event_type in TERMINAL_EVENTS:
+            publish_terminal(self.session_id, self.batch_id, event)
+        else:
+            scan_cache.refresh_status_from_event(event)
+            self._bus.publish(self._channel, event)
+
+
+def publish_terminal(session_id: str, batch_id: Optional[str], event: dict) -> None:
+    """종료 이벤트 발행 (세션 채널 + 배치 채널)"""
+    scan_cache.refresh_status_from_event(event)
+    bus = get_event_bus()
+    bus.publish(session_channel(session_id), event)
+    if batch_id:
+        bus.publish(batch_channel(batch_id), event)
+
+
+def finish_linked(db: Session, owner_id: str) -> None:
+    """owner_id 스캔에 합류한 세션들에 최종 상태/결과를 복사하고 종료 이벤트 발행"""
+    for row in crud.sync_linked_sessions(db, owner_id):
+        publish_terminal(
+            str(row.id),
+            str(row.batch_id) if row.batch_id else None,
+            make_event(
+                row.status.value,
+                str(row.id),
+                status=row.status.value,
+                linked_session_id=owner_id,
+            ),
+        )
+
+
+def claim_or_find_owner(db: Session, target: str, scan_type: str, session_id: str) -> Optional[str]:
+    """
+    (target, scan_type) 실행 권한을 session_id로 획득
+
+    Returns:
+        이미 진행 중인 세션 ID (획득에 성공했거나 중복 제거가 꺼져 있으면 None)
+    """
+    return claim_or_find_owners(db, [(target, scan_type, session_id)])[0]
+
+
+def claim_or_find_owners(db: Session, claims: List[Claim]) -> List[Optional[str]]:
+    """
+    여러 (target, scan_type) 실행 권한을 한 번에 획득 (배치 제출용)
+
+    레지스트리 왕복 1회 + 소유 세션 상태 조회 1회로 처리한다.
+    이미 끝났거나 생성에 실패한 소유자가 남아 있으면 정리하고 그 항목만 다시 획득한다.
+    중간에 실패하면 이번 호출에서 획득한 권한은 모두 해제한다.
+
+    Returns:
+        claims 순서대로 claim_or_find_owner() 결과
+    """
+    if not settings.SCAN_DEDUP_ENABLED:
+        return [None] * len(claims)
+
+    registry = get_scan_registry()
+    owners: List[Optional[str]] = [None] * len(claims)
+    acquired = []
+    pending = list(range(len(claims)))
+    try:
+        while pending:
+            claimed = registry.claim_many([claims[i] for i in pending])
+            acquired.extend(claims[i] for i, owner in zip(pending, claimed) if owner is None)
+            found = {i: owner for i, owner in zip(pending, claimed) if owner is not None}
+            statuses = {
+                str(row.id): row.status
+                for row in (crud.get_scan_statuses(db, set(found.values())) if found else [])
+            }
+
+            pending = []
+            for i, owner in found.items():
+                target, scan_type, _ = claims[i]
+                status = statuses.get(owner)
+                if status is None:
+                    # 행이 아직 없으면 소유자가 세션을 생성하는 중
+                    # (유예 시간이 지나도 없으면 생성/제출에 실패한 소유자)
+                    age = registry.age(target, scan_type)
+                    if age is not None and age < REGISTRY_CLAIM_GRACE_SECONDS:
+                        owners[i] = owner
+                        continue
+                elif status in (ScanStatus.PENDING, ScanStatus.RUNNING):
+                    owners[i] = owner
+                    continue
+
+                # 이미 끝났거나 없는 세션이 남아 있는 경우 정리 후 다시 획득
+                registry.release(target, scan_type, owner)
+                pending.append(i)
+    except Exception:
+        release_claims(acquired)
+        raise
+    return owners
+
+
+def release_claims(claims: List[Claim]) -> None:
+    """획득한 실행 권한 해제 (세션 생성/제출에 실패한 경우)"""
+    registry = get_scan_registry()
+    for target, scan_type, session_id in claims:
+        registry.release(target, scan_type, session_id)
+
+
+def start_or_attach(db: Session, target: str, scan_type: str) -> Tuple[str, Optional[Future]]:
+    """
+    스캔 시작 (single-flight)
+
+    같은 (target, scan_type) 스캔이 이미 진행 중이면 새로 실행하지 않고 해당 세션에 합류한다.
+
+    Returns:
+        (session_id, future) - 기존 세션에 합류한 경우 future는 None
+    """
+    session_id = str(new_session_id())
+
+    owner = claim_or_find_owner(db, target, scan_type, session_id)
+    if owner is not None:
+        logger.info(f"Attaching to in-flight scan {owner} for {target} ({scan_type})")
+        return owner, None
+
+    try:
+        crud.create_scan_session(db, target, scan_type, session_id=session_id)
+    except Exception:
+        # 실행되지 않을 세션이 계속 소유자로 남지 않도록 해제
+        get_scan_registry().release(target, scan_type, session_id)
+        raise
+    logger.info(f"Scan session created: {session_id} for target {target}")
+
+    try:
+        return session_id, AsyncScanService(session_id, target, scan_type).submit()
+    except Exception as e:
+        get_scan_registry().release(target, scan_type, session_id)
+        db.rollback()
+        crud.update_scan_status(db, session_id, ScanStatus.FAILED, error=f"Failed to submit scan: {e}")
+        raise
+
+
+def resume_scan(db: Session, session_id: str) -> Optional[Future]:
+    """
+    실패했거나 워커가 중단된 스캔을 마지막 체크포인트부터 재개
+
+    Returns:
+        워커 풀 Future (세션이 없으면 None)
+
+    Raises:
+        ScanNotResumable: 완료된 스캔이거나 아직 실행 중인 스캔
+    """
+    db_session = crud.get_scan_session(db, session_id)
+    if db_session is None:
+        return None
+
+    if db_session.status == ScanStatus.COMPLETED:
+        raise ScanNotResumable(f"Scan already completed: {session_id}")
+
+    if db_session.linked_session_id is not None:
+        raise ScanNotResumable(
+            f"Scan was attached to {db_session.linked_session_id}; resume that session instead"
+        )
+
+    target = db_session.target
+    scan_type = db_session.scan_type.value
+
+    # 실행 권한을 다시 획득할 수 있어야 실행 중이 아닌 것으로 본다
+    # (레지스트리 항목은 워커 종료 시 해제되거나 TTL로 만료된다)
+    if db_session.status not in TERMINAL_STATUSES and not settings.SCAN_DEDUP_ENABLED:
+        raise ScanNotResumable(f"Scan is still {db_session.status.value}: {session_id}")
+
+    owner = claim_or_find_owner(db, target, scan_type, session_id)
+    if owner is not None:
+        raise ScanNotResumable(f"Scan for {target} ({scan_type}) is in progress: {owner}")
+
+    try:
+        # 이전 취소 요청의 플래그가 남아 있으면 재개한 실행이 바로 취소된다
+        clear_remote_cancel(session_id)
+        crud.update_scan_status(db, session_id, ScanStatus.PENDING, error=None)
+        scan_cache.invalidate(session_id)
+        logger.info(f"Resuming scan session {session_id} from last checkpoint")
+        return AsyncScanService(
+            session_id,
+            target,
+            scan_type,
+            batch_id=str(db_session.batch_id) if db_session.batch_id else None,
+            resume=True,
+        ).submit()
+    except Exception:
+        get_scan_registry().release(target, scan_type, session_id)
+        raise
+
+
+def cancel_scan(db: Session, session_id: str) -> Optional[bool]:
+    """
+    스캔 취소
+
+    실행 중인 워커가 있으면 취소를 요청하고(워커가 부분 결과를 저장하며 CANCELLED 처리),
+    실행 중인 워커가 없으면(대기 중인 합류 세션, 중단된 워커 등) 바로 CANCELLED로 바꾼다.
+
+    Returns:
+        바로 취소했으면 True, 워커에 취소를 요청했으면 False, 세션이 없으면 None
+
+    Raises:
+        ScanNotCancellable: 이미 종료된 스캔
+    """
+    db_session = crud.get_scan_session(db, session_id)
+    if db_session is None:
+        return None
+
+    if db_session.status in TERMINAL_STATUSES:
+        raise ScanNotCancellable(f"Scan already {db_session.status.value}: {session_id}")
+
+    if db_session.linked_session_id is None:
+        if request_cancel(session_id) and db_session.status == ScanStatus.RUNNING:
+            logger.info(f"Cancellation requested for session {session_id}")
+            return False
+
+        if settings.SCAN_REGISTRY_BACKEND == "redis":
+            target = db_session.target
+            scan_type = db_session.scan_type.value
+            registry = get_scan_registry()
+            # 레지스트리 소유자가 이 세션이면 다른 워커에서 실행(또는 대기) 중
+            owner = registry.claim(target, scan_type, session_id) if settings.SCAN_DEDUP_ENABLED else session_id
+            if owner == session_id:
+                request_remote_cancel(session_id)
+                if db_session.status == ScanStatus.RUNNING:
+                    logger.info(f"Remote cancellation requested for session {session_id}")
+                    return False
+            elif owner is None:
+                registry.release(target, scan_type, session_id)
+
+    # 아직 시작하지 않았거나 실행 중인 워커가 없음
+    # (대기 중인 작업은 시작할 때 토큰/플래그와 종료 상태를 보고 기록 없이 끝난다)
+    crud.update_scan_status(
+        db,
+        session_id,
+        ScanStatus.CANCELLED,
+        error="Scan cancelled",
+        completed_at=datetime.utcnow(),
+    )
+    publish_terminal(
+        session_id,
+        str(db_session.batch_id) if db_session.batch_id else None,
+        make_event(
+            ScanStatus.CANCELLED.value,
+            session_id,
+            status=ScanStatus.CANCELLED.value,
+            error="Scan cancelled",
+        ),
+    )
+    finish_linked(db, session_id)
+    release_checkpoint(session_id)
+    logger.info(f"Scan session {session_id} cancelled (no running worker)")
+    return True
+
+
+def _load_status(session_id: str):
+    db = SessionLocal()
+    try:
+        return crud.get_scan_status(db, session_id)
+    finally:
+        db.close()
+
+
+def _load_result(session_id: str) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        db_session = crud.get_scan_session(db, session_id, with_result=True)
+        return db_session.result_payload() if db_session is not None else None
+    finally:
+        db.close()
+
+
+async def wait_for_result(session_id: str) -> dict:
+    """
+    다른 요청이 실행 중인 스캔의 완료를 기다린 뒤 결과 반환
+    (완료 이벤트를 구독하고, 놓친 이벤트에 대비해 DB도 확인)
+
+    DB 조회는 이벤트 루프를 막지 않도록 스레드에서 실행하고,
+    대기 중에는 상태만 읽다가 완료된 뒤에 결과 컬럼을 한 번 읽는다.
+    """
+    deadline = time.monotonic() + settings.SCAN_TIMEOUT
+    async with await get_event_bus().subscribe(session_channel(session_id)) as subscription:
+        while time.monotonic() < deadline:
+            row = await asyncio.to_thread(_load_status, session_id)
+            if row is not None and row.status == ScanStatus.COMPLETED:
+                result = await asyncio.to_thread(_load_result, session_id)
+                if result is None:
+                    raise RuntimeError(f"Scan session deleted: {session_id}")
+                return result
+            if row is not None and row.status in TERMINAL_STATUSES:
+                raise RuntimeError(row.error or f"Scan {row.status.value}")
+
+            # 종료 이벤트(또는 하트비트 주기)까지 대기 후 DB 재확인
+            while time.monotonic() < deadline:
+                event = await subscription.get(timeout=settings.EVENT_HEARTBEAT_SECONDS)
+                if event is None or event["type"] in TERMINAL_EVENTS:
+                    break
+
+    raise TimeoutError(f"Timed out waiting for scan {session_id}")
@@ -0,0 +1,173 @@
+"""
+배치 스캔 서비스
+
+여러 대상을 한 번에 등록(multi-row INSERT)하고 워커 풀에 제출하며,
+완료되는 순서대로 결과를 NDJSON으로 스트리밍한다.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import AsyncIterator, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import TERMINAL_EVENTS, batch_channel, get_event_bus
+from app.models import crud
+from app.models.scan_session import TERMINAL_STATUSES, ScanSession, ScanStatus, ScanType, new_session_id
+from app.services.async_scan_service import AsyncScanService, claim_or_find_owners, release_claims
+
+logger = logging.getLogger(__name__)
+
+# 완료된 결과를 DB에서 읽어 올 때 한 번에 조회하는 세션 수
+RESULT_FETCH_SIZE = 200
+
+
+def submit_batch(db: Session, targets: List[str], scan_type: str) -> Tuple[str, List[dict]]:
+    """
+    배치 스캔 등록 및 실행
+
+    - 중복 대상은 하나로 합친다
+    - 이미 진행 중인 (target, scan_type) 스캔이 있으면 실행하지 않고 linked 세션으로 등록한다
+
+    Returns:
+        (batch_id, [{target, session_id, linked_session_id}])
+    """
+    batch_id = new_session_id()
+    claims = [(target, scan_type, str(new_session_id())) for target in dict.fromkeys(targets)]
+    # 모든 대상의 실행 권한을 한 번에 획득 (대상마다 레지스트리/DB를 왕복하지 않음)
+    claimed = claim_or_find_owners(db, claims)
+    owners = {owner for owner in claimed if owner is not None}
+
+    rows = [
+        {
+            "id": uuid.UUID(session_id),
+            "target": target,
+            "scan_type": ScanType(scan_type),
+            "batch_id": batch_id,
+            "linked_session_id": uuid.UUID(owner) if owner else None,
+        }
+        for (target, _, session_id), owner in zip(claims, claimed)
+    ]
+    acquired = [claim for claim, owner in zip(claims, claimed) if owner is None]
+
+    try:
+        crud.create_scan_sessions_bulk(db, rows)
+    except Exception:
+        db.rollback()
+        release_claims(acquired)
+        raise
+    logger.info(f"Batch {batch_id} created: {len(rows)} sessions ({len(owners)} in-flight owners)")
+
+    for index, (target, _, session_id) in enumerate(acquired):
+        try:
+            AsyncScanService(session_id, target, scan_type, batch_id=str(batch_id)).submit()
+        except Exception as e:
+            # 제출하지 못한 세션은 실패 처리하고 실행 권한 해제
+            release_claims(acquired[index:])
+            for _, _, unsubmitted in acquired[index:]:
+                crud.update_scan_status(db, unsubmitted, ScanStatus.FAILED, error=f"Failed to submit scan: {e}")
+            raise
+
+    # INSERT 전에 이미 끝난 소유 세션의 결과를 반영
+    for owner in owners:
+        crud.sync_linked_sessions(db, owner)
+
+    return str(batch_id), [
+        {
+            "target": row["target"],
+            "session_id": str(row["id"]),
+            "linked_session_id": str(row["linked_session_id"]) if row["linked_session_id"] else None,
+        }
+        for row in rows
+    ]
+
+
+def _result_line(db_session: ScanSession) -> str:
+    """세션 결과를 NDJSON 한 줄로 직렬화"""
+    result = db_session.result_payload()
+    return json.dumps(
+        {
+            "session_id": str(db_session.id),
+            "target": db_session.target,
+            "status": db_session.status.value,
+            "error": db_session.error,
+            "completed_at": db_session.completed_at.isoformat() if db_session.completed_at else None,
+            "ports": result["ports"],
+            "vulnerabilities": result["vulnerabilities"],
+            "risk_assessment": result["risk_assessment"],
+            "remediation": result["remediation"],
+        },
+        ensure_ascii=False,
+    ) + "\n"
+
+
+def _load_chunk(session_ids: List) -> List[str]:
+    db = SessionLocal()
+    try:
+        return [_result_line(s) for s in crud.get_sessions_with_result(db, session_ids)]
+    finally:
+        db.close()
+
+
+async def _load_lines(session_ids: List) -> AsyncIterator[str]:
+    """
+    결과 줄을 RESULT_FETCH_SIZE개씩 읽어 차례로 반환
+
+    DB 조회는 스레드에서 실행하고, 한 번에 한 묶음만 메모리에 둔다.
+    """
+    for i in range(0, len(session_ids), RESULT_FETCH_SIZE):
+        for line in await asyncio.to_thread(_load_chunk, session_ids[i:i + RESULT_FETCH_SIZE]):
+            yield line
+
+
+def _pending_and_done(batch_id: str) -> Tuple[set, List]:
+    db = SessionLocal()
+    try:
+        statuses = crud.get_batch_statuses(db, batch_id)
+    finally:
+        db.close()
+    pending = {str(row.id) for row in statuses if row.status not in TERMINAL_STATUSES}
+    done = [row.id for row in statuses if row.status in TERMINAL_STATUSES]
+    return pending, done
+
+
+async def stream_batch_results(batch_id: str) -> AsyncIterator[str]:
+    """
+    배치 결과를 완료되는 순서대로 NDJSON 줄로 반환
+    (이미 끝난 세션부터 보내고, 이후 종료 이벤트를 받을 때마다 전송)
+
+    DB 조회는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+    # 조회와 구독 사이의 이벤트를 놓치지 않도록 먼저 구독
+    async with await get_event_bus().subscribe(batch_channel(batch_id)) as subscription:
+        pending, done = await asyncio.to_thread(_pending_and_done, batch_id)
+        async for line in _load_lines(done):
+            yield line
+
+        while pending:
+            event = await subscription.get(timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            if event is None:
+                # 다른 워커의 이벤트를 놓친 경우에 대비해 DB 재확인
+                still_pending, _ = await asyncio.to_thread(_pending_and_done, batch_id)
+                finished = pending - still_pending
+            elif event["type"] in TERMINAL_EVENTS and event["session_id"] in pending:
+                finished = {event["session_id"]}
+            else:
+                continue
+
+            pending -= finished
+            async for line in _load_lines(sorted(finished)):
+                yield line
+
+
+def batch_exists(batch_id: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(ScanSession.id).filter(
+            ScanSession.batch_id == batch_id, *crud.created_at_bounds([batch_id])
+        ).first() is not None
+    finally:
+        db.close()
@@ -0,0 +1,151 @@
+"""
+스캔 취소 및 타임아웃
+
+스캔마다 CancellationToken을 하나 만들어 그래프 노드, nmap 서브프로세스, LLM 호출에 전달한다.
+각 단계는 진행 상황을 보고할 때와 서브프로세스를 기다리는 동안 토큰을 확인하고,
+취소되었거나 기한이 지나면 ScanCancelled/ScanTimedOut을 발생시킨다.
+
+- 같은 프로세스: 토큰 레지스트리에서 찾아 즉시 취소
+- 다른 API 워커(SCAN_REGISTRY_BACKEND=redis): Redis 취소 플래그를 워커가 주기적으로 확인
+  (플래그는 스캔 실행이 끝나거나 재개할 때 지운다)
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 취소 플래그 확인 주기 (초)
+REMOTE_CHECK_INTERVAL_SECONDS = 1.0
+
+
+def cancel_key(session_id: str) -> str:
+    """Redis 취소 플래그 키"""
+    return f"scan:cancel:{session_id}"
+
+
+class ScanCancelled(Exception):
+    """취소된 스캔 (partial: 취소 시점까지의 부분 결과)"""
+
+    def __init__(self, message: str, partial: Optional[dict] = None):
+        super().__init__(message)
+        self.partial = partial or {}
+
+
+class ScanTimedOut(ScanCancelled):
+    """전체 또는 단계별 기한을 넘긴 스캔"""
+
+
+class CancellationToken:
+    """스캔 하나의 취소 요청과 기한"""
+
+    def __init__(self, session_id: Optional[str] = None, timeout: Optional[float] = None):
+        self.session_id = session_id
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._event = threading.Event()
+        self._next_remote_check = 0.0
+
+    def start(self) -> None:
+        """실행을 시작한 시점부터 기한을 다시 계산 (워커 풀 대기 시간 제외)"""
+        if self.timeout:
+            self.deadline = time.monotonic() + self.timeout
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.session_id and settings.SCAN_REGISTRY_BACKEND == "redis":
+            now = time.monotonic()
+            if now >= self._next_remote_check:
+                self._next_remote_check = now + REMOTE_CHECK_INTERVAL_SECONDS
+                if _remote_cancel_requested(self.session_id):
+                    self._event.set()
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """전체 기한까지 남은 시간 (기한이 없으면 None)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout_for(self, limit: Optional[float] = None) -> Optional[float]:
+        """단계 제한(limit)과 전체 기한 중 짧은 쪽 (둘 다 없으면 None)"""
+        remaining = self.remaining()
+        if limit is None or limit <= 0:
+            return remaining
+        if remaining is None:
+            return limit
+        return min(limit, remaining)
+
+    def check(self) -> None:
+        """취소되었거나 기한이 지났으면 예외 발생"""
+        if self.cancelled:
+            raise ScanCancelled("Scan cancelled")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise ScanTimedOut(f"Scan exceeded SCAN_TIMEOUT ({self.timeout}s)")
+
+
+def _remote_cancel_requested(session_id: str) -> bool:
+    from app.core.redis import get_redis
+
+    try:
+        return bool(get_redis().exists(cancel_key(session_id)))
+    except Exception as e:
+        logger.warning(f"Failed to check cancel flag for {session_id}: {e}")
+        return False
+
+
+_lock = threading.Lock()
+_tokens: Dict[str, CancellationToken] = {}
+
+
+def register_token(token: CancellationToken) -> None:
+    with _lock:
+        _tokens[token.session_id] = token
+
+
+def unregister_token(session_id: str) -> None:
+    with _lock:
+        _tokens.pop(session_id, None)
+
+
+def request_cancel(session_id: str) -> bool:
+    """
+    이 프로세스에서 실행 중(또는 대기 중)인 스캔 취소
+
+    Returns:
+        이 프로세스에 해당 스캔의 토큰이 있었으면 True
+    """
+    with _lock:
+        token = _tokens.get(session_id)
+    if token is None:
+        return False
+    token.cancel()
+    return True
+
+
+def request_remote_cancel(session_id: str) -> None:
+    """다른 API 워커에서 실행 중인 스캔에 취소 플래그 설정 (해당 워커가 폴링)"""
+    from app.core.redis import get_redis
+
+    get_redis().set(cancel_key(session_id), "1", ex=settings.SCAN_TIMEOUT + 60)
+
+
+def clear_remote_cancel(session_id: str) -> None:
+    """
+    Redis 취소 플래그 삭제 (SCAN_REGISTRY_BACKEND=redis인 경우만)
+
+    남아 있으면 같은 세션을 재개한 실행이 이전 취소 요청으로 다시 취소된다.
+    """
+    if settings.SCAN_REGISTRY_BACKEND != "redis":
+        return
+    from app.core.redis import get_redis
+
+    get_redis().delete(cancel_key(session_id))
@@ -0,0 +1,139 @@
+"""
+LangGraph 체크포인터
+
+노드가 끝날 때마다 그래프 상태를 저장해 두고, 실패하거나 워커가 죽은 스캔을
+마지막으로 완료된 노드 다음부터 재개한다 (thread_id = 세션 ID).
+- postgres: 운영용 (langgraph-checkpoint-postgres, psycopg 3)
+- sqlite: 로컬 개발용 (langgraph-checkpoint-sqlite)
+- memory: 프로세스 내부 (재시작하면 사라짐)
+- none: 체크포인트 사용 안 함
+
+완료된 스캔의 체크포인트는 바로 지운다. 실패/취소/타임아웃된 스캔의 체크포인트는 postgres/sqlite이면
+재개를 위해 남기고(세션 삭제 시 삭제), memory이면 메모리에 계속 쌓이지 않도록 바로 지운다
+(memory에서 재개하면 처음부터 실행된다. 워커가 죽은 스캔을 이어서 실행하려면 postgres/sqlite 필요).
+"""
+import logging
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 재시작 후에도 체크포인트가 남는 백엔드
+DURABLE_BACKENDS = ("postgres", "sqlite")
+
+# psycopg_pool 기본 min_size (max_size가 더 작으면 max_size)
+POOL_MIN_SIZE = 4
+
+_lock = threading.Lock()
+_checkpointer = None
+_backend = None  # 실제로 만든 백엔드 (의존성이 없어 memory로 대체한 경우 memory)
+_initialized = False
+
+
+def _postgres_conninfo(url: str) -> str:
+    """SQLAlchemy URL("postgresql+psycopg2://...")을 psycopg 접속 문자열로 변환"""
+    scheme, sep, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}{sep}{rest}"
+
+
+def _create_checkpointer():
+    """(체크포인터, 백엔드 이름)"""
+    backend = settings.SCAN_CHECKPOINTER
+
+    if backend == "none":
+        return None, backend
+
+    if backend == "postgres":
+        try:
+            from langgraph.checkpoint.postgres import PostgresSaver
+            from psycopg.rows import dict_row
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            logger.warning(
+                "langgraph-checkpoint-postgres is not installed, falling back to memory checkpointer"
+            )
+        else:
+            max_size = max(settings.MAX_CONCURRENT_SCANS, 1)
+            pool = ConnectionPool(
+                conninfo=_postgres_conninfo(settings.DATABASE_URL),
+                min_size=min(POOL_MIN_SIZE, max_size),
+                max_size=max_size,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                open=True,
+            )
+            saver = PostgresSaver(pool)
+            saver.setup()
+            return saver, backend
+
+    if backend == "sqlite":
+        try:
+            import sqlite3
+            from pathlib import Path
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError:
+            logger.warning(
+                "langgraph-checkpoint-sqlite is not installed, falling back to memory checkpointer"
+            )
+        else:
+            path = Path(settings.SCAN_CHECKPOINT_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 워커 스레드들이 공유 (SqliteSaver가 내부 lock으로 직렬화)
+            saver = SqliteSaver(sqlite3.connect(str(path), check_same_thread=False))
+            saver.setup()
+            return saver, backend
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver(), "memory"
+
+
+def get_checkpointer():
+    """설정된 체크포인터 반환 (SCAN_CHECKPOINTER=none이면 None)"""
+    global _checkpointer, _backend, _initialized
+    if not _initialized:
+        with _lock:
+            if not _initialized:
+                _checkpointer, _backend = _create_checkpointer()
+                _initialized = True
+                logger.info(f"Scan checkpointer initialized: {_backend}")
+    return _checkpointer
+
+
+def is_durable() -> bool:
+    """체크포인트가 프로세스 재시작 후에도 남는지 (postgres/sqlite)"""
+    get_checkpointer()
+    return _backend in DURABLE_BACKENDS
+
+
+def release_checkpoint(session_id: str) -> None:
+    """
+    실패/취소/타임아웃으로 끝난 스캔의 체크포인트 정리
+
+    postgres/sqlite이면 재개할 수 있도록 남기고, memory이면 삭제한다.
+    """
+    if not is_durable():
+        delete_checkpoint(session_id)
+
+
+def delete_checkpoint(session_id: str) -> None:
+    """완료되거나 삭제된 스캔의 체크포인트 삭제 (재개할 일이 없으므로)"""
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        return
+    try:
+        checkpointer.delete_thread(session_id)
+    except Exception as e:
+        logger.warning(f"Failed to delete checkpoint for {session_id}: {e}")
+
+
+def close_checkpointer() -> None:
+    """체크포인터 연결 정리 (애플리케이션 종료 시)"""
+    global _checkpointer, _backend, _initialized
+    with _lock:
+        conn = getattr(_checkpointer, "conn", None)
+        if conn is not None:
+            conn.close()
+        _checkpointer = None
+        _backend = None
+        _initialized = False
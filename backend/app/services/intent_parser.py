@@ -0,0 +1,181 @@
+"""
+채팅 메시지 스캔 의도 파싱
+
+1단계: 미리 컴파일한 정규식으로 대상(IP, CIDR, localhost)과 스캔 유형(영문/한글 표현)을 추출
+2단계: 1단계 결과가 모호할 때만 LLM으로 파싱 (대상 없음, 스캔 유형 충돌)
+
+두 단계 모두 정규화한 메시지 단위로 메모이즈한다.
+"""
+import asyncio
+import ipaddress
+import json
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.core import metrics, tracing
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCAN_TYPE = "quick"
+
+# 대상 패턴
+# 한글 조사가 바로 붙는 경우("192.168.0.5에", "localhost를")를 위해 \b 대신 lookaround 사용
+# 호스트명은 스캔 대상 검증(validate_scan_target)과 허용 대역 확인을 통과하지 못하므로 localhost만 추출한다
+TARGET_PATTERN = re.compile(
+    r"""
+    (?P<cidr>(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}/\d{1,2}(?!\d))
+    |(?P<ip>(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?!\.?\d|/\d))
+    |(?P<host>(?<![\w.-])localhost(?!\.?[a-z0-9-]))
+    """,
+    re.IGNORECASE | re.VERBOSE | re.ASCII,
+)
+
+# 스캔 유형 패턴 (그룹 이름이 스캔 유형)
+SCAN_TYPE_PATTERN = re.compile(
+    r"""
+    (?P<full>\bfull\b|풀\s*스캔|전체\s*(?:포트|스캔)|모든\s*포트|정밀\s*스캔|all\s+ports)
+    |(?P<standard>\bstandard\b|표준|일반\s*스캔|기본\s*스캔)
+    |(?P<quick>\bquick\b|\bfast\b|퀵|빠른|빠르게|간단(?:한|히)?\s*스캔|간단히)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+LLM_PROMPT = """다음 메시지에서 보안 스캔 요청을 추출해 JSON으로만 답하세요.
+
+메시지: {message}
+
+형식: {{"targets": ["IP, CIDR 또는 localhost"], "scan_type": "quick" | "standard" | "full"}}
+스캔 대상이 없으면 targets를 빈 배열로 답하세요."""
+
+
+class ScanIntent(NamedTuple):
+    """파싱된 스캔 의도"""
+    targets: Tuple[str, ...]  # IP, CIDR 또는 localhost
+    scan_type: str
+    source: str  # pattern / llm
+
+
+def normalize_message(message: str) -> str:
+    """캐시 키로 사용할 정규화된 메시지"""
+    return " ".join(message.split()).lower()
+
+
+def _normalize_target(value: str) -> Optional[str]:
+    """대상 문자열 검증 및 정규화 (유효하지 않으면 None)"""
+    value = value.strip().lower()
+    try:
+        if "/" in value:
+            return str(ipaddress.ip_network(value, strict=False))
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        pass
+    if value == "localhost":
+        return value
+    return None
+
+
+@lru_cache(maxsize=settings.INTENT_CACHE_SIZE)
+def _parse_fast(message: str) -> Tuple[Optional[ScanIntent], bool]:
+    """
+    정규식 기반 파싱
+
+    Returns:
+        (intent, ambiguous) - ambiguous이면 LLM 파싱이 필요하다
+    """
+    targets = []
+    for match in TARGET_PATTERN.finditer(message):
+        target = _normalize_target(match.group(0))
+        if target is not None and target not in targets:
+            targets.append(target)
+
+    scan_types = {match.lastgroup for match in SCAN_TYPE_PATTERN.finditer(message)}
+
+    if not targets or len(scan_types) > 1:
+        return None, True
+
+    scan_type = scan_types.pop() if scan_types else DEFAULT_SCAN_TYPE
+    return ScanIntent(tuple(targets), scan_type, "pattern"), False
+
+
+@lru_cache(maxsize=settings.INTENT_CACHE_SIZE)
+def _parse_llm(message: str) -> Optional[ScanIntent]:
+    """LLM 기반 파싱 (예외는 캐시되지 않으므로 일시적 실패는 재시도된다)"""
+    from app.services.llm import build_chat_model
+
+    llm = build_chat_model(temperature=0, timeout=settings.INTENT_LLM_TIMEOUT)
+    with tracing.span("llm.invoke", {"llm.operation": "intent", "llm.model": settings.OPENAI_MODEL}) as llm_span:
+        started = time.perf_counter()
+        try:
+            response = llm.invoke(LLM_PROMPT.format(message=message))
+        except Exception:
+            metrics.observe_llm("intent", time.perf_counter() - started, outcome="error")
+            raise
+        metrics.observe_llm("intent", time.perf_counter() - started, response)
+        tracing.set_llm_usage(llm_span, response)
+
+    content = response.content.strip()
+    # ```json ... ``` 코드 블록으로 감싸서 답하는 경우
+    content = content.removeprefix("```json").removeprefix("```").removesuffix("```")
+    data = json.loads(content)
+
+    targets = []
+    for value in data.get("targets") or []:
+        target = _normalize_target(str(value))
+        if target is not None and target not in targets:
+            targets.append(target)
+    if not targets:
+        return None
+
+    scan_type = data.get("scan_type")
+    if scan_type not in ("quick", "standard", "full"):
+        scan_type = DEFAULT_SCAN_TYPE
+    return ScanIntent(tuple(targets), scan_type, "llm")
+
+
+async def parse_intent(message: str) -> Optional[ScanIntent]:
+    """
+    메시지에서 스캔 의도 추출
+
+    정규식으로 확정할 수 있으면 LLM을 호출하지 않는다.
+
+    Returns:
+        ScanIntent 또는 None (스캔 대상을 찾지 못한 경우)
+    """
+    key = normalize_message(message)
+    intent, ambiguous = _parse_fast(key)
+    if not ambiguous or not settings.INTENT_LLM_FALLBACK:
+        return intent
+
+    try:
+        # 원문을 넘기면 캐시 적중률이 떨어지므로 정규화된 메시지를 사용
+        return await asyncio.to_thread(_parse_llm, key)
+    except Exception as e:
+        logger.warning(f"LLM intent parsing failed: {e}")
+        return None
+
+
+def expand_targets(targets: Tuple[str, ...]) -> List[str]:
+    """
+    CIDR 대상을 호스트 IP 목록으로 펼친다
+
+    Raises:
+        ValueError: 펼친 대상 수가 MAX_BATCH_TARGETS를 넘는 경우
+    """
+    expanded = []
+    for target in targets:
+        if "/" not in target:
+            expanded.append(target)
+            continue
+
+        network = ipaddress.ip_network(target, strict=False)
+        if len(expanded) + network.num_addresses > settings.MAX_BATCH_TARGETS:
+            raise ValueError(
+                f"Too many targets in {target} (max {settings.MAX_BATCH_TARGETS})"
+            )
+        expanded.extend(str(host) for host in network.hosts())
+
+    return list(dict.fromkeys(expanded))
@@ -2,31 +2,71 @@
 LangGraph 기반 보안 스캔 서비스
 """
 import logging
+import time
+from contextlib import nullcontext
 from typing import Optional, Callable
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
 import json
 
+from app.core import metrics, tracing
 from app.core.config import settings
+from app.core.logging import log_context
 from app.schemas.scan_state import SecurityScanState
+from app.services.cancellation import CancellationToken, ScanCancelled
+from app.services.llm import build_chat_model
+from app.services.tools.nmap_tool import NmapTool
+from app.services.tools.stub_tool import StubScannerTool
 
 logger = logging.getLogger(__name__)
 
+# 스캔 타입별 포트 범위
+SCAN_PORT_RANGES = {
+    "quick": "1-1000",
+    "standard": "1-10000",
+    "full": "1-65535",
+}
+
+# 포트 스캔 nmap 인자 (호스트 탐색 생략, aggressive 타이밍)
+NMAP_ARGUMENTS = "-Pn -T4"
+
+
+def split_port_range(port_range: str, chunk_size: int) -> list:
+    """"1-10000" 형태의 포트 범위를 chunk_size 단위로 분할"""
+    start, _, end = port_range.partition("-")
+    start, end = int(start), int(end or start)
+    if chunk_size <= 0:
+        return [port_range]
+    return [
+        f"{low}-{min(low + chunk_size - 1, end)}"
+        for low in range(start, end + 1, chunk_size)
+    ]
+
 
 class LangGraphService:
     """LangGraph 기반 보안 스캔 서비스"""
 
-    def __init__(self, progress_callback: Optional[Callable] = None):
+    def __init__(
+        self,
+        progress_callback: Optional[Callable] = None,
+        checkpointer=None,
+        cancel_token: Optional[CancellationToken] = None,
+        profiler=None,
+    ):
         """
         Args:
-            progress_callback: 진행 상황 콜백 함수 (step, progress)
+            progress_callback: 진행 상황 콜백 함수 (step, progress, data)
+                data에는 부분 결과(예: 새로 발견된 ports)가 담긴다
+            checkpointer: LangGraph 체크포인터 (있으면 노드마다 상태를 저장해 재개 가능)
+            cancel_token: 취소/기한 토큰 (없으면 SCAN_TIMEOUT 기한만 적용)
+            profiler: profiling.Profiler (있으면 run_scan과 모든 노드를 프로파일링)
         """
-        self.llm = ChatOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            model=settings.OPENAI_MODEL,
-            temperature=0.3,
-        )
+        self.checkpointer = checkpointer
+        self.cancel_token = cancel_token or CancellationToken(timeout=settings.SCAN_TIMEOUT)
+        self.llm = build_chat_model(temperature=0.3, timeout=settings.LLM_TIMEOUT)
         self.progress_callback = progress_callback
+        self.profiler = profiler
+        # 노드 span의 부모 (run_scan을 호출한 스레드의 컨텍스트)
+        self._trace_parent = None
         self.graph = self._build_graph()
 
     def _build_graph(self):
@@ -34,12 +74,12 @@ class LangGraphService:
         graph = StateGraph(SecurityScanState)
 
         # 노드 추가 (State 키와 겹치지 않도록 node_ 접두사 사용)
-        graph.add_node("node_analyze", self._analyze_input)
-        graph.add_node("node_port_scan", self._port_scan)
-        graph.add_node("node_vulnerability", self._vulnerability_analysis)
-        graph.add_node("node_risk", self._risk_assessment)
-        graph.add_node("node_remediation", self._remediation)
-        graph.add_node("node_report", self._report_generation)
+        graph.add_node("node_analyze", self._node("node_analyze", self._analyze_input))
+        graph.add_node("node_port_scan", self._node("node_port_scan", self._port_scan))
+        graph.add_node("node_vulnerability", self._node("node_vulnerability", self._vulnerability_analysis))
+        graph.add_node("node_risk", self._node("node_risk", self._risk_assessment))
+        graph.add_node("node_remediation", self._node("node_remediation", self._remediation))
+        # 보고서는 그래프에서 만들지 않고 조회 시 렌더링 (report_renderer)
 
         # 엣지 추가
         graph.set_entry_point("node_analyze")
@@ -47,18 +87,52 @@ class LangGraphService:
         graph.add_edge("node_port_scan", "node_vulnerability")
         graph.add_edge("node_vulnerability", "node_risk")
         graph.add_edge("node_risk", "node_remediation")
-        graph.add_edge("node_remediation", "node_report")
-        graph.add_edge("node_report", END)
+        graph.add_edge("node_remediation", END)
+
+        return graph.compile(checkpointer=self.checkpointer)
 
-        return graph.compile()
+    def _node(self, name: str, func: Callable) -> Callable:
+        """노드 실행 시간 기록 (scan_node_duration_seconds, 로그의 duration_ms) 및 노드 span"""
+        def run(state: SecurityScanState) -> SecurityScanState:
+            started = time.perf_counter()
+            outcome = "ok"
+            with log_context(node=name), self._profile():
+                try:
+                    with tracing.span(name, parent=self._trace_parent):
+                        return func(state)
+                except ScanCancelled:
+                    outcome = "cancelled"
+                    raise
+                except Exception:
+                    outcome = "error"
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    metrics.NODE_DURATION.labels(name, outcome).observe(elapsed)
+                    logger.info(
+                        f"Node {name} finished ({outcome})",
+                        extra={"outcome": outcome, "duration_ms": round(elapsed * 1000, 1)},
+                    )
+
+        return run
+
+    def _profile(self):
+        """현재 스레드를 프로파일에 포함 (프로파일러가 없으면 no-op)"""
+        return self.profiler.attach() if self.profiler is not None else nullcontext()
+
+    def _update_progress(self, state: SecurityScanState, step: str, progress: int, **data):
+        """진행 상황 업데이트 (취소/기한 초과 시 ScanCancelled 발생)"""
+        self.cancel_token.check()
 
-    def _update_progress(self, state: SecurityScanState, step: str, progress: int):
-        """진행 상황 업데이트"""
         state["current_step"] = step
         state["progress"] = progress
 
         if self.progress_callback:
-            self.progress_callback(step, progress)
+            try:
+                self.progress_callback(step, progress, data)
+            except Exception as e:
+                # 콜백 실패(이벤트 전송 등)가 스캔을 중단시키지 않도록 한다
+                logger.warning(f"Progress callback failed: {e}")
 
         logger.info(f"Step: {step}, Progress: {progress}%")
 
@@ -77,12 +151,7 @@ class LangGraphService:
                 raise ValueError(f"Unauthorized target: {target}")
 
             # 스캔 타입에 따른 포트 범위 결정
-            port_ranges = {
-                "quick": "1-1000",
-                "standard": "1-10000",
-                "full": "1-65535"
-            }
-            state["port_range"] = port_ranges.get(scan_type, "1-1024")
+            state["port_range"] = SCAN_PORT_RANGES.get(scan_type, "1-1024")
 
             self._update_progress(state, "analyze_input", 20)
             return state
@@ -96,38 +165,50 @@ class LangGraphService:
         """2단계: 포트 스캔"""
         self._update_progress(state, "port_scan", 30)
 
+        ports = []
         try:
-            import nmap
-            nm = nmap.PortScanner()
+            if settings.SCANNER_BACKEND == "stub":
+                scanner = StubScannerTool(self.cancel_token)
+            else:
+                scanner = NmapTool(self.cancel_token)
 
             target = state["target"]
             port_range = state.get("port_range", "1-1024")
 
             logger.info(f"Scanning ports on {target}: {port_range}")
 
-            # nmap 스캔 실행
-            nm.scan(target, port_range, arguments="-Pn -T4")
-
-            # 결과 파싱
-            ports = []
-            if target in nm.all_hosts():
-                for proto in nm[target].all_protocols():
-                    for port in nm[target][proto].keys():
-                        port_info = nm[target][proto][port]
-                        if port_info["state"] == "open":
-                            ports.append({
-                                "port": port,
-                                "state": port_info["state"],
-                                "service": port_info.get("name", "unknown"),
-                                "version": port_info.get("version", ""),
-                            })
+            # 단계 기한: PORT_SCAN_TIMEOUT과 전체 남은 시간 중 짧은 쪽
+            stage_timeout = self.cancel_token.timeout_for(settings.PORT_SCAN_TIMEOUT)
+            stage_deadline = time.monotonic() + stage_timeout if stage_timeout is not None else None
+
+            # 포트 범위를 나눠 스캔하고, 청크마다 부분 결과를 전달
+            chunks = split_port_range(port_range, settings.PORT_SCAN_CHUNK_SIZE)
+            for index, chunk in enumerate(chunks, start=1):
+                timeout = None
+                if stage_deadline is not None:
+                    timeout = max(0.0, stage_deadline - time.monotonic())
+                found = scanner.scan_ports(target, chunk, arguments=NMAP_ARGUMENTS, timeout=timeout)
+
+                ports.extend(found)
+                self._update_progress(
+                    state,
+                    "port_scan",
+                    30 + (10 * index) // len(chunks),
+                    ports=found,
+                    scanned=chunk,
+                )
 
             state["ports"] = ports
             logger.info(f"Found {len(ports)} open ports")
 
-            self._update_progress(state, "port_scan", 40)
+            self._update_progress(state, "port_scan", 40, open_ports=len(ports))
             return state
 
+        except ScanCancelled as e:
+            # 그때까지 찾은 포트는 부분 결과로 남긴다
+            e.partial["ports"] = ports
+            raise
+
         except ImportError:
             logger.warning("nmap not installed, using simulation mode")
             # 시뮬레이션 데이터
@@ -136,7 +217,7 @@ class LangGraphService:
                 {"port": 80, "state": "open", "service": "http", "version": ""},
                 {"port": 443, "state": "open", "service": "https", "version": ""},
             ]
-            self._update_progress(state, "port_scan", 40)
+            self._update_progress(state, "port_scan", 40, ports=state["ports"])
             return state
 
         except Exception as e:
@@ -187,6 +268,8 @@ class LangGraphService:
             self._update_progress(state, "vulnerability_analysis", 60)
             return state
 
+        except ScanCancelled:
+            raise
         except Exception as e:
             logger.error(f"Vulnerability analysis failed: {e}")
             state["vulnerabilities"] = []
@@ -227,7 +310,7 @@ class LangGraphService:
 분석: [주요 위험 요소]
 """
 
-            response = self.llm.invoke(prompt)
+            response = self._invoke_llm(prompt, "risk_assessment")
             assessment_text = response.content
 
             # 간단한 파싱 (실제로는 더 정교하게)
@@ -258,6 +341,8 @@ class LangGraphService:
             self._update_progress(state, "risk_assessment", 80)
             return state
 
+        except ScanCancelled:
+            raise
         except Exception as e:
             logger.error(f"Risk assessment failed: {e}")
             # AI 실패 시 기본 평가
@@ -296,7 +381,7 @@ class LangGraphService:
 간결하고 실용적인 조언을 부탁드립니다.
 """
 
-            response = self.llm.invoke(prompt)
+            response = self._invoke_llm(prompt, "remediation")
             remediation_text = response.content
 
             state["remediation"] = {
@@ -307,6 +392,8 @@ class LangGraphService:
             self._update_progress(state, "remediation", 95)
             return state
 
+        except ScanCancelled:
+            raise
         except Exception as e:
             logger.error(f"Remediation generation failed: {e}")
             state["remediation"] = {
@@ -314,56 +401,23 @@ class LangGraphService:
             }
             return state
 
-    def _report_generation(self, state: SecurityScanState) -> SecurityScanState:
-        """6단계: 보고서 생성"""
-        self._update_progress(state, "report_generation", 98)
-
-        try:
-            # 최종 보고서 생성
-            ports = state.get("ports", [])
-            vulnerabilities = state.get("vulnerabilities", [])
-            risk = state.get("risk_assessment", {})
-            remediation = state.get("remediation", {})
-
-            report = f"""# 보안 스캔 보고서
-
-## 대상 정보
-- IP: {state['target']}
-- 스캔 유형: {state['scan_type']}
-
-## 포트 스캔 결과
-발견된 열린 포트: {len(ports)}개
-
-{self._format_ports(ports)}
-
-## 취약점 분석
-발견된 취약점: {len(vulnerabilities)}개
-
-{self._format_vulnerabilities(vulnerabilities)}
-
-## 위험도 평가
-- 점수: {risk.get('score', 0)}/100
-- 등급: {risk.get('level', 'Unknown')}
-
-{risk.get('analysis', '평가 없음')}
-
-## 해결 방안
-{remediation.get('recommendations', '방안 없음')}
-
----
-*보고서 생성 시간: 자동 생성*
-"""
-
-            state["report"] = report
-            logger.info("Report generated successfully")
-
-            self._update_progress(state, "report_generation", 100)
-            return state
-
-        except Exception as e:
-            logger.error(f"Report generation failed: {e}")
-            state["error"] = str(e)
-            raise
+    def _invoke_llm(self, prompt: str, operation: str):
+        """LLM 호출 (호출당 제한 시간은 LLM_TIMEOUT과 스캔 남은 시간 중 짧은 쪽)"""
+        timeout = self.cancel_token.timeout_for(settings.LLM_TIMEOUT)
+        attributes = {"llm.operation": operation, "llm.model": settings.OPENAI_MODEL, "llm.timeout": timeout}
+        with tracing.span("llm.invoke", attributes) as llm_span:
+            started = time.perf_counter()
+            try:
+                # 제한이 없으면 bind하지 않는다 (timeout=None은 클라이언트 기본 제한 시간까지 없앤다)
+                llm = self.llm.bind(timeout=timeout) if timeout is not None else self.llm
+                response = llm.invoke(prompt)
+            except Exception:
+                metrics.observe_llm(operation, time.perf_counter() - started, outcome="error")
+                raise
+            metrics.observe_llm(operation, time.perf_counter() - started, response)
+            tracing.set_llm_usage(llm_span, response)
+        self.cancel_token.check()
+        return response
 
     def _validate_target(self, target: str) -> bool:
         """대상 IP 검증 (화이트리스트)"""
@@ -379,38 +433,37 @@ class LangGraphService:
 
         return False
 
-    def _format_ports(self, ports: list) -> str:
-        """포트 목록 포맷팅"""
-        if not ports:
-            return "열린 포트 없음"
-
-        lines = []
-        for p in ports:
-            service = p.get('service', 'unknown')
-            version = p.get('version', '')
-            version_str = f" ({version})" if version else ""
-            lines.append(f"- {p['port']}/{service}{version_str} - {p['state']}")
-        return "\n".join(lines)
-
-    def _format_vulnerabilities(self, vulns: list) -> str:
-        """취약점 목록 포맷팅"""
-        if not vulns:
-            return "발견된 취약점 없음"
-
-        lines = []
-        for v in vulns:
-            lines.append(
-                f"- [{v['severity']}] {v['type']} (포트 {v['port']}): {v['description']}"
-            )
-        return "\n".join(lines)
-
-    def run_scan(self, target: str, scan_type: str = "standard") -> SecurityScanState:
-        """동기 스캔 실행"""
+    def run_scan(
+        self,
+        target: str,
+        scan_type: str = "standard",
+        thread_id: Optional[str] = None,
+        resume: bool = False,
+    ) -> SecurityScanState:
+        """
+        동기 스캔 실행
+
+        Args:
+            thread_id: 체크포인트 thread ID (세션 ID)
+            resume: True면 마지막으로 완료된 노드 다음부터 이어서 실행
+                (저장된 체크포인트가 없으면 처음부터 실행)
+        """
+        with self._profile():
+            return self._run_scan(target, scan_type, thread_id, resume)
+
+    def _run_scan(
+        self,
+        target: str,
+        scan_type: str,
+        thread_id: Optional[str],
+        resume: bool,
+    ) -> SecurityScanState:
         logger.info(f"Starting scan for {target} (type: {scan_type})")
 
         initial_state: SecurityScanState = {
             "target": target,
             "scan_type": scan_type,
+            "port_range": None,
             "ports": None,
             "vulnerabilities": None,
             "risk_assessment": None,
@@ -421,10 +474,38 @@ class LangGraphService:
             "error": None,
         }
 
+        config = None
+        if self.checkpointer is not None and thread_id is not None:
+            config = {"configurable": {"thread_id": thread_id}}
+
+        self._trace_parent = tracing.current_context()
+        graph_input = initial_state
+        if resume and config is not None:
+            snapshot = self.graph.get_state(config)
+            if snapshot.values and not snapshot.next:
+                # 그래프는 끝났는데 결과 저장 전에 중단된 경우
+                logger.info(f"Checkpoint for {thread_id} already complete")
+                return snapshot.values
+            if snapshot.values:
+                # 입력 None: 체크포인트에서 남은 노드만 실행
+                logger.info(f"Resuming {thread_id} at {', '.join(snapshot.next)}")
+                graph_input = None
+            else:
+                logger.info(f"No checkpoint for {thread_id}, starting from the beginning")
+
         try:
-            result = self.graph.invoke(initial_state)
+            result = self.graph.invoke(graph_input, config)
             logger.info("Scan completed successfully")
             return result
+        except ScanCancelled as e:
+            # 마지막 체크포인트(완료된 단계) + 중단된 단계의 부분 결과
+            partial = dict(initial_state)
+            if config is not None:
+                partial.update(self.graph.get_state(config).values)
+            partial.update(e.partial)
+            e.partial = partial
+            logger.warning(f"Scan stopped: {e}")
+            raise
         except Exception as e:
             logger.error(f"Scan failed: {e}")
             initial_state["error"] = str(e)
@@ -0,0 +1,154 @@
+"""
+채팅 모델 생성 (LLM_PROVIDER)
+
+- openai: ChatOpenAI
+- fake:   결정적인 가짜 모델 (부하 테스트/로컬 개발용, OpenAI 호출 없음)
+
+가짜 모델은 프롬프트만으로 응답이 정해지고, 첫 토큰까지 FAKE_LLM_LATENCY_MS,
+이후 토큰마다 FAKE_LLM_TOKEN_DELAY_MS만큼 지연한다 (invoke는 전체 생성 시간, stream은 토큰 단위).
+"""
+import hashlib
+import json
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.core.config import settings
+
+# 의도 파싱 프롬프트의 메시지 줄 (intent_parser.LLM_PROMPT)
+_INTENT_MESSAGE = re.compile(r"^메시지: (.*)$", re.MULTILINE)
+_IP = re.compile(r"(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?:/\d{1,2})?(?![\d.])")
+_SCAN_TYPES = ("full", "standard", "quick")
+_RISK_LEVELS = ((75, "Critical"), (50, "High"), (25, "Medium"), (0, "Low"))
+
+
+def build_chat_model(temperature: float, timeout: float) -> BaseChatModel:
+    """LLM_PROVIDER에 맞는 채팅 모델"""
+    if settings.LLM_PROVIDER == "fake":
+        return FakeChatModel(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            token_delay_ms=settings.FAKE_LLM_TOKEN_DELAY_MS,
+        )
+
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        model=settings.OPENAI_MODEL,
+        temperature=temperature,
+        timeout=timeout,
+    )
+
+
+def fake_reply(prompt: str) -> str:
+    """
+    프롬프트에 대한 가짜 응답 (같은 프롬프트면 항상 같은 응답)
+
+    - 의도 파싱: 메시지의 IP/CIDR과 스캔 유형을 JSON으로
+    - 위험도 평가: 점수/등급/분석 형식
+    - 그 외(해결 방안): 고정된 권고 문장
+    """
+    digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+
+    message = _INTENT_MESSAGE.search(prompt)
+    if message is not None and '"targets"' in prompt:
+        text = message.group(1).lower()
+        scan_type = next((name for name in _SCAN_TYPES if name in text), "quick")
+        return json.dumps({"targets": _IP.findall(text), "scan_type": scan_type})
+
+    if "점수:" in prompt:
+        score = digest % 101
+        level = next(name for floor, name in _RISK_LEVELS if score >= floor)
+        return (
+            f"점수: {score}\n"
+            f"등급: {level}\n"
+            "분석: 외부에 노출된 서비스 버전 확인, 불필요한 포트 차단, 인증 설정 점검이 필요합니다."
+        )
+
+    return (
+        "1. 즉시 조치 사항: 사용하지 않는 서비스를 중지하고 방화벽에서 해당 포트를 차단합니다.\n"
+        "2. 장기 해결 방안: 서비스를 최신 버전으로 유지하고 정기적으로 취약점 점검을 수행합니다.\n"
+        "3. 참고 자료: CIS Benchmarks, OWASP Top 10"
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    결정적인 가짜 채팅 모델 (LLM_PROVIDER=fake)
+
+    ChatOpenAI와 같이 bind(timeout=...), invoke, stream을 지원하고
+    usage_metadata(공백 단위 토큰 수)를 채워 LLM 메트릭/span에도 그대로 기록된다.
+    """
+
+    latency_ms: float = 0.0
+    token_delay_ms: float = 0.0
+    model_name: str = "fake"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _reply(self, messages: List[BaseMessage]) -> tuple:
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = fake_reply(prompt)
+        # 토큰 경계를 유지하도록 공백을 앞 토큰에 붙여 나눈다
+        tokens = re.findall(r"\S+\s*|\s+", content)
+        usage = {
+            "input_tokens": len(prompt.split()),
+            "output_tokens": len(tokens),
+            "total_tokens": len(prompt.split()) + len(tokens),
+        }
+        return tokens, usage
+
+    def _sleep(self, seconds: float, deadline: Optional[float]) -> None:
+        """지연 (timeout을 넘기면 ChatOpenAI처럼 TimeoutError)"""
+        if deadline is not None and time.monotonic() + seconds > deadline:
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            raise TimeoutError("Request timed out.")
+        time.sleep(seconds)
+
+    @staticmethod
+    def _deadline(timeout: Optional[float]) -> Optional[float]:
+        return time.monotonic() + timeout if timeout else None
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens, usage = self._reply(messages)
+        delay = (self.latency_ms + self.token_delay_ms * len(tokens)) / 1000
+        self._sleep(delay, self._deadline(timeout))
+        message = AIMessage(content="".join(tokens), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        tokens, usage = self._reply(messages)
+        deadline = self._deadline(timeout)
+        self._sleep(self.latency_ms / 1000, deadline)
+        for index, token in enumerate(tokens):
+            if index:
+                self._sleep(self.token_delay_ms / 1000, deadline)
+            # 사용량은 마지막 청크에만 (청크를 합치면 한 번만 더해진다)
+            last = index == len(tokens) - 1
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=token, usage_metadata=usage if last else None)
+            )
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
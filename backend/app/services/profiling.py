@@ -0,0 +1,447 @@
+"""
+온디맨드 프로파일링
+
+PROFILING_ENABLED=true일 때 특정 스캔 실행이나 API 요청 하나만 프로파일링한다.
+
+- 스캔: 요청 헤더 X-Profile(sampling/cprofile)로 제출하거나, POST /api/v1/profiling/scans/{id}로
+  다음 실행(재개)을 예약하면 run_scan과 모든 노드를 프로파일링해 PROFILING_DIR/scans/{id}.*에 저장
+- 요청: X-Profile 헤더가 있는 요청의 핸들러를 샘플링해 PROFILING_DIR/requests/{profile_id}.*에 저장
+  (응답 헤더 X-Profile-Id)
+
+모드:
+- sampling: PROFILING_SAMPLE_INTERVAL_MS마다 대상 스레드의 스택을 기록 (오버헤드가 작고 대기 시간도 보인다).
+  speedscope JSON과 샘플에서 계산한 pstats를 모두 저장
+- cprofile: 함수 호출마다 기록 (정확한 호출 수, 오버헤드 큼). pstats만 저장
+"""
+import asyncio
+import contextvars
+import cProfile
+import hmac
+import json
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sampling", "cprofile")
+PROFILE_KINDS = ("scans", "requests")
+FORMAT_SUFFIXES = {"pstats": ".pstats", "speedscope": ".speedscope.json"}
+MEDIA_TYPES = {"pstats": "application/octet-stream", "speedscope": "application/json"}
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# X-Profile 헤더로 요청한 모드 (요청 처리 중 제출한 스캔이 이어받는다)
+_requested_mode: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("profile_mode", default=None)
+
+# POST /profiling/scans/{id}로 예약한 세션 → 모드 (다음 실행에서 한 번 사용)
+_armed: Dict[str, str] = {}
+_armed_lock = threading.Lock()
+
+
+def requested_mode() -> Optional[str]:
+    return _requested_mode.get()
+
+
+@contextmanager
+def request_mode(mode: str):
+    """요청 처리 범위에서 X-Profile 모드 설정"""
+    token = _requested_mode.set(mode)
+    try:
+        yield
+    finally:
+        _requested_mode.reset(token)
+
+
+def arm_scan(session_id: str, mode: str) -> None:
+    """세션의 다음 실행을 프로파일링하도록 예약"""
+    with _armed_lock:
+        _armed[session_id] = mode
+
+
+def take_armed(session_id: str) -> Optional[str]:
+    with _armed_lock:
+        return _armed.pop(session_id, None)
+
+
+def token_matches(token: Optional[str]) -> bool:
+    """PROFILING_TOKEN이 설정되어 있으면 X-Profile-Token 헤더와 비교"""
+    if not settings.PROFILING_TOKEN:
+        return True
+    return token is not None and hmac.compare_digest(token, settings.PROFILING_TOKEN)
+
+
+def _frame_key(code) -> tuple:
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+class StackSampler:
+    """
+    주기적으로 스레드 스택을 기록하는 샘플러
+
+    대상은 attach한 스레드 전체, 또는 roots()가 돌려준 코드 객체를 실행 중인 스레드
+    (이 경우 스택은 해당 프레임부터 기록).
+    """
+
+    def __init__(self, interval: float, roots: Optional[Callable[[], set]] = None):
+        self.interval = interval
+        self.roots = roots
+        self.frames: List[tuple] = []
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self._frame_index: Dict[tuple, int] = {}
+        self._threads: Dict[int, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def add_thread(self, ident: int) -> None:
+        self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def remove_thread(self, ident: int) -> None:
+        if self._threads.get(ident, 0) <= 1:
+            self._threads.pop(ident, None)
+        else:
+            self._threads[ident] -= 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            roots = self.roots() if self.roots is not None else None
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident in self._threads:
+                    self._record(frame, None, weight)
+                elif roots:
+                    self._record(frame, roots, weight)
+
+    def _record(self, frame, roots: Optional[set], weight: float) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            if roots is not None and frame.f_code in roots:
+                break
+            frame = frame.f_back
+        else:
+            if roots is not None:
+                return
+
+        sample = []
+        for code in reversed(stack):
+            key = _frame_key(code)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self.frames)
+                self.frames.append(key)
+            sample.append(index)
+
+        # 같은 스택이 이어지면 (대기 중인 nmap 등) 한 샘플로 합친다
+        if self.samples and self.samples[-1] == sample:
+            self.weights[-1] += weight
+        else:
+            self.samples.append(sample)
+            self.weights.append(weight)
+
+    def speedscope(self, name: str) -> dict:
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": f"{settings.APP_NAME} {settings.APP_VERSION}",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": func, "file": filename, "line": line}
+                    for filename, line, func in self.frames
+                ],
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.elapsed,
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+        }
+
+    def pstats_dict(self) -> dict:
+        """
+        샘플에서 계산한 pstats 데이터 ({함수: (cc, nc, tt, ct, callers)})
+
+        호출 수 자리에는 함수가 스택에 있었던 샘플 수가 들어간다 (실제 호출 수가 아님).
+        """
+        stats: Dict[tuple, list] = {}
+        for sample, weight in zip(self.samples, self.weights):
+            seen = set()
+            for depth, index in enumerate(sample):
+                key = self.frames[index]
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                leaf = depth == len(sample) - 1
+                if leaf:
+                    entry[2] += weight
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += 1
+                    entry[1] += 1
+                    entry[3] += weight
+                if depth > 0:
+                    caller = self.frames[sample[depth - 1]]
+                    edge = entry[4].setdefault(caller, [0, 0, 0.0, 0.0])
+                    edge[0] += 1
+                    edge[1] += 1
+                    edge[2] += weight if leaf else 0.0
+                    edge[3] += weight
+        return {
+            key: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+
+class Profiler:
+    """스캔 실행 또는 요청 하나의 프로파일"""
+
+    def __init__(self, mode: str, name: str, roots: Optional[Callable[[], set]] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.name = name
+        self._profiles: List[cProfile.Profile] = []
+        self._attached: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._sampler = (
+            StackSampler(settings.PROFILING_SAMPLE_INTERVAL_MS / 1000, roots) if mode == "sampling" else None
+        )
+
+    @contextmanager
+    def attach(self):
+        """
+        현재 스레드를 프로파일링 (중첩 호출은 바깥 범위만 사용)
+
+        LangGraph가 노드를 다른 스레드에서 실행해도 노드 래퍼에서 다시 attach하므로 빠지지 않는다.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._attached.get(ident, 0)
+            self._attached[ident] = depth + 1
+        if depth:
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._attached[ident] -= 1
+            return
+
+        profile = None
+        if self._sampler is not None:
+            self._sampler.add_thread(ident)
+        else:
+            profile = cProfile.Profile()
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+            else:
+                self._sampler.remove_thread(ident)
+            with self._lock:
+                self._attached.pop(ident, None)
+
+    def save(self, kind: str, profile_id: str) -> List[str]:
+        """프로파일링을 끝내고 파일로 저장 (저장한 형식 목록)"""
+        directory = Path(settings.PROFILING_DIR) / kind
+        directory.mkdir(parents=True, exist_ok=True)
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            with open(directory / f"{profile_id}{FORMAT_SUFFIXES['speedscope']}", "w", encoding="utf-8") as f:
+                json.dump(self._sampler.speedscope(self.name), f)
+            with open(directory / f"{profile_id}{FORMAT_SUFFIXES['pstats']}", "wb") as f:
+                marshal.dump(self._sampler.pstats_dict(), f)
+            formats = ["pstats", "speedscope"]
+        else:
+            if not self._profiles:
+                return []
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(directory / f"{profile_id}{FORMAT_SUFFIXES['pstats']}")
+            formats = ["pstats"]
+
+        logger.info(f"Profile saved: {kind}/{profile_id} ({self.mode})")
+        return formats
+
+
+def profile_path(kind: str, profile_id: str, format: str) -> Path:
+    return Path(settings.PROFILING_DIR) / kind / f"{profile_id}{FORMAT_SUFFIXES[format]}"
+
+
+def list_profiles() -> List[dict]:
+    """저장된 프로파일 목록 (최근 순)"""
+    profiles = {}
+    for kind in PROFILE_KINDS:
+        directory = Path(settings.PROFILING_DIR) / kind
+        if not directory.is_dir():
+            continue
+        for format, suffix in FORMAT_SUFFIXES.items():
+            for path in directory.glob(f"*{suffix}"):
+                profile_id = path.name[: -len(suffix)]
+                stat = path.stat()
+                entry = profiles.setdefault((kind, profile_id), {
+                    "kind": kind,
+                    "profile_id": profile_id,
+                    "formats": [],
+                    "size_bytes": 0,
+                    "created_at": datetime.utcfromtimestamp(stat.st_mtime),
+                })
+                entry["formats"].append(format)
+                entry["size_bytes"] += stat.st_size
+
+    for entry in profiles.values():
+        entry["mode"] = "sampling" if "speedscope" in entry["formats"] else "cprofile"
+    return sorted(profiles.values(), key=lambda entry: entry["created_at"], reverse=True)
+
+
+def delete_profiles(session_id: str) -> None:
+    """세션의 프로파일 삭제 (세션 삭제 시)"""
+    for format in FORMAT_SUFFIXES:
+        profile_path("scans", session_id, format).unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    X-Profile 헤더가 있는 요청 프로파일링 (ASGI 미들웨어)
+
+    핸들러(라우팅 후 scope["endpoint"])를 실행 중인 스레드를 샘플링한다. 같은 엔드포인트에 대한
+    다른 요청이 동시에 처리되면 함께 기록될 수 있다. 요청 중 제출한 스캔은 헤더의 모드로 프로파일링한다.
+    PROFILING_TOKEN이 설정되어 있으면 X-Profile-Token 헤더가 일치할 때만 동작한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        mode = headers.get("x-profile")
+        if mode not in PROFILE_MODES or not token_matches(headers.get("x-profile-token")):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        def roots() -> set:
+            endpoint = scope.get("endpoint")
+            code = getattr(endpoint, "__code__", None)
+            return {code} if code is not None else set()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = Profiler("sampling", f"{scope['method']} {scope['path']}", roots=roots)
+        try:
+            with request_mode(mode):
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await asyncio.to_thread(profiler.save, "requests", profile_id)
+
+
+# 마지막 tracemalloc 스냅샷 (다음 스냅샷의 diff 기준)
+_last_snapshot = None
+_last_snapshot_at: Optional[datetime] = None
+_snapshot_lock = threading.Lock()
+
+
+def start_tracemalloc(frames: int) -> None:
+    """tracemalloc 시작 (이미 추적 중이면 그대로)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc started ({frames} frames)")
+
+
+def stop_tracemalloc() -> None:
+    global _last_snapshot, _last_snapshot_at
+    with _snapshot_lock:
+        _last_snapshot, _last_snapshot_at = None, None
+    tracemalloc.stop()
+    logger.info("tracemalloc stopped")
+
+
+def tracemalloc_snapshot(limit: int, group_by: str, compare: bool) -> dict:
+    """
+    할당 상위 위치 (compare=True면 이전 스냅샷 대비 증가량 순)
+
+    스냅샷을 찍는 동안 프로세스가 멈추므로 (추적 중인 블록 수에 비례) 자주 호출하지 않는다.
+    """
+    global _last_snapshot, _last_snapshot_at
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    now = datetime.utcnow()
+    with _snapshot_lock:
+        previous, previous_at = _last_snapshot, _last_snapshot_at
+        _last_snapshot, _last_snapshot_at = snapshot, now
+
+    if compare and previous is not None:
+        stats = [
+            {
+                "location": stat.traceback.format(),
+                "size_bytes": stat.size,
+                "count": stat.count,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(previous, group_by)[:limit]
+        ]
+    else:
+        previous_at = None
+        stats = [
+            {"location": stat.traceback.format(), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "traceback_limit": tracemalloc.get_traceback_limit(),
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "compared_to": previous_at,
+        "stats": stats,
+    }
@@ -0,0 +1,374 @@
+"""
+스캔 보고서 렌더링 서비스
+
+보고서는 스캔 중에 만들지 않고, 조회 시 구조화된 결과로부터 렌더링한다.
+렌더링 결과는 (결과 해시, 형식) 단위로 디스크에 캐시되므로,
+결과가 바뀌면 해시가 달라져 자동으로 새로 렌더링된다.
+
+캐시 파일은 REPORT_CACHE_DIR/<session_id>/ 아래에 두어 세션 삭제 시 함께 지운다.
+쓰기 후 REPORT_CACHE_PRUNE_SECONDS마다 오래된 파일(REPORT_CACHE_MAX_AGE_HOURS)을 지우고,
+전체 크기가 REPORT_CACHE_MAX_MB를 넘으면 가장 오래 읽지 않은 파일부터 지운다 (읽을 때 mtime 갱신).
+"""
+import hashlib
+import html
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from string import Template
+from typing import Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 템플릿이나 렌더링 로직을 바꾸면 올려서 기존 캐시를 무효화
+TEMPLATE_VERSION = "1"
+
+MEDIA_TYPES = {
+    "markdown": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "json": "application/json",
+    "pdf": "application/pdf",
+}
+
+FILE_EXTENSIONS = {"markdown": "md", "html": "html", "json": "json", "pdf": "pdf"}
+
+
+# 캐시 정리 주기 (초, 마지막 정리 이후 이 시간이 지난 뒤의 쓰기에서 정리)
+REPORT_CACHE_PRUNE_SECONDS = 60
+
+_prune_lock = threading.Lock()
+_last_pruned = 0.0
+
+
+class ReportFormatUnavailable(Exception):
+    """렌더링에 필요한 선택 의존성이 없는 형식"""
+
+
+# 템플릿은 모듈 로드 시 한 번만 컴파일
+MARKDOWN_TEMPLATE = Template("""# 보안 스캔 보고서
+
+## 대상 정보
+- IP: $target
+- 스캔 유형: $scan_type
+- 세션 ID: $session_id
+
+## 포트 스캔 결과
+발견된 열린 포트: $port_count개
+
+$ports
+
+## 취약점 분석
+발견된 취약점: $vulnerability_count개
+
+$vulnerabilities
+
+## 위험도 평가
+- 점수: $risk_score/100
+- 등급: $risk_level
+
+$risk_analysis
+
+## 해결 방안
+$recommendations
+
+---
+*스캔 완료 시간: $completed_at*
+""")
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>보안 스캔 보고서 - $target</title>
+<style>
+body { font-family: sans-serif; max-width: 960px; margin: 2em auto; color: #222; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1em; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+.sev-Critical, .sev-High { color: #b00020; font-weight: bold; }
+.sev-Medium { color: #b26a00; }
+pre { white-space: pre-wrap; background: #f6f6f6; padding: 1em; }
+</style>
+</head>
+<body>
+<h1>보안 스캔 보고서</h1>
+<h2>대상 정보</h2>
+<ul>
+<li>IP: $target</li>
+<li>스캔 유형: $scan_type</li>
+<li>세션 ID: $session_id</li>
+</ul>
+<h2>포트 스캔 결과</h2>
+<p>발견된 열린 포트: $port_count개</p>
+<table>
+<tr><th>포트</th><th>서비스</th><th>버전</th><th>상태</th></tr>
+$port_rows
+</table>
+<h2>취약점 분석</h2>
+<p>발견된 취약점: $vulnerability_count개</p>
+<table>
+<tr><th>심각도</th><th>유형</th><th>포트</th><th>설명</th></tr>
+$vulnerability_rows
+</table>
+<h2>위험도 평가</h2>
+<ul>
+<li>점수: $risk_score/100</li>
+<li>등급: $risk_level</li>
+</ul>
+<pre>$risk_analysis</pre>
+<h2>해결 방안</h2>
+<pre>$recommendations</pre>
+<hr>
+<p><em>스캔 완료 시간: $completed_at</em></p>
+</body>
+</html>
+""")
+
+
+def result_hash(meta: dict, result: dict, result_digest: str = None) -> str:
+    """
+    캐시 키로 사용할 결과 해시
+    압축 저장소 digest가 있으면 재사용하고, 없으면 결과 JSON을 해시한다
+    """
+    if result_digest is None:
+        raw = json.dumps(result, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        result_digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    key = f"{TEMPLATE_VERSION}:{result_digest}:{meta['session_id']}:{meta['completed_at']}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _format_ports(ports: list) -> str:
+    """포트 목록 포맷팅"""
+    if not ports:
+        return "열린 포트 없음"
+
+    lines = []
+    for p in ports:
+        service = p.get('service', 'unknown')
+        version = p.get('version', '')
+        version_str = f" ({version})" if version else ""
+        lines.append(f"- {p['port']}/{service}{version_str} - {p['state']}")
+    return "\n".join(lines)
+
+
+def _format_vulnerabilities(vulns: list) -> str:
+    """취약점 목록 포맷팅"""
+    if not vulns:
+        return "발견된 취약점 없음"
+
+    lines = []
+    for v in vulns:
+        lines.append(
+            f"- [{v['severity']}] {v['type']} (포트 {v['port']}): {v['description']}"
+        )
+    return "\n".join(lines)
+
+
+def _common_fields(meta: dict, result: dict) -> dict:
+    ports = result.get("ports") or []
+    vulnerabilities = result.get("vulnerabilities") or []
+    risk = result.get("risk_assessment") or {}
+    remediation = result.get("remediation") or {}
+    return {
+        "target": meta["target"],
+        "scan_type": meta["scan_type"],
+        "session_id": meta["session_id"],
+        "completed_at": meta.get("completed_at") or "-",
+        "port_count": len(ports),
+        "vulnerability_count": len(vulnerabilities),
+        "risk_score": risk.get("score", 0),
+        "risk_level": risk.get("level", "Unknown"),
+        "risk_analysis": risk.get("analysis", "평가 없음"),
+        "recommendations": remediation.get("recommendations", "방안 없음"),
+    }
+
+
+def render_markdown(meta: dict, result: dict) -> bytes:
+    fields = _common_fields(meta, result)
+    fields["ports"] = _format_ports(result.get("ports") or [])
+    fields["vulnerabilities"] = _format_vulnerabilities(result.get("vulnerabilities") or [])
+    return MARKDOWN_TEMPLATE.substitute(fields).encode("utf-8")
+
+
+def render_html(meta: dict, result: dict) -> bytes:
+    fields = {k: html.escape(str(v)) for k, v in _common_fields(meta, result).items()}
+    fields["port_rows"] = "\n".join(
+        "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>".format(
+            html.escape(str(p["port"])),
+            html.escape(p.get("service", "unknown")),
+            html.escape(p.get("version", "")),
+            html.escape(p.get("state", "")),
+        )
+        for p in result.get("ports") or []
+    )
+    fields["vulnerability_rows"] = "\n".join(
+        '<tr><td class="sev-{0}">{0}</td><td>{1}</td><td>{2}</td><td>{3}</td></tr>'.format(
+            html.escape(v["severity"]),
+            html.escape(v["type"]),
+            html.escape(str(v["port"])),
+            html.escape(v["description"]),
+        )
+        for v in result.get("vulnerabilities") or []
+    )
+    return HTML_TEMPLATE.substitute(fields).encode("utf-8")
+
+
+def render_json(meta: dict, result: dict) -> bytes:
+    return json.dumps({**meta, **result}, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def render_pdf(meta: dict, result: dict) -> bytes:
+    """Markdown 보고서를 PDF로 변환 (reportlab 필요)"""
+    try:
+        from io import BytesIO
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+    except ImportError:
+        raise ReportFormatUnavailable("PDF reports require reportlab")
+
+    # 한글 출력용 CID 폰트 (reportlab 내장)
+    font = "HYSMyeongJo-Medium"
+    pdfmetrics.registerFont(UnicodeCIDFont(font))
+    styles = getSampleStyleSheet()
+    for style in styles.byName.values():
+        style.fontName = font
+
+    story = []
+    for line in render_markdown(meta, result).decode("utf-8").splitlines():
+        text = html.escape(line)
+        if line.startswith("## "):
+            story.append(Paragraph(text[3:], styles["Heading2"]))
+        elif line.startswith("# "):
+            story.append(Paragraph(text[2:], styles["Title"]))
+        elif line.strip():
+            story.append(Paragraph(text, styles["BodyText"]))
+        else:
+            story.append(Spacer(1, 6))
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title=f"Security Scan Report - {meta['target']}").build(story)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    "markdown": render_markdown,
+    "html": render_html,
+    "json": render_json,
+    "pdf": render_pdf,
+}
+
+
+def render_report(meta: dict, result: dict, fmt: str, result_digest: str = None) -> Tuple[bytes, str]:
+    """
+    보고서 렌더링 (캐시 우선)
+
+    Args:
+        meta: session_id, target, scan_type, completed_at
+        result: 구조화된 스캔 결과 (ScanSession.result_payload())
+        fmt: markdown / html / json / pdf
+        result_digest: 압축 저장소 digest (있으면 캐시 키에 재사용)
+
+    Returns:
+        (렌더링된 바이트, 캐시 키)
+    """
+    key = result_hash(meta, result, result_digest)
+    cache_path = session_cache_dir(meta["session_id"]) / f"{key}.{FILE_EXTENSIONS[fmt]}"
+
+    try:
+        body = cache_path.read_bytes()
+        # 최근에 읽은 파일이 용량 정리에서 늦게 지워지도록 (LRU)
+        os.utime(cache_path)
+        return body, key
+    except FileNotFoundError:
+        pass
+
+    body = RENDERERS[fmt](meta, result)
+
+    # 다른 워커와 동시에 쓰더라도 깨진 파일이 보이지 않도록 임시 파일 후 rename
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Failed to cache report {cache_path.name}: {e}")
+    else:
+        _maybe_prune()
+
+    return body, key
+
+
+def session_cache_dir(session_id: str) -> Path:
+    """세션의 보고서 캐시 디렉터리 (session_id가 UUID가 아니면 ValueError)"""
+    return Path(settings.REPORT_CACHE_DIR) / str(uuid.UUID(str(session_id)))
+
+
+def delete_reports(session_id: str) -> None:
+    """세션의 캐시된 보고서 삭제 (세션 삭제 시)"""
+    shutil.rmtree(session_cache_dir(session_id), ignore_errors=True)
+
+
+def _maybe_prune() -> None:
+    """마지막 정리 후 REPORT_CACHE_PRUNE_SECONDS가 지났으면 캐시 정리 (한 스레드만)"""
+    global _last_pruned
+    now = time.monotonic()
+    if now - _last_pruned < REPORT_CACHE_PRUNE_SECONDS or not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_pruned = now
+        prune_cache()
+    except OSError as e:
+        logger.warning(f"Failed to prune report cache: {e}")
+    finally:
+        _prune_lock.release()
+
+
+def prune_cache() -> int:
+    """
+    오래된 보고서 삭제 후 용량 상한을 넘으면 mtime이 오래된 것부터 삭제
+
+    Returns:
+        삭제한 파일 수
+    """
+    root = Path(settings.REPORT_CACHE_DIR)
+    if not root.is_dir():
+        return 0
+
+    files = []
+    for path in root.glob("*/*"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    expire_before = time.time() - settings.REPORT_CACHE_MAX_AGE_HOURS * 3600
+    max_bytes = settings.REPORT_CACHE_MAX_MB * 1024 * 1024
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for mtime, size, path in files:
+        expired = settings.REPORT_CACHE_MAX_AGE_HOURS > 0 and mtime < expire_before
+        if not expired and total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+        try:
+            path.parent.rmdir()  # 비었으면 세션 디렉터리도 삭제
+        except OSError:
+            pass
+
+    if removed:
+        logger.info(f"Pruned {removed} cached reports ({total / 1024 / 1024:.1f}MB left)")
+    return removed
@@ -0,0 +1,76 @@
+"""
+기존 결과 컬럼을 압축 저장소(scan_result_blobs)로 옮기는 백필
+
+마이그레이션은 RESULT_STORE=compressed일 때만 기존 결과를 옮긴다.
+inline으로 운영하다가 compressed로 바꾼 경우 이 명령으로 한 번 옮긴다
+(옮기지 않아도 기존 결과는 결과 컬럼에서 그대로 읽힌다).
+
+(created_at, id) 순서로 batch_size개씩 처리하고 배치마다 커밋하므로 중간에 멈춰도 다시 실행하면 이어서 처리한다.
+실행: `python -m app.services.result_backfill`
+"""
+import logging
+
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import undefer_group
+
+from app.core.database import SessionLocal
+from app.models import crud
+from app.models.scan_result import RESULT_FIELDS
+from app.models.scan_session import ScanSession
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def backfill_compressed_results(batch_size: int = BATCH_SIZE) -> int:
+    """
+    결과 컬럼에 남아 있는 결과를 압축 저장소로 옮기고 컬럼은 비운다
+
+    Returns:
+        옮긴 세션 수
+    """
+    db = SessionLocal()
+    moved = 0
+    last_key = None
+    try:
+        while True:
+            query = db.query(ScanSession).options(undefer_group("result")).filter(
+                ScanSession.result_digest.is_(None),
+                or_(
+                    ScanSession.ports.isnot(None),
+                    ScanSession.report.isnot(None),
+                    ScanSession.risk_assessment.isnot(None),
+                ),
+            )
+            if last_key is not None:
+                query = query.filter(tuple_(ScanSession.created_at, ScanSession.id) > tuple_(*last_key))
+            rows = query.order_by(ScanSession.created_at, ScanSession.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            for row in rows:
+                row.result_digest = crud.store_result_blob(db, row.result_payload())
+                for field in RESULT_FIELDS:
+                    setattr(row, field, None)
+            last_key = (rows[-1].created_at, rows[-1].id)
+            db.commit()
+
+            moved += len(rows)
+            logger.info(f"Moved {moved} scan results to the compressed store")
+    finally:
+        db.close()
+    return moved
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.logging import setup_logging
+
+    parser = argparse.ArgumentParser(description="결과 컬럼을 압축 저장소로 이동")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="커밋 한 번에 옮길 세션 수")
+    args = parser.parse_args()
+
+    setup_logging()
+    print(f"moved {backfill_compressed_results(args.batch_size)} sessions")
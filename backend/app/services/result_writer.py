@@ -0,0 +1,179 @@
+"""
+스캔 결과 묶음 저장 (group commit)
+
+배치/CIDR 스캔은 세션마다 결과 저장과 진행률 갱신 커밋이 반복되어 스캔보다 저장이 오래 걸린다.
+워커는 결과를 넘기고 저장이 끝날 때까지 기다리며, 저장 스레드는 BULK_WRITE_FLUSH_MS 동안
+모인 결과(최대 BULK_WRITE_MAX_BATCH개)를 한 트랜잭션으로 저장한다.
+
+- 결과: crud.save_scan_results_bulk (COPY + executemany UPDATE, 커밋 1회)
+- 진행률: 세션별 마지막 값만 남겨 같은 트랜잭션에서 crud.update_scan_progress_bulk로 반영 (기다리지 않음)
+
+워커는 커밋이 끝난 뒤 종료 이벤트를 발행하므로 이벤트를 받은 클라이언트는 저장된 결과를 읽는다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import crud
+from app.models.scan_session import ScanStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ResultWriter:
+    """결과/진행률 쓰기를 모아서 저장하는 백그라운드 스레드"""
+
+    def __init__(self, max_batch: int, flush_interval: float):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._cond = threading.Condition()
+        self._results: List[Tuple[str, dict, ScanStatus, dict, Future]] = []
+        self._progress: Dict[str, Tuple[str, int]] = {}
+        self._first_at: Optional[float] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def save_result(
+        self,
+        session_id: str,
+        result: dict,
+        status: ScanStatus = ScanStatus.COMPLETED,
+        **extra,
+    ) -> Future:
+        """
+        결과 저장 요청 (crud.save_scan_result와 같은 인자)
+
+        Returns:
+            커밋되면 완료되는 Future (저장에 실패하면 예외가 설정된다)
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Result writer is closed")
+            self._results.append((session_id, result, status, extra, future))
+            self._mark_pending()
+            if len(self._results) >= self.max_batch:
+                self._cond.notify()
+        return future
+
+    def update_progress(self, session_id: str, step: str, progress: int) -> None:
+        """진행률 갱신 요청 (다음 저장 때 마지막 값만 반영)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._progress[session_id] = (step, progress)
+            self._mark_pending()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 쓰기를 저장하고 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _mark_pending(self) -> None:
+        if self._first_at is None:
+            self._first_at = time.monotonic()
+            self._cond.notify()
+
+    def _take(self):
+        """저장할 시점까지 기다린 뒤 모인 쓰기를 꺼낸다 (닫혔고 남은 쓰기가 없으면 None)"""
+        with self._cond:
+            while True:
+                if self._first_at is None:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                remaining = self._first_at + self.flush_interval - time.monotonic()
+                if remaining <= 0 or len(self._results) >= self.max_batch or self._closed:
+                    break
+                self._cond.wait(remaining)
+
+            results = self._results[:self.max_batch]
+            self._results = self._results[self.max_batch:]
+            progress, self._progress = self._progress, {}
+            self._first_at = time.monotonic() if self._results else None
+            return results, progress
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            results, progress = batch
+            try:
+                self._flush(results, progress)
+            except Exception as e:
+                logger.error(f"Result writer flush failed: {e}")
+                for *_, future in results:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _flush(self, results: list, progress: dict) -> None:
+        # 같은 묶음에서 결과를 저장하는 세션의 진행률은 반영할 필요가 없다
+        for session_id, *_ in results:
+            progress.pop(session_id, None)
+
+        db = SessionLocal()
+        try:
+            try:
+                crud.update_scan_progress_bulk(db, progress)
+                crud.save_scan_results_bulk(
+                    db, [(session_id, result, status, extra) for session_id, result, status, extra, _ in results]
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                if not results:
+                    logger.warning(f"Bulk progress update of {len(progress)} sessions failed: {e}")
+                    return
+                # 한 세션 때문에 묶음 전체가 실패하지 않도록 건별로 다시 저장
+                logger.warning(f"Bulk write of {len(results)} results failed, saving one by one: {e}")
+                self._save_one_by_one(db, results)
+                return
+
+            for *_, future in results:
+                future.set_result(None)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _save_one_by_one(db, results: list) -> None:
+        for session_id, result, status, extra, future in results:
+            try:
+                crud.save_scan_result(db, session_id, result, status=status, **extra)
+                future.set_result(None)
+            except Exception as e:
+                db.rollback()
+                future.set_exception(e)
+
+
+_writer: Optional[ResultWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_result_writer() -> ResultWriter:
+    """프로세스 공용 ResultWriter (처음 호출할 때 스레드 시작)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ResultWriter(
+                settings.BULK_WRITE_MAX_BATCH,
+                settings.BULK_WRITE_FLUSH_MS / 1000,
+            )
+        return _writer
+
+
+def close_result_writer() -> None:
+    """남은 쓰기를 저장하고 종료 (앱 종료 시)"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout=10)
@@ -0,0 +1,376 @@
+"""
+scan_sessions 파티션 관리 및 보관(retention)
+
+scan_sessions는 created_at 기준 월별 RANGE 파티션 테이블이다 (scan_sessions_pYYYY_MM).
+- 앞으로 쓸 월 파티션을 미리 만든다 (없으면 행이 scan_sessions_default로 들어감)
+- SCAN_RETENTION_MONTHS보다 오래된 파티션은 분리(DETACH)해 gzip NDJSON 파일로 보관하고 삭제한다
+  (파티션 단위로 지우므로 대량 DELETE/VACUUM이 없다). 세션의 scan_ports/scan_findings 행도 함께 보관한다
+- 보관 파일은 월 단위로 필요할 때 읽어서 조회한다
+
+여러 워커가 동시에 실행해도 advisory lock으로 한 곳에서만 작업한다.
+실행: 앱 내 주기 작업(SCAN_RETENTION_INTERVAL_HOURS) 또는 `python -m app.services.retention` (cron)
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.compression import decompress
+from app.core.config import settings
+from app.core.database import engine
+from app.models.scan_result import RESULT_FIELDS
+from app.models.scan_session import ScanStatus, ScanType, created_at_range
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "scan_sessions"
+DEFAULT_PARTITION = "scan_sessions_default"
+PARTITION_PATTERN = re.compile(r"^scan_sessions_p(\d{4})_(\d{2})$")
+ARCHIVE_SUFFIX = ".ndjson.gz"
+
+# pg_try_advisory_lock 키 (임의의 고정값)
+RETENTION_LOCK_KEY = 0x3F1_5CA7
+
+_datetime_columns = ("created_at", "started_at", "completed_at", "updated_at")
+
+# 세션과 함께 보관하는 관측 테이블 (레코드의 같은 이름 키에 행 목록으로 저장)
+OBSERVATION_TABLES = ("scan_ports", "scan_findings")
+
+
+def add_months(month: date, months: int) -> date:
+    """월 단위 덧셈 (결과는 해당 달 1일)"""
+    index = month.month - 1 + months
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def current_month() -> date:
+    return datetime.utcnow().date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """파티션/보관 파일 이름에서 월 추출 (형식이 다르면 None)"""
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def list_partitions(conn: Connection) -> Dict[date, str]:
+    """연결된 월 파티션 {월: 테이블 이름}"""
+    names = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    return {month: name for name in names if (month := partition_month(name)) is not None}
+
+
+def _detached_partitions(conn: Connection) -> List[str]:
+    """분리됐지만 아직 보관/삭제되지 않은 파티션 (이전 실행이 중간에 실패한 경우)"""
+    names = conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition AND relname LIKE :prefix"
+        ),
+        {"prefix": f"{PARENT_TABLE}_p%"},
+    ).scalars()
+    return sorted(name for name in names if partition_month(name) is not None)
+
+
+def create_partition(conn: Connection, month: date) -> str:
+    """
+    월 파티션 생성
+
+    기본 파티션에 이미 그 달의 행이 있으면 새 파티션으로 옮긴 뒤 연결한다
+    (기본 파티션에 범위가 겹치는 행이 있으면 PARTITION OF로 만들 수 없다).
+    """
+    name = partition_name(month)
+    bounds = {"lower": month, "upper": add_months(month, 1)}
+    bound_sql = f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+
+    stray = conn.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper)"
+        ),
+        bounds,
+    ).scalar()
+
+    if not stray:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bound_sql}"))
+    else:
+        conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+        moved = conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            bounds,
+        ).rowcount
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bound_sql}"))
+        logger.info(f"Moved {moved} rows from {DEFAULT_PARTITION} to {name}")
+
+    conn.commit()
+    logger.info(f"Created partition {name}")
+    return name
+
+
+def ensure_partitions(conn: Connection, months_ahead: Optional[int] = None) -> List[str]:
+    """현재 달부터 months_ahead개월 뒤까지 월 파티션이 있는지 확인하고 없으면 생성"""
+    if months_ahead is None:
+        months_ahead = settings.SCAN_PARTITION_PREMAKE_MONTHS
+
+    existing = list_partitions(conn)
+    this_month = current_month()
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        if month not in existing:
+            created.append(create_partition(conn, month))
+    return created
+
+
+def archive_path(name: str) -> Path:
+    return Path(settings.SCAN_ARCHIVE_DIR) / f"{name}{ARCHIVE_SUFFIX}"
+
+
+def _archive_record(row) -> dict:
+    """
+    보관할 세션 레코드 (ScanSession.to_dict()와 같은 형태, 압축 결과는 풀어서 저장)
+
+    scan_ports/scan_findings 행은 같은 이름의 키에 목록으로 담는다 (session_id, target 제외).
+    """
+    record = dict(row)
+    codec, data = record.pop("codec"), record.pop("data")
+    if record["result_digest"] is not None and data is not None:
+        record.update(json.loads(decompress(codec, data)))
+
+    record["session_id"] = str(record.pop("id"))
+    for key in ("batch_id", "linked_session_id"):
+        record[key] = str(record[key]) if record[key] else None
+    # 원시 SQL로 읽으면 enum은 이름(대문자)으로 온다
+    record["scan_type"] = ScanType[record["scan_type"]].value
+    record["status"] = ScanStatus[record["status"]].value
+    for key in _datetime_columns:
+        record[key] = record[key].isoformat() if record[key] else None
+    return record
+
+
+def _export_partition(conn: Connection, name: str) -> int:
+    """분리된 파티션을 gzip NDJSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = archive_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+
+    columns = ", ".join(
+        f"t.{c}" for c in (
+            "id", "target", "scan_type", "batch_id", "linked_session_id", "status",
+            "progress", "current_step", "error", *RESULT_FIELDS, "result_digest", *_datetime_columns,
+        )
+    )
+    # 세션별 관측 행은 jsonb 배열로 함께 읽는다 (session_id 인덱스 사용)
+    observations = ", ".join(
+        f"(SELECT COALESCE(jsonb_agg(to_jsonb(o) - 'session_id' - 'target' ORDER BY o.id), '[]') "
+        f"FROM {table} o WHERE o.session_id = t.id) AS {table}"
+        for table in OBSERVATION_TABLES
+    )
+    # 서버 측 커서로 나눠 읽는다 (파티션 전체를 메모리에 올리지 않음)
+    rows = conn.execute(
+        text(
+            f"SELECT {columns}, {observations}, b.codec, b.data FROM {name} t "
+            "LEFT JOIN scan_result_blobs b ON b.digest = t.result_digest "
+            "ORDER BY t.created_at, t.id"
+        ),
+        execution_options={"stream_results": True, "yield_per": 1000},
+    ).mappings()
+
+    count = 0
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(_archive_record(row), ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+def archive_partition(conn: Connection, name: str) -> int:
+    """
+    파티션 분리 → 파일로 보관 → 관련 행 정리 후 삭제
+
+    중간에 실패하면 분리된 테이블이 남고, 다음 실행에서 이어서 처리한다.
+
+    Returns:
+        보관한 세션 수
+    """
+    if partition_month(name) in list_partitions(conn):
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        conn.commit()
+
+    count = _export_partition(conn, name)
+
+    # 관측 행은 FK가 없으므로 (보관 파일에 담은 뒤) 직접 지우고, 이 파티션만 참조하던 압축 결과도 정리
+    for table in OBSERVATION_TABLES:
+        conn.execute(text(f"DELETE FROM {table} o USING {name} t WHERE o.session_id = t.id"))
+    digests = conn.execute(
+        text(f"SELECT DISTINCT result_digest FROM {name} WHERE result_digest IS NOT NULL")
+    ).scalars().all()
+    conn.execute(text(f"DROP TABLE {name}"))
+    if digests:
+        conn.execute(
+            text(
+                "DELETE FROM scan_result_blobs b WHERE b.digest = ANY(:digests) "
+                "AND NOT EXISTS (SELECT 1 FROM scan_sessions s WHERE s.result_digest = b.digest)"
+            ),
+            {"digests": digests},
+        )
+    conn.commit()
+
+    logger.info(f"Archived {count} sessions from {name} to {archive_path(name)}")
+    return count
+
+
+def run_retention(retention_months: Optional[int] = None) -> Optional[dict]:
+    """
+    파티션 생성 + 오래된 파티션 보관
+
+    Args:
+        retention_months: 유지할 개월 수 (None이면 SCAN_RETENTION_MONTHS, 0이면 보관하지 않음)
+
+    Returns:
+        {"created": [...], "archived": {파티션: 세션 수}} (다른 워커가 실행 중이면 None)
+    """
+    if retention_months is None:
+        retention_months = settings.SCAN_RETENTION_MONTHS
+
+    with engine.connect() as conn:
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": RETENTION_LOCK_KEY}
+        ).scalar()
+        conn.commit()
+        if not locked:
+            logger.info("Retention job is already running on another worker")
+            return None
+
+        try:
+            created = ensure_partitions(conn)
+
+            archived = {}
+            pending = _detached_partitions(conn)
+            if retention_months > 0:
+                # cutoff 이전에 끝나는 파티션 (현재 달 + 이전 retention_months개월은 유지)
+                cutoff = add_months(current_month(), -retention_months)
+                pending += [
+                    name for month, name in sorted(list_partitions(conn).items())
+                    if add_months(month, 1) <= cutoff
+                ]
+            for name in pending:
+                archived[name] = archive_partition(conn, name)
+
+            return {"created": created, "archived": archived}
+        finally:
+            # 실패한 트랜잭션이 남아 있으면 되돌린 뒤 잠금 해제 (세션 수준 잠금은 롤백돼도 유지됨)
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": RETENTION_LOCK_KEY})
+            conn.commit()
+
+
+async def run_periodically() -> None:
+    """SCAN_RETENTION_INTERVAL_HOURS마다 run_retention 실행 (앱 시작 시 한 번 먼저 실행)"""
+    interval = settings.SCAN_RETENTION_INTERVAL_HOURS * 3600
+    while True:
+        try:
+            await asyncio.to_thread(run_retention)
+        except Exception as e:
+            logger.error(f"Retention job failed: {e}", exc_info=True)
+        await asyncio.sleep(interval)
+
+
+def list_archives() -> List[dict]:
+    """보관 파일 목록 (월 오름차순)"""
+    archive_dir = Path(settings.SCAN_ARCHIVE_DIR)
+    if not archive_dir.is_dir():
+        return []
+
+    archives = []
+    for path in sorted(archive_dir.glob(f"{PARENT_TABLE}_p*{ARCHIVE_SUFFIX}")):
+        month = partition_month(path.name[: -len(ARCHIVE_SUFFIX)])
+        if month is None:
+            continue
+        stat = path.stat()
+        archives.append({
+            "month": month,
+            "size_bytes": stat.st_size,
+            "archived_at": datetime.utcfromtimestamp(stat.st_mtime),
+        })
+    return archives
+
+
+def iter_archived_sessions(
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None,
+    session_id: Optional[str] = None,
+    target: Optional[str] = None,
+    status: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    보관된 세션 조회 (월 범위에 해당하는 파일만 읽음)
+
+    session_id/target 조건은 JSON을 파싱하기 전에 문자열 포함 여부로 먼저 거른다.
+    월 범위 없이 session_id(UUIDv7)로 찾으면 ID의 생성 시각으로 읽을 파일을 정한다.
+    """
+    needles = [value for value in (session_id, target) if value]
+    bounds = created_at_range(session_id) if session_id else None
+    if bounds is not None and month_from is None and month_to is None:
+        month_from, month_to = (bound.date().replace(day=1) for bound in bounds)
+
+    for archive in list_archives():
+        month = archive["month"]
+        if month_from is not None and month < month_from:
+            continue
+        if month_to is not None and month > month_to:
+            continue
+
+        with gzip.open(archive_path(partition_name(month)), "rt", encoding="utf-8") as f:
+            for line in f:
+                if any(needle not in line for needle in needles):
+                    continue
+                record = json.loads(line)
+                if session_id and record["session_id"] != session_id:
+                    continue
+                if target and record["target"] != target:
+                    continue
+                if status and record["status"] != status:
+                    continue
+                yield record
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.logging import setup_logging
+
+    parser = argparse.ArgumentParser(description="scan_sessions 파티션 생성 및 보관")
+    parser.add_argument(
+        "--retention-months", type=int, default=None,
+        help="유지할 개월 수 (기본: SCAN_RETENTION_MONTHS, 0이면 보관하지 않음)",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    print(json.dumps(run_retention(args.retention_months), ensure_ascii=False, indent=2))
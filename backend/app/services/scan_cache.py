@@ -0,0 +1,74 @@
+"""
+스캔 상태/결과 read-through 캐시
+
+- 상태: 짧은 TTL(STATUS_CACHE_TTL). 워커가 진행 이벤트를 발행할 때 갱신하고,
+  종료 이벤트에서는 지워서 다음 조회가 DB의 최종 값을 읽게 한다.
+- 결과: 완료된 스캔의 결과는 바뀌지 않으므로 긴 TTL(RESULT_CACHE_TTL).
+  취소/타임아웃된 부분 결과는 재개로 바뀔 수 있어 캐시하지 않는다.
+- 삭제/재개/취소 시 해당 세션의 항목을 지운다.
+
+값은 응답 JSON 문자열 그대로 저장해 캐시 적중 시 직렬화를 다시 하지 않는다.
+"""
+import json
+import logging
+from typing import Optional
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.events import TERMINAL_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+def status_key(session_id: str) -> str:
+    return f"scan:status:{session_id}"
+
+
+def result_key(session_id: str) -> str:
+    return f"scan:result:{session_id}"
+
+
+def get_status(session_id: str) -> Optional[str]:
+    """캐시된 상태 응답 JSON (없으면 None)"""
+    return get_cache().get(status_key(session_id))
+
+
+def set_status(session_id: str, body: str) -> None:
+    get_cache().set(status_key(session_id), body, settings.STATUS_CACHE_TTL)
+
+
+def get_result(session_id: str) -> Optional[str]:
+    """캐시된 결과 응답 JSON (없으면 None)"""
+    return get_cache().get(result_key(session_id))
+
+
+def set_result(session_id: str, body: str) -> None:
+    get_cache().set(result_key(session_id), body, settings.RESULT_CACHE_TTL)
+
+
+def invalidate(session_id: str) -> None:
+    """세션의 상태/결과 캐시 삭제"""
+    get_cache().delete(status_key(session_id), result_key(session_id))
+
+
+def refresh_status_from_event(event: dict) -> None:
+    """
+    진행 이벤트로 상태 캐시 갱신 (워커 스레드에서 DB 반영 후 호출)
+
+    종료 이벤트에는 진행 단계/에러 등 일부 값이 없으므로 항목을 지운다.
+    """
+    session_id = event["session_id"]
+    if event["type"] in TERMINAL_EVENTS:
+        get_cache().delete(status_key(session_id))
+        return
+
+    if "status" not in event:
+        return
+    body = json.dumps({
+        "session_id": session_id,
+        "status": event["status"],
+        "progress": event.get("progress", 0),
+        "current_step": event.get("step"),
+        "error": None,
+    }, separators=(",", ":"))
+    set_status(session_id, body)
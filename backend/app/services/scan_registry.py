@@ -0,0 +1,222 @@
+"""
+진행 중인 스캔 레지스트리 (single-flight)
+
+같은 (target, scan_type) 스캔이 동시에 여러 번 실행되지 않도록
+실행 중인 세션 ID를 등록한다.
+- memory: 단일 프로세스용
+- redis: SET NX + TTL로 여러 API 워커 간 공유
+
+워커 풀 대기열에서 오래 기다리는 스캔(대량 배치 등)의 키가 만료되지 않도록
+Redis 레지스트리는 이 프로세스가 가진 키의 TTL을 주기적으로 갱신한다 (워커가 죽으면 TTL로 정리).
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 워커가 비정상 종료돼도 키가 영원히 남지 않도록 SCAN_TIMEOUT보다 약간 길게 유지
+REGISTRY_TTL_MARGIN_SECONDS = 60
+
+# 소유 세션 행이 이 시간이 지나도 없으면 생성에 실패한 것으로 보고 해제한다
+# (획득 직후 세션을 INSERT하기 전까지는 행이 없는 것이 정상)
+REGISTRY_CLAIM_GRACE_SECONDS = 10
+
+# 소유자가 자신일 때만 삭제 (다른 세션이 다시 등록한 키를 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 소유자가 자신일 때만 TTL 갱신
+_REFRESH_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 여러 키를 한 번에 획득 (키마다 SET NX, 실패하면 현재 소유자, 성공하면 빈 문자열)
+_CLAIM_MANY_SCRIPT = """
+local owners = {}
+for i, key in ipairs(KEYS) do
+    if redis.call('set', key, ARGV[i], 'NX', 'EX', ARGV[#KEYS + 1]) then
+        owners[i] = ''
+    else
+        owners[i] = redis.call('get', key)
+    end
+end
+return owners
+"""
+
+# (target, scan_type, session_id)
+Claim = Tuple[str, str, str]
+
+
+def registry_key(target: str, scan_type: str) -> str:
+    """레지스트리 키 ("scan:inflight:<target>:<scan_type>")"""
+    return f"scan:inflight:{target.strip().lower()}:{scan_type}"
+
+
+class InProcessScanRegistry:
+    """프로세스 내부 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owners: Dict[str, Tuple[str, float]] = {}  # 키 -> (세션 ID, 획득 시각)
+
+    def claim(self, target: str, scan_type: str, session_id: str) -> Optional[str]:
+        """
+        스캔 소유권 획득 시도
+
+        Returns:
+            이미 실행 중인 세션 ID (획득에 성공하면 None)
+        """
+        return self.claim_many([(target, scan_type, session_id)])[0]
+
+    def claim_many(self, claims: List[Claim]) -> List[Optional[str]]:
+        """여러 (target, scan_type) 소유권을 한 번에 획득 (claims 순서대로 claim() 결과)"""
+        now = time.monotonic()
+        owners = []
+        with self._lock:
+            for target, scan_type, session_id in claims:
+                key = registry_key(target, scan_type)
+                owner = self._owners.get(key)
+                if owner is None:
+                    self._owners[key] = (session_id, now)
+                owners.append(owner[0] if owner else None)
+        return owners
+
+    def refresh(self, target: str, scan_type: str, session_id: str) -> None:
+        """만료가 없으므로 할 일이 없다"""
+
+    def age(self, target: str, scan_type: str) -> Optional[float]:
+        """현재 소유자가 획득한 뒤 지난 시간 (초, 소유자가 없으면 None)"""
+        with self._lock:
+            owner = self._owners.get(registry_key(target, scan_type))
+        return time.monotonic() - owner[1] if owner else None
+
+    def release(self, target: str, scan_type: str, session_id: str) -> None:
+        key = registry_key(target, scan_type)
+        with self._lock:
+            owner = self._owners.get(key)
+            if owner is not None and owner[0] == session_id:
+                del self._owners[key]
+
+
+class RedisScanRegistry:
+    """Redis 기반 레지스트리 (여러 API 워커 간 공유)"""
+
+    def __init__(self):
+        self.ttl = settings.SCAN_TIMEOUT + REGISTRY_TTL_MARGIN_SECONDS
+        # TTL의 1/3마다 갱신 (갱신이 한두 번 실패해도 만료되지 않도록)
+        self.refresh_interval = self.ttl / 3
+        self._lock = threading.Lock()
+        self._held: Dict[str, str] = {}  # 이 프로세스가 가진 키 -> 세션 ID
+        self._keepalive: Optional[threading.Thread] = None
+
+    def claim(self, target: str, scan_type: str, session_id: str) -> Optional[str]:
+        return self.claim_many([(target, scan_type, session_id)])[0]
+
+    def claim_many(self, claims: List[Claim]) -> List[Optional[str]]:
+        """여러 (target, scan_type) 소유권을 스크립트 한 번(왕복 1회)으로 획득"""
+        from app.core.redis import get_redis
+
+        if not claims:
+            return []
+        keys = [registry_key(target, scan_type) for target, scan_type, _ in claims]
+        session_ids = [session_id for _, _, session_id in claims]
+        owners = get_redis().eval(_CLAIM_MANY_SCRIPT, len(keys), *keys, *session_ids, self.ttl)
+
+        acquired = {key: session_id for key, session_id, owner in zip(keys, session_ids, owners) if not owner}
+        if acquired:
+            self._hold(acquired)
+        return [owner or None for owner in owners]
+
+    def refresh(self, target: str, scan_type: str, session_id: str) -> None:
+        """키 TTL을 처음부터 다시 시작 (워커가 스캔을 시작할 때 호출)"""
+        from app.core.redis import get_redis
+
+        try:
+            get_redis().eval(_REFRESH_SCRIPT, 1, registry_key(target, scan_type), session_id, self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to refresh in-flight scan {session_id}: {e}")
+
+    def age(self, target: str, scan_type: str) -> Optional[float]:
+        """현재 소유자가 키를 마지막으로 획득/갱신한 뒤 지난 시간 (초, 키가 없으면 None)"""
+        from app.core.redis import get_redis
+
+        remaining = get_redis().ttl(registry_key(target, scan_type))
+        return self.ttl - remaining if remaining >= 0 else None
+
+    def release(self, target: str, scan_type: str, session_id: str) -> None:
+        from app.core.redis import get_redis
+
+        key = registry_key(target, scan_type)
+        with self._lock:
+            if self._held.get(key) == session_id:
+                del self._held[key]
+        try:
+            get_redis().eval(_RELEASE_SCRIPT, 1, key, session_id)
+        except Exception as e:
+            # TTL로 결국 정리되므로 경고만 남긴다
+            logger.warning(f"Failed to release in-flight scan {session_id}: {e}")
+
+    def _hold(self, acquired: Dict[str, str]) -> None:
+        """획득한 키를 TTL 갱신 대상에 추가 (갱신 스레드는 처음 획득할 때 시작)"""
+        with self._lock:
+            self._held.update(acquired)
+            if self._keepalive is None:
+                self._keepalive = threading.Thread(
+                    target=self._refresh_loop, name="scan-registry-keepalive", daemon=True
+                )
+                self._keepalive.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                self._refresh_held()
+            except Exception as e:
+                logger.warning(f"Failed to refresh in-flight scan keys: {e}")
+
+    def _refresh_held(self) -> None:
+        """가진 키의 TTL을 파이프라인 한 번으로 갱신 (다른 세션에 넘어간 키는 목록에서 뺀다)"""
+        from app.core.redis import get_redis
+
+        with self._lock:
+            held = list(self._held.items())
+        if not held:
+            return
+
+        pipeline = get_redis().pipeline(transaction=False)
+        for key, session_id in held:
+            pipeline.eval(_REFRESH_SCRIPT, 1, key, session_id, self.ttl)
+        lost = [(key, session_id) for (key, session_id), ok in zip(held, pipeline.execute()) if not ok]
+
+        with self._lock:
+            for key, session_id in lost:
+                if self._held.get(key) == session_id:
+                    del self._held[key]
+        for key, session_id in lost:
+            logger.warning(f"In-flight scan key {key} is no longer held by session {session_id}")
+
+
+_registry = None
+
+
+def get_scan_registry():
+    """설정된 스캔 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        if settings.SCAN_REGISTRY_BACKEND == "redis":
+            _registry = RedisScanRegistry()
+        else:
+            _registry = InProcessScanRegistry()
+        logger.info(f"Scan registry initialized: {settings.SCAN_REGISTRY_BACKEND}")
+    return _registry
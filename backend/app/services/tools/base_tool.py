@@ -0,0 +1,67 @@
+"""
+스캔 도구 기반 클래스
+
+외부 프로그램을 서브프로세스로 실행하면서 취소 요청과 기한을 주기적으로 확인하고,
+취소되거나 기한이 지나면 프로세스를 바로 종료한다.
+"""
+import logging
+import subprocess
+import time
+from typing import List, Optional, Tuple
+
+from app.services.cancellation import CancellationToken, ScanTimedOut
+
+logger = logging.getLogger(__name__)
+
+
+class BaseTool:
+    """스캔 도구 기반 클래스"""
+
+    name = "tool"
+
+    # 서브프로세스 실행 중 취소 여부를 확인하는 주기 (초)
+    poll_interval = 0.2
+
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        self.cancel_token = cancel_token
+
+    def _run_process(self, args: List[str], timeout: Optional[float] = None) -> Tuple[str, str]:
+        """
+        서브프로세스 실행
+
+        Args:
+            args: 실행할 명령
+            timeout: 이 호출의 제한 시간 (초, None이면 토큰의 기한만 적용)
+
+        Returns:
+            (stdout, stderr)
+
+        Raises:
+            ScanCancelled: 실행 중 취소된 경우
+            ScanTimedOut: 제한 시간 또는 스캔 기한을 넘긴 경우
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+        try:
+            while True:
+                try:
+                    # 시간 초과 후 다시 호출해도 출력은 유실되지 않는다
+                    return process.communicate(timeout=self.poll_interval)
+                except subprocess.TimeoutExpired:
+                    pass
+
+                if self.cancel_token is not None:
+                    self.cancel_token.check()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise ScanTimedOut(f"{self.name} timed out after {timeout:.0f}s")
+        finally:
+            if process.poll() is None:
+                logger.info(f"Killing {self.name} process {process.pid}")
+                process.kill()
+                process.communicate()
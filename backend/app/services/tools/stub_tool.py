@@ -0,0 +1,95 @@
+"""
+가짜 포트 스캐너 (SCANNER_BACKEND=stub)
+
+nmap을 실행하지 않고 대상별로 정해진 열린 포트를 돌려준다 (부하 테스트/로컬 개발용).
+호출마다 STUB_SCANNER_DELAY_MS만큼 지연하며, 그동안 취소 요청과 기한을 확인한다.
+"""
+import random
+import time
+from typing import Dict, List, Optional
+
+from app.core import metrics, tracing
+from app.core.config import settings
+from app.services.cancellation import ScanTimedOut
+from app.services.tools.base_tool import BaseTool
+
+# 열릴 수 있는 포트와 서비스 (취약점 분석 휴리스틱이 반응하는 서비스 포함)
+COMMON_PORTS = {
+    21: ("ftp", "vsftpd 3.0.3"),
+    22: ("ssh", "OpenSSH 8.9p1"),
+    23: ("telnet", ""),
+    25: ("smtp", "Postfix smtpd"),
+    53: ("domain", "dnsmasq 2.86"),
+    80: ("http", "nginx 1.24.0"),
+    110: ("pop3", "Dovecot pop3d"),
+    139: ("netbios-ssn", "Samba smbd 4"),
+    443: ("https", "nginx 1.24.0"),
+    445: ("microsoft-ds", "Samba smbd 4"),
+    3306: ("mysql", "MySQL 8.0.36"),
+    3389: ("ms-wbt-server", ""),
+    5432: ("postgresql", "PostgreSQL 16.2"),
+    6379: ("redis", "Redis 7.2.4"),
+    8080: ("http-proxy", "Apache Tomcat 9.0"),
+    27017: ("mongodb", "MongoDB 7.0.5"),
+}
+
+
+def stub_open_ports(target: str) -> List[int]:
+    """대상의 열린 포트 (같은 대상이면 항상 같다)"""
+    rng = random.Random(target)
+    return sorted(rng.sample(sorted(COMMON_PORTS), rng.randint(2, 6)))
+
+
+class StubScannerTool(BaseTool):
+    """NmapTool과 같은 scan_ports 인터페이스의 가짜 스캐너"""
+
+    name = "stub"
+
+    def scan_ports(
+        self,
+        target: str,
+        ports: str,
+        arguments: str = "",
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        포트 범위 스캔 (범위 안의 정해진 열린 포트)
+
+        Returns:
+            열린 포트 목록 [{port, state, service, version}]
+        """
+        low, _, high = ports.partition("-")
+        low, high = int(low), int(high or low)
+        attributes = {"scanner.target": target, "scanner.ports": ports, "scanner.arguments": arguments}
+        with tracing.span(self.name, attributes) as scan_span:
+            started = time.perf_counter()
+            self._wait(settings.STUB_SCANNER_DELAY_MS / 1000, timeout)
+            metrics.SCANNER_DURATION.labels(self.name).observe(time.perf_counter() - started)
+            metrics.SCANNER_PORTS.labels(self.name).inc(metrics.count_ports(ports))
+
+            found = [
+                {
+                    "port": port,
+                    "state": "open",
+                    "service": COMMON_PORTS[port][0],
+                    "version": COMMON_PORTS[port][1],
+                }
+                for port in stub_open_ports(target)
+                if low <= port <= high
+            ]
+            scan_span.set_attribute("scanner.open_ports", len(found))
+        return found
+
+    def _wait(self, seconds: float, timeout: Optional[float]) -> None:
+        """nmap 실행 대신 지연 (poll_interval마다 취소/기한 확인)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        end = time.monotonic() + seconds
+        while True:
+            if self.cancel_token is not None:
+                self.cancel_token.check()
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise ScanTimedOut(f"{self.name} timed out after {timeout:.0f}s")
+            if now >= end:
+                return
+            time.sleep(min(self.poll_interval, end - now))
@@ -0,0 +1,3 @@
+"""
+성능 측정 스크립트 (backend 디렉토리에서 python -m benchmarks.<이름>으로 실행)
+"""
@@ -0,0 +1,143 @@
+"""
+API 프로세스 import 시간 측정 (콜드 스타트 예산)
+
+`python -X importtime -c "import app.main"`을 새 프로세스에서 --repeat번 실행해
+app.main import 시간(중앙값)과 많이 걸린 최상위 패키지를 APP_PROFILE별로 보고한다.
+
+- --budget-ms를 넘는 프로필이 있으면 종료 코드 1
+- LangGraph/LangChain 등 첫 스캔에서 로드해야 하는 모듈(LAZY_MODULES)이 import 시점에
+  로드되면 프로필과 관계없이 종료 코드 1 (어떤 모듈이 끌어왔는지 함께 출력)
+
+측정 프로세스는 현재 환경 변수(DATABASE_URL 등)를 그대로 사용하며 DB에 연결하지 않는다.
+
+    cd backend
+    python -m benchmarks.import_time --profiles api,full --budget-ms 1500 --json bench-import.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+# import 시점에 로드되면 안 되는 패키지 (첫 스캔/LLM 호출에서 로드)
+LAZY_MODULES = ("langgraph", "langchain_core", "langchain_openai", "langsmith", "openai", "nmap")
+
+
+def parse_importtime(stderr: str) -> list:
+    """-X importtime 출력 -> [(모듈, self_us, cumulative_us, 깊이)] (로드 순서)"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def _importer(rows: list, index: int) -> str:
+    """
+    rows[index] 모듈을 끌어온 가장 가까운 app 모듈 (없으면 최상위 모듈)
+
+    출력은 자식이 부모보다 먼저 나오므로 뒤쪽에서 깊이가 얕은 줄을 차례로 따라간다.
+    """
+    depth = rows[index][3]
+    importer = "-"
+    for name, _, _, parent_depth in rows[index + 1:]:
+        if parent_depth < depth:
+            depth = parent_depth
+            importer = name
+            if name.startswith("app."):
+                break
+    return importer
+
+
+def measure(profile: str) -> list:
+    env = dict(os.environ, APP_PROFILE=profile)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app.main failed ({profile}): {result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def summarize(runs: list, top: int) -> dict:
+    """여러 번 측정한 결과 요약 (패키지별 self 시간 합계는 마지막 측정 기준)"""
+    totals = []
+    for rows in runs:
+        totals.append(next(cumulative for name, _, cumulative, _ in rows if name == "app.main") / 1000)
+
+    rows = runs[-1]
+    packages = {}
+    for name, self_us, _, _ in rows:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    lazy_loaded = []
+    for index, (name, _, cumulative, _) in enumerate(rows):
+        if name in LAZY_MODULES:
+            lazy_loaded.append({"module": name, "ms": round(cumulative / 1000, 1), "imported_by": _importer(rows, index)})
+
+    return {
+        "import_ms": round(statistics.median(totals), 1),
+        "import_ms_all": [round(total, 1) for total in totals],
+        "modules": len(rows),
+        "packages": [{"package": name, "self_ms": round(us / 1000, 1)} for name, us in heaviest],
+        "lazy_modules_loaded": lazy_loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 프로세스 import 시간 측정")
+    parser.add_argument("--profiles", default="api,full", help="쉼표로 구분한 APP_PROFILE")
+    parser.add_argument("--repeat", type=int, default=5, help="프로필별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 패키지 수")
+    parser.add_argument("--budget-ms", type=float, help="import 시간 상한 (넘으면 종료 코드 1)")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for profile in [name.strip() for name in args.profiles.split(",") if name.strip()]:
+        summary = summarize([measure(profile) for _ in range(args.repeat)], args.top)
+        results[profile] = summary
+
+        print(f"--- APP_PROFILE={profile}: import app.main {summary['import_ms']:.0f}ms "
+              f"(median of {args.repeat}, {summary['modules']} modules)")
+        for package in summary["packages"]:
+            print(f"{package['package']:>24} {package['self_ms']:>8.1f}ms")
+        for loaded in summary["lazy_modules_loaded"]:
+            failures.append(f"{profile}: {loaded['module']} loaded at import time (imported by {loaded['imported_by']})")
+        if args.budget_ms and summary["import_ms"] > args.budget_ms:
+            failures.append(f"{profile}: import {summary['import_ms']:.0f}ms > budget {args.budget_ms:.0f}ms")
+
+    if args.json:
+        environment = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"benchmark": "import_time", "environment": environment, "args": vars(args), "profiles": results},
+                f,
+                indent=2,
+            )
+
+    for failure in failures:
+        print(f"BUDGET {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
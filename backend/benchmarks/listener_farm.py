@@ -0,0 +1,128 @@
+"""
+벤치마크용 로컬 TCP 리스너 묶음
+
+- 열린 포트: listen만 하는 소켓 (연결은 커널이 backlog에서 완료하므로 accept하지 않는다)
+- 응답하지 않는 포트(filtered): backlog 0으로 listen하고 연결 하나로 accept 큐를 채운다.
+  큐가 가득 찬 리스너로 오는 SYN은 커널이 버리므로 방화벽 DROP 규칙 없이 응답 없는 포트가 된다
+  (nmap은 재전송 후 filtered로 판정).
+- 나머지 포트는 닫힘 (RST)
+
+이미 다른 프로세스가 listen 중인 포트는 건드리지 않고 foreign으로 따로 기록한다
+(새 네트워크 네임스페이스에서 실행하면 비어 있다).
+"""
+import random
+import resource
+import socket
+from pathlib import Path
+from typing import List, Set
+
+# /proc/net/tcp의 LISTEN 상태
+TCP_LISTEN = "0A"
+
+
+def listening_ports() -> Set[int]:
+    """현재 네임스페이스에서 listen 중인 TCP 포트 (/proc/net/tcp, tcp6)"""
+    ports = set()
+    for name in ("tcp", "tcp6"):
+        path = Path("/proc/net") / name
+        if not path.exists():
+            continue
+        for line in path.read_text().splitlines()[1:]:
+            fields = line.split()
+            if fields[3] == TCP_LISTEN:
+                ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+    return ports
+
+
+def ports_in_range(ports: Set[int], port_range: str) -> Set[int]:
+    """"1-10000" 범위에 드는 포트"""
+    low, _, high = port_range.partition("-")
+    low, high = int(low), int(high or low)
+    return {port for port in ports if low <= port <= high}
+
+
+def raise_fd_limit(needed: int) -> int:
+    """열린 파일 수 제한을 hard 제한까지 올린다 (부족하면 ValueError)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        soft = hard if hard == resource.RLIM_INFINITY else min(hard, max(needed, soft))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        raise ValueError(f"Need {needed} file descriptors, RLIMIT_NOFILE hard limit is {hard}")
+    return soft
+
+
+class ListenerFarm:
+    """
+    열린 포트 open_count개와 응답하지 않는 포트 filtered_count개를 port_range 안에 무작위로 배치
+
+        with ListenerFarm("127.0.0.1", 2000, 200) as farm:
+            farm.open, farm.filtered, farm.foreign
+
+    1024 미만 포트는 root가 아니면 bind할 수 없어 건너뛴다 (그만큼 다른 포트에 배치).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        open_count: int,
+        filtered_count: int,
+        port_range: tuple = (1, 65535),
+        seed: int = 0,
+    ):
+        self.host = host
+        self.open_count = open_count
+        self.filtered_count = filtered_count
+        self.port_range = port_range
+        self.seed = seed
+        self.open: Set[int] = set()
+        self.filtered: Set[int] = set()
+        self.foreign: Set[int] = set()
+        self._sockets: List[socket.socket] = []
+
+    def __enter__(self) -> "ListenerFarm":
+        raise_fd_limit(self.open_count + 2 * self.filtered_count + 256)
+        self.foreign = listening_ports()
+
+        low, high = self.port_range
+        candidates = [port for port in range(low, high + 1) if port not in self.foreign]
+        random.Random(self.seed).shuffle(candidates)
+
+        try:
+            for port in candidates:
+                if len(self.open) < self.open_count:
+                    if self._listen(port, backlog=128):
+                        self.open.add(port)
+                elif len(self.filtered) < self.filtered_count:
+                    if self._listen(port, backlog=0):
+                        self.filtered.add(port)
+                else:
+                    break
+
+            # 리스너를 모두 만든 뒤 채운다 (채우는 연결의 임시 포트가 리스너 포트와 겹치지 않도록)
+            for port in self.filtered:
+                filler = socket.create_connection((self.host, port), timeout=5)
+                self._sockets.append(filler)
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _listen(self, port: int, backlog: int) -> bool:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.bind((self.host, port))
+        except OSError:
+            sock.close()
+            return False
+        sock.listen(backlog)
+        self._sockets.append(sock)
+        return True
+
+    def close(self) -> None:
+        for sock in self._sockets:
+            sock.close()
+        self._sockets.clear()
@@ -0,0 +1,435 @@
+"""
+API 부하 테스트 (가짜 LLM + stub 스캐너 + 로컬 Postgres)
+
+OpenAI 할당량이나 실제 nmap 없이 API 서버의 처리 용량을 측정한다.
+서버는 LLM_PROVIDER=fake, SCANNER_BACKEND=stub으로 직접 띄우고(--base-url을 주면 이미 떠 있는 서버 사용),
+목표 RPS로 다음 요청을 섞어 보낸다 (open loop: 응답이 늦어도 요청 간격은 유지).
+
+- scan:     POST /api/v1/langgraph/scan (요청마다 다른 10.x 대상, 진행 중 스캔 합류 없음)
+- status:   GET  /api/v1/langgraph/scan/{id} (진행 중인 스캔을 돌아가며 폴링)
+- sessions: GET  /api/v1/langgraph/sessions
+- chat:     POST /api/v1/chat/completions (스캔 완료까지 대기하는 동기 경로)
+
+엔드포인트별 p50/p95/p99/최대 지연과 오류율, 폴링으로 확인한 스캔 완료 시간(scan_completion)을 보고한다.
+--rps에 여러 값을 주면 단계별로 차례대로 측정한다 (용량 산정용).
+--max-p99-ms / --max-error-rate를 넘는 단계가 있으면 종료 코드 1.
+
+--local-postgres는 initdb/pg_ctl로 임시 클러스터를 만들고 마이그레이션을 적용한다
+(PATH에 PostgreSQL 서버 바이너리 필요, 끝나면 삭제). 모델이 JSONB/파티션 테이블을 쓰므로 SQLite는 지원하지 않는다.
+
+    cd backend
+    python -m benchmarks.load --local-postgres --rps 5,10,20 --duration 30 --json bench-load.json
+    python -m benchmarks.load --base-url http://localhost:8000 --rps 10 --mix scan=1,status=5,sessions=2,chat=0
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime
+
+import httpx
+
+ACTIONS = ("scan", "status", "sessions", "chat")
+DEFAULT_MIX = "scan=1,status=6,sessions=2,chat=1"
+TERMINAL_STATUSES = {"completed", "failed", "cancelled", "timed_out"}
+
+
+def parse_mix(value: str) -> dict:
+    """"scan=1,status=6" 형태의 요청 비율"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown request type: {name} (available: {', '.join(ACTIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def percentile(values: list, q: float) -> float:
+    """정렬된 값의 q 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(predicate, timeout: float, what: str) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"{what} did not become ready within {timeout:.0f}s")
+
+
+class LocalPostgres:
+    """initdb로 만든 임시 Postgres 클러스터 (unix 소켓만 사용, 종료 시 삭제)"""
+
+    def __init__(self):
+        self.directory = None
+        self.url = None
+
+    def __enter__(self) -> "LocalPostgres":
+        if shutil.which("initdb") is None or shutil.which("pg_ctl") is None:
+            raise RuntimeError("--local-postgres needs initdb and pg_ctl on PATH")
+        self.directory = tempfile.mkdtemp(prefix="3vi-load-pg-")
+        data = os.path.join(self.directory, "data")
+        try:
+            self._run(["initdb", "-D", data, "-U", "postgres", "--auth=trust", "--no-sync"])
+            self._run([
+                "pg_ctl", "-D", data, "-l", os.path.join(self.directory, "postgres.log"), "-w",
+                "-o", f"-k {self.directory} -c listen_addresses='' -c fsync=off -c max_connections=300",
+                "start",
+            ])
+        except BaseException:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            raise
+        self.url = f"postgresql://postgres@/postgres?host={self.directory}"
+        return self
+
+    @staticmethod
+    def _run(command: list) -> None:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            # initdb는 root로 실행할 수 없다 (일반 사용자로 실행)
+            raise RuntimeError(f"{command[0]} failed: {result.stderr.strip()}")
+
+    def __exit__(self, *exc):
+        subprocess.run(
+            ["pg_ctl", "-D", os.path.join(self.directory, "data"), "-m", "immediate", "stop"],
+            capture_output=True,
+        )
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class ServerProcess:
+    """가짜 LLM/stub 스캐너 설정으로 uvicorn 실행"""
+
+    def __init__(self, env: dict, workers: int):
+        self.env = env
+        self.workers = workers
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+
+    def __enter__(self) -> "ServerProcess":
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(self.port),
+                "--workers", str(self.workers), "--no-access-log",
+            ],
+            env=self.env,
+        )
+        try:
+            _wait_for(self._healthy, 60, "API server")
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def _healthy(self) -> bool:
+        if self.process.poll() is not None:
+            raise RuntimeError(f"API server exited with code {self.process.returncode}")
+        try:
+            return httpx.get(f"{self.base_url}/api/v1/health", timeout=1).status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    def __exit__(self, *exc):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def migrate(database_url: str) -> None:
+    """alembic upgrade head"""
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, DATABASE_URL=database_url),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"alembic upgrade failed: {result.stderr.strip()}")
+
+
+class LoadRun:
+    """한 단계(목표 RPS)의 요청 생성과 결과 수집"""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random, target_offset: int, args):
+        self.client = client
+        self.rng = rng
+        self.args = args
+        self.samples = {}  # 요청 유형 -> [(지연 ms, 오류 여부, 상태 코드)]
+        self.active = {}  # 폴링할 세션 ID -> 스캔 요청 시각
+        self.skipped = 0
+        self.max_lag_ms = 0.0
+        self._next_target = target_offset
+        self._poll_order = []
+
+    def _target(self) -> str:
+        index = self._next_target
+        self._next_target += 1
+        return f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+    def _record(self, name: str, started: float, error: bool, status_code) -> None:
+        latency = (time.perf_counter() - started) * 1000
+        self.samples.setdefault(name, []).append((latency, error, status_code))
+
+    async def _request(self, name: str, method: str, path: str, failed=None, **kwargs):
+        """요청 하나를 보내고 기록 (failed(response)가 참이면 2xx여도 오류로 기록)"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            self._record(name, started, True, type(e).__name__)
+            return None
+        error = response.is_error or (failed is not None and failed(response))
+        self._record(name, started, error, response.status_code)
+        return response
+
+    async def scan(self) -> None:
+        requested = time.perf_counter()
+        response = await self._request(
+            "scan",
+            "POST",
+            "/api/v1/langgraph/scan",
+            json={"target": self._target(), "scan_type": self.args.scan_type},
+        )
+        if response is not None and not response.is_error:
+            session_id = response.json()["session_id"]
+            self.active[session_id] = requested
+            self._poll_order.append(session_id)
+
+    async def status(self) -> None:
+        # 진행 중인 스캔을 오래된 순서로 돌아가며 폴링
+        while self._poll_order and self._poll_order[0] not in self.active:
+            self._poll_order.pop(0)
+        if not self._poll_order:
+            self.skipped += 1
+            return
+        session_id = self._poll_order.pop(0)
+        self._poll_order.append(session_id)
+
+        response = await self._request("status", "GET", f"/api/v1/langgraph/scan/{session_id}")
+        if response is None or response.is_error:
+            return
+        scan_status = response.json()["status"]
+        requested = self.active.get(session_id)
+        if scan_status in TERMINAL_STATUSES and requested is not None:
+            del self.active[session_id]
+            self._record("scan_completion", requested, scan_status != "completed", scan_status)
+
+    async def sessions(self) -> None:
+        await self._request("sessions", "GET", "/api/v1/langgraph/sessions", params={"limit": 50})
+
+    async def chat(self) -> None:
+        # 스캔 실패도 200으로 답하므로 응답 내용으로 판정
+        await self._request(
+            "chat",
+            "POST",
+            "/api/v1/chat/completions",
+            failed=lambda response: not response.json()["choices"][0]["message"]["content"].startswith("✅"),
+            json={
+                "model": "3vi-scanner",
+                "messages": [{"role": "user", "content": f"{self._target()} {self.args.scan_type} 스캔해줘"}],
+            },
+        )
+
+    async def run(self, rps: float, duration: float, mix: dict) -> float:
+        """open loop로 rps × duration개 요청을 보내고 응답을 모두 기다린다 (실제 소요 시간 반환)"""
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        total = int(rps * duration)
+        tasks = []
+        started = time.perf_counter()
+        for index in range(total):
+            delay = started + index / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.max_lag_ms = max(self.max_lag_ms, -delay * 1000)
+            action = getattr(self, self.rng.choices(names, weights)[0])
+            tasks.append(asyncio.create_task(action()))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            latencies = sorted(latency for latency, _, _ in samples)
+            errors = sum(1 for _, error, _ in samples if error)
+            codes = {}
+            for _, _, status_code in samples:
+                codes[str(status_code)] = codes.get(str(status_code), 0) + 1
+            endpoints[name] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4),
+                "p50_ms": round(percentile(latencies, 50), 1),
+                "p95_ms": round(percentile(latencies, 95), 1),
+                "p99_ms": round(percentile(latencies, 99), 1),
+                "max_ms": round(latencies[-1], 1),
+                "status_codes": codes,
+            }
+        return {
+            "seconds": round(elapsed, 2),
+            "endpoints": endpoints,
+            "scans_unfinished": len(self.active),
+            "status_skipped": self.skipped,
+            "client_max_lag_ms": round(self.max_lag_ms, 1),
+        }
+
+
+async def run_stages(base_url: str, args) -> list:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    stages = []
+    # 단계마다 다른 대상 대역 (앞 단계의 진행 중 스캔에 합류하지 않도록)
+    target_offset = rng.randrange(1 << 20) << 4
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for rps in args.rps:
+            run = LoadRun(client, rng, target_offset, args)
+            elapsed = await run.run(rps, args.duration, args.mix)
+            # 남은 스캔은 완료까지 폴링 (scan_completion에 포함)
+            drain_deadline = time.monotonic() + args.drain
+            while run.active and time.monotonic() < drain_deadline:
+                await asyncio.gather(*(run.status() for _ in range(len(run.active))))
+                await asyncio.sleep(args.poll_interval)
+            target_offset = run._next_target
+
+            stage = {"target_rps": rps, **run.summary(elapsed)}
+            stages.append(stage)
+            print(f"--- {rps:g} rps for {args.duration:g}s ({stage['seconds']}s, client lag max {stage['client_max_lag_ms']}ms)")
+            for name, result in stage["endpoints"].items():
+                print(
+                    f"{name:>16}: {result['requests']:>6} req {result['rps']:>7.1f}/s "
+                    f"p50={result['p50_ms']:.0f}ms p95={result['p95_ms']:.0f}ms p99={result['p99_ms']:.0f}ms "
+                    f"max={result['max_ms']:.0f}ms errors={result['error_rate']:.2%}"
+                )
+            if stage["scans_unfinished"]:
+                print(f"{'':>16}  {stage['scans_unfinished']} scans still running after {args.drain:g}s drain")
+    return stages
+
+
+def check_slo(stages: list, max_p99_ms: float, max_error_rate: float) -> list:
+    """기준을 넘은 단계/엔드포인트 목록"""
+    violations = []
+    for stage in stages:
+        for name, result in stage["endpoints"].items():
+            where = f"{stage['target_rps']:g} rps {name}"
+            if max_p99_ms and result["p99_ms"] > max_p99_ms:
+                violations.append(f"{where}: p99 {result['p99_ms']:.0f}ms > {max_p99_ms:.0f}ms")
+            if max_error_rate is not None and result["error_rate"] > max_error_rate:
+                violations.append(f"{where}: error rate {result['error_rate']:.2%} > {max_error_rate:.2%}")
+    return violations
+
+
+def server_env(args, database_url: str) -> dict:
+    """가짜 LLM/stub 스캐너를 쓰는 서버 환경 변수 (--env로 덮어쓰기)"""
+    env = dict(
+        os.environ,
+        LLM_PROVIDER="fake",
+        FAKE_LLM_LATENCY_MS=str(args.llm_latency_ms),
+        FAKE_LLM_TOKEN_DELAY_MS=str(args.llm_token_delay_ms),
+        SCANNER_BACKEND="stub",
+        STUB_SCANNER_DELAY_MS=str(args.scan_delay_ms),
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-load-test"),
+        LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+    )
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    for item in args.env or []:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트 (가짜 LLM + stub 스캐너)")
+    parser.add_argument(
+        "--rps", type=lambda v: [float(x) for x in v.split(",")], default=[10.0],
+        help="목표 초당 요청 수 (쉼표로 여러 단계)",
+    )
+    parser.add_argument("--duration", type=float, default=30, help="단계별 측정 시간 (초)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"요청 비율 (기본: {DEFAULT_MIX})")
+    parser.add_argument("--scan-type", default="quick", choices=("quick", "standard", "full"))
+    parser.add_argument("--base-url", help="이미 실행 중인 서버 (주면 서버를 띄우지 않음)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--local-postgres", action="store_true", help="임시 Postgres 클러스터 사용 (initdb)")
+    parser.add_argument("--database-url", help="서버가 사용할 DATABASE_URL (기본: 현재 설정)")
+    parser.add_argument("--env", action="append", metavar="KEY=VALUE", help="서버 환경 변수 (여러 번 지정 가능)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="가짜 LLM 첫 토큰 지연")
+    parser.add_argument("--llm-token-delay-ms", type=float, default=10, help="가짜 LLM 토큰당 지연")
+    parser.add_argument("--scan-delay-ms", type=float, default=200, help="stub 스캐너 호출당 지연")
+    parser.add_argument("--connections", type=int, default=200, help="클라이언트 최대 연결 수")
+    parser.add_argument("--timeout", type=float, default=60, help="요청 제한 시간 (초)")
+    parser.add_argument("--drain", type=float, default=60, help="단계 종료 후 남은 스캔을 기다리는 시간 (초)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="drain 중 폴링 간격 (초)")
+    parser.add_argument("--seed", type=int, default=0, help="요청 순서/대상 시드")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--max-p99-ms", type=float, help="엔드포인트별 p99 상한 (넘으면 종료 코드 1)")
+    parser.add_argument("--max-error-rate", type=float, help="엔드포인트별 오류율 상한 (넘으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        base_url = args.base_url
+        if base_url is None:
+            database_url = args.database_url
+            if args.local_postgres:
+                database_url = stack.enter_context(LocalPostgres()).url
+                migrate(database_url)
+            server = stack.enter_context(ServerProcess(server_env(args, database_url), args.workers))
+            base_url = server.base_url
+        stages = asyncio.run(run_stages(base_url, args))
+
+    if args.json:
+        environment = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "spawned_server": args.base_url is None,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"benchmark": "load", "environment": environment, "args": vars(args), "stages": stages},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+
+    violations = check_slo(stages, args.max_p99_ms, args.max_error_rate)
+    for violation in violations:
+        print(f"SLO {violation}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
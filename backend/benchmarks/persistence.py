@@ -0,0 +1,162 @@
+"""
+스캔 결과 저장 경로 벤치마크 (건별 커밋 vs 묶음 저장)
+
+같은 합성 결과(포트/취약점)를 가진 세션 N개를 두 경로로 저장해 소요 시간을 비교한다.
+
+- per-row: 단건 스캔 워커와 같은 순서 (세션 생성, RUNNING, 진행률 갱신, 결과 저장을 각각 커밋)
+- bulk:    배치 스캔 워커와 같은 순서 (세션 multi-row INSERT/COPY, RUNNING은 건별,
+           진행률과 결과는 --batch-size 단위로 crud.update_scan_progress_bulk / save_scan_results_bulk)
+
+실제 행을 쓰고 끝나면 세션/관측 행은 지우지만 일별 집계(stats)에는 반영된 채로 남는다.
+운영 DB가 아닌 개발/측정용 DB에서 실행한다.
+
+    cd backend
+    python -m benchmarks.persistence --sessions 2000 --json bench-persistence.json
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete
+
+from app.core.database import SessionLocal
+from app.models import crud
+from app.models.scan_findings import ScanFinding, ScanPort
+from app.models.scan_session import ScanSession, ScanStatus, ScanType
+
+# 워커가 한 스캔에서 남기는 진행률 갱신 (LangGraph 노드 순서)
+PROGRESS_STEPS = (("port_scan", 25), ("vulnerability_analysis", 50), ("risk_assessment", 75), ("report", 90))
+
+
+def make_result(index: int, ports: int, findings: int) -> dict:
+    """합성 스캔 결과"""
+    target = f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+    return {
+        "target": target,
+        "ports": [
+            {"port": 20 + p, "state": "open", "service": f"svc{p}", "version": "1.0"}
+            for p in range(ports)
+        ],
+        "vulnerabilities": [
+            {
+                "port": 20 + f,
+                "service": f"svc{f}",
+                "type": "outdated_version",
+                "severity": ("low", "medium", "high")[f % 3],
+                "description": f"Synthetic finding {f} on {target}",
+            }
+            for f in range(findings)
+        ],
+        "risk_assessment": {"overall_risk": "medium", "risk_score": 5.0},
+        "remediation": [{"title": "Upgrade services", "priority": "medium"}],
+        "report": f"# Report for {target}\n\nSynthetic benchmark result.",
+    }
+
+
+def run_per_row(db, results: list) -> list:
+    """건별 커밋 경로"""
+    session_ids = []
+    for result in results:
+        session = crud.create_scan_session(db, result["target"], ScanType.STANDARD.value)
+        session_id = str(session.id)
+        session_ids.append(session_id)
+        crud.update_scan_status(db, session_id, ScanStatus.RUNNING, started_at=datetime.utcnow())
+        for step, progress in PROGRESS_STEPS:
+            crud.update_scan_progress(db, session_id, step, progress)
+        crud.save_scan_result(db, session_id, result)
+    return session_ids
+
+
+def run_bulk(db, results: list, batch_size: int) -> list:
+    """묶음 저장 경로"""
+    batch_id = uuid.uuid4()
+    rows = [
+        {"id": uuid.uuid4(), "target": result["target"], "scan_type": ScanType.STANDARD, "batch_id": batch_id}
+        for result in results
+    ]
+    crud.create_scan_sessions_bulk(db, rows)
+    session_ids = [str(row["id"]) for row in rows]
+
+    for start in range(0, len(rows), batch_size):
+        chunk = list(zip(session_ids[start:start + batch_size], results[start:start + batch_size]))
+        for session_id, _ in chunk:
+            crud.update_scan_status(db, session_id, ScanStatus.RUNNING, started_at=datetime.utcnow())
+        for step, progress in PROGRESS_STEPS:
+            crud.update_scan_progress_bulk(db, {session_id: (step, progress) for session_id, _ in chunk})
+            db.commit()
+        crud.save_scan_results_bulk(
+            db, [(session_id, result, ScanStatus.COMPLETED, {}) for session_id, result in chunk]
+        )
+    return session_ids
+
+
+def cleanup(db, session_ids: list) -> None:
+    """벤치마크 세션과 관측 행 삭제"""
+    ids = [uuid.UUID(session_id) for session_id in session_ids]
+    for start in range(0, len(ids), 1000):
+        chunk = ids[start:start + 1000]
+        db.execute(delete(ScanPort).where(ScanPort.session_id.in_(chunk)))
+        db.execute(delete(ScanFinding).where(ScanFinding.session_id.in_(chunk)))
+        db.execute(delete(ScanSession).where(ScanSession.id.in_(chunk)))
+        db.commit()
+
+
+def measure(name: str, run, results: list, keep: bool) -> dict:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        session_ids = run(db, results)
+        elapsed = time.perf_counter() - started
+        if not keep:
+            cleanup(db, session_ids)
+    finally:
+        db.close()
+
+    rows = sum(1 + len(r["ports"]) + len(r["vulnerabilities"]) for r in results)
+    return {
+        "path": name,
+        "sessions": len(results),
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "sessions_per_second": round(len(results) / elapsed, 1),
+        "rows_per_second": round(rows / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스캔 결과 저장 경로 벤치마크")
+    parser.add_argument("--sessions", type=int, default=1000, help="저장할 세션 수")
+    parser.add_argument("--ports", type=int, default=10, help="세션당 열린 포트 수")
+    parser.add_argument("--findings", type=int, default=3, help="세션당 취약점 수")
+    parser.add_argument("--batch-size", type=int, default=500, help="묶음 저장 단위 (BULK_WRITE_MAX_BATCH)")
+    parser.add_argument("--path", choices=("both", "per-row", "bulk"), default="both")
+    parser.add_argument("--keep", action="store_true", help="측정 후 세션을 지우지 않음")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    results = [make_result(i, args.ports, args.findings) for i in range(args.sessions)]
+    runs = []
+    if args.path in ("both", "per-row"):
+        runs.append(measure("per-row", run_per_row, results, args.keep))
+    if args.path in ("both", "bulk"):
+        runs.append(measure(
+            "bulk", lambda db, r: run_bulk(db, r, args.batch_size), results, args.keep
+        ))
+
+    for run in runs:
+        print(
+            f"{run['path']:>8}: {run['sessions']} sessions / {run['rows']} rows in {run['seconds']:.2f}s "
+            f"({run['sessions_per_second']:.0f} sessions/s, {run['rows_per_second']:.0f} rows/s)"
+        )
+    if len(runs) == 2:
+        print(f" speedup: {runs[0]['seconds'] / runs[1]['seconds']:.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "persistence", "args": vars(args), "runs": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+스캐너 처리량 벤치마크 (로컬 리스너 묶음 대상)
+
+loopback에 열린 포트 수천 개와 응답하지 않는 포트(filtered)를 띄우고, 스캐너 백엔드 × 스캔 유형 × nmap 인자
+조합마다 포트 스캔 노드와 같은 방식(PORT_SCAN_CHUNK_SIZE 단위 호출)으로 스캔해 다음을 측정한다.
+
+- ports_per_second: 스캔한 포트 수 / 소요 시간 (반복 측정의 중앙값)
+- precision / recall: 열린 포트 판정 정확도 (다른 프로세스가 listen 중인 포트는 제외)
+- filtered_reported_open: 응답하지 않는 포트를 열림으로 보고한 수 (0이어야 함)
+- scanner_peak_rss_kb: 스캐너 프로세스(nmap) 최대 RSS, worker_rss_delta_kb: 결과 파싱 등 Python 쪽 증가량
+
+조합마다 별도 프로세스에서 실행해 메모리 측정이 서로 섞이지 않는다.
+결과는 --json으로 저장하고, --baseline으로 이전 결과와 비교하면 처리량이 --max-regression보다
+떨어지거나 정확도가 낮아진 조합이 있을 때 종료 코드 1 (CI 회귀 검사용).
+
+--netns를 주면 새 네트워크 네임스페이스(unshare --net, root 필요)에서 실행해
+호스트의 다른 리스너와 섞이지 않는다.
+
+    cd backend
+    python -m benchmarks.scanner --open 2000 --filtered 200 --json bench-scanner.json
+    python -m benchmarks.scanner --netns --scan-types quick,standard --baseline bench-scanner.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from app.core.config import settings
+from app.services.langgraph_service import NMAP_ARGUMENTS, SCAN_PORT_RANGES, split_port_range
+from app.services.tools.nmap_tool import NmapTool
+from benchmarks.listener_farm import ListenerFarm, ports_in_range
+
+# 벤치마크할 스캐너 백엔드 (scan_ports(target, ports, arguments, timeout) 인터페이스)
+SCANNERS = {
+    "nmap": NmapTool,
+}
+
+# 네임스페이스 안에서 다시 실행된 경우 표시
+NETNS_ENV = "SCANNER_BENCH_NETNS"
+
+
+def _current_rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def _scan_worker(conn, scanner: str, target: str, port_range: str, arguments: str, chunk_size: int):
+    """별도 프로세스에서 한 조합 스캔 (열린 포트, 소요 시간, 메모리)"""
+    try:
+        rss_before = _current_rss_kb()
+        tool = SCANNERS[scanner]()
+        found = []
+        started = time.perf_counter()
+        for chunk in split_port_range(port_range, chunk_size):
+            found.extend(tool.scan_ports(target, chunk, arguments=arguments))
+        elapsed = time.perf_counter() - started
+        conn.send({
+            "seconds": elapsed,
+            "open": sorted({port["port"] for port in found}),
+            "scanner_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+            "worker_rss_delta_kb": max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before, 0),
+        })
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(farm: ListenerFarm, scanner: str, scan_type: str, arguments: str, args) -> dict:
+    """한 조합을 --repeat번 측정"""
+    port_range = SCAN_PORT_RANGES[scan_type]
+    low, _, high = port_range.partition("-")
+    port_count = int(high) - int(low) + 1
+
+    expected = ports_in_range(farm.open, port_range)
+    filtered = ports_in_range(farm.filtered, port_range)
+    foreign = ports_in_range(farm.foreign, port_range)
+
+    context = multiprocessing.get_context("fork")
+    measurements = []
+    for _ in range(args.repeat):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_scan_worker,
+            args=(sender, scanner, args.target, port_range, arguments, args.chunk_size),
+        )
+        process.start()
+        sender.close()
+        result = receiver.recv()
+        process.join()
+        if "error" in result:
+            return {"scanner": scanner, "scan_type": scan_type, "arguments": arguments, "error": result["error"]}
+        measurements.append(result)
+
+    seconds = statistics.median(m["seconds"] for m in measurements)
+    found = set(measurements[-1]["open"]) - foreign
+    true_open = len(found & expected)
+    return {
+        "scanner": scanner,
+        "scan_type": scan_type,
+        "arguments": arguments,
+        "ports": port_count,
+        "expected_open": len(expected),
+        "filtered": len(filtered),
+        "seconds": round(seconds, 3),
+        "seconds_all": [round(m["seconds"], 3) for m in measurements],
+        "ports_per_second": round(port_count / seconds, 1),
+        "reported_open": len(found),
+        "precision": round(true_open / len(found), 4) if found else 1.0,
+        "recall": round(true_open / len(expected), 4) if expected else 1.0,
+        "filtered_reported_open": len(found & filtered),
+        "scanner_peak_rss_kb": max(m["scanner_peak_rss_kb"] for m in measurements),
+        "worker_rss_delta_kb": max(m["worker_rss_delta_kb"] for m in measurements),
+    }
+
+
+def _case_key(run: dict) -> tuple:
+    return run["scanner"], run["scan_type"], run["arguments"]
+
+
+def compare_baseline(runs: list, baseline_path: str, max_regression: float) -> list:
+    """이전 결과 대비 회귀 목록"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_case_key(run): run for run in json.load(f)["runs"] if "error" not in run}
+
+    regressions = []
+    for run in runs:
+        previous = baseline.get(_case_key(run))
+        if previous is None or "error" in run:
+            continue
+        name = f"{run['scanner']}/{run['scan_type']} [{run['arguments']}]"
+        floor = previous["ports_per_second"] * (1 - max_regression)
+        if run["ports_per_second"] < floor:
+            regressions.append(
+                f"{name}: {run['ports_per_second']:.0f} ports/s < {floor:.0f} "
+                f"(baseline {previous['ports_per_second']:.0f})"
+            )
+        for metric in ("precision", "recall"):
+            if run[metric] < previous[metric]:
+                regressions.append(f"{name}: {metric} {run[metric]} < baseline {previous[metric]}")
+        if run["filtered_reported_open"] > previous["filtered_reported_open"]:
+            regressions.append(f"{name}: {run['filtered_reported_open']} filtered ports reported open")
+    return regressions
+
+
+def _environment(args) -> dict:
+    try:
+        version = subprocess.run(
+            ["nmap", "--version"], capture_output=True, text=True, timeout=10
+        ).stdout.splitlines()[0]
+    except (OSError, IndexError, subprocess.SubprocessError):
+        version = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "nmap": version,
+        "root": os.geteuid() == 0,
+        "netns": bool(os.environ.get(NETNS_ENV)),
+        "chunk_size": args.chunk_size,
+    }
+
+
+def _reexec_in_netns() -> None:
+    """unshare --net으로 자신을 다시 실행 (loopback만 있는 새 네임스페이스)"""
+    argv = [arg for arg in sys.argv[1:] if arg != "--netns"]
+    command = (
+        f"ip link set lo up && exec {sys.executable} -m benchmarks.scanner "
+        + " ".join(shlex.quote(arg) for arg in argv)
+    )
+    env = dict(os.environ, **{NETNS_ENV: "1"})
+    sys.exit(subprocess.call(["unshare", "--net", "--", "sh", "-c", command], env=env))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스캐너 처리량 벤치마크 (로컬 리스너 묶음 대상)")
+    parser.add_argument("--open", type=int, default=2000, help="열린 포트(리스너) 수")
+    parser.add_argument("--filtered", type=int, default=200, help="응답하지 않는 포트 수")
+    parser.add_argument("--target", default="127.0.0.1", help="리스너 주소 (loopback)")
+    parser.add_argument("--scanners", default=",".join(SCANNERS), help="쉼표로 구분한 스캐너 백엔드")
+    parser.add_argument(
+        "--scan-types", default=",".join(SCAN_PORT_RANGES), help="쉼표로 구분한 스캔 유형 (quick,standard,full)"
+    )
+    parser.add_argument(
+        "--arguments", action="append", help=f"nmap 인자 (여러 번 지정 가능, 기본: {NMAP_ARGUMENTS})"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.PORT_SCAN_CHUNK_SIZE, help="호출당 포트 수 (PORT_SCAN_CHUNK_SIZE)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="조합별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--seed", type=int, default=0, help="포트 배치 시드")
+    parser.add_argument("--netns", action="store_true", help="새 네트워크 네임스페이스에서 실행 (root 필요)")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", metavar="PATH", help="비교할 이전 결과 (--json 출력)")
+    parser.add_argument("--max-regression", type=float, default=0.15, help="허용하는 처리량 감소 비율")
+    args = parser.parse_args()
+
+    if args.netns and not os.environ.get(NETNS_ENV):
+        _reexec_in_netns()
+
+    scanners = [name.strip() for name in args.scanners.split(",") if name.strip()]
+    scan_types = [name.strip() for name in args.scan_types.split(",") if name.strip()]
+    for name in scanners:
+        if name not in SCANNERS:
+            parser.error(f"unknown scanner: {name} (available: {', '.join(SCANNERS)})")
+    for name in scan_types:
+        if name not in SCAN_PORT_RANGES:
+            parser.error(f"unknown scan type: {name} (available: {', '.join(SCAN_PORT_RANGES)})")
+    arguments_list = args.arguments or [NMAP_ARGUMENTS]
+
+    runs = []
+    with ListenerFarm(args.target, args.open, args.filtered, seed=args.seed) as farm:
+        print(
+            f"listeners: {len(farm.open)} open, {len(farm.filtered)} filtered, "
+            f"{len(farm.foreign)} foreign on {args.target}"
+        )
+        for scanner in scanners:
+            for scan_type in scan_types:
+                for arguments in arguments_list:
+                    run = run_case(farm, scanner, scan_type, arguments, args)
+                    runs.append(run)
+                    if "error" in run:
+                        print(f"{scanner:>6} {scan_type:>8} [{arguments}]: {run['error']}")
+                        continue
+                    print(
+                        f"{scanner:>6} {scan_type:>8} [{arguments}]: {run['ports']} ports in {run['seconds']:.2f}s "
+                        f"({run['ports_per_second']:.0f} ports/s) precision={run['precision']:.3f} "
+                        f"recall={run['recall']:.3f} filtered_open={run['filtered_reported_open']} "
+                        f"nmap_rss={run['scanner_peak_rss_kb'] / 1024:.1f}MB"
+                    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"benchmark": "scanner", "environment": _environment(args), "args": vars(args), "runs": runs},
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        regressions = compare_baseline(runs, args.baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@
 API 엔드포인트 테스트 스크립트
 Phase 2.3 검증용
 """
+import os
 import requests
 import json
 import time
 
-BASE_URL = "http://127.0.0.1:8000/api/v1"
+BASE_URL = os.environ.get("API_BASE_URL", "http://127.0.0.1:8000/api/v1")
 
 def test_scan_api():
     """스캔 API 전체 흐름 테스트"""
@@ -72,7 +73,7 @@ def test_scan_api():
     print("-" * 60)
     response = requests.get(f"{BASE_URL}/langgraph/sessions")
     print(f"Status: {response.status_code}")
-    sessions = response.json()
+    sessions = response.json()["items"]
     print(f"Total sessions: {len(sessions)}")
     for session in sessions:
         print(f"  - {session.get('session_id')}: {session.get('target')} ({session.get('status')})")
@@ -89,7 +90,7 @@ def test_scan_api():
     print("-" * 60)
     response = requests.get(f"{BASE_URL}/langgraph/sessions")
     print(f"Status: {response.status_code}")
-    sessions = response.json()
+    sessions = response.json()["items"]
     print(f"Total sessions: {len(sessions)}")
 
     print("\n" + "=" * 60)
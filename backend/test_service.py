@@ -1,8 +1,9 @@
 """
 LangGraph 서비스 직접 테스트 스크립트
 """
+import os
 import sys
-sys.path.insert(0, '/home/k8s-admin/3vi-v1/backend')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.services.langgraph_service import LangGraphService
 import json
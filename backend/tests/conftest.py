@@ -0,0 +1,63 @@
+"""
+pytest 공통 설정
+
+DB가 필요한 테스트는 TEST_DATABASE_URL(테스트 전용 PostgreSQL DB)이 있을 때만 실행한다.
+설정한 DB에 마이그레이션(alembic upgrade head)을 적용하고, 테스트가 만든 행은 테스트마다 지운다.
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/securitydb_test pytest
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# app.core.config를 import하기 전에 설정 (필수 설정값, 테스트 DB)
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("DATABASE_URL", "postgresql://postgres@localhost/securitydb_test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("SCANNER_BACKEND", "stub")
+os.environ.setdefault("DB_POOL_WARMUP", "false")
+
+
+@pytest.fixture(scope="session")
+def migrated_engine():
+    """마이그레이션을 적용한 테스트 DB 엔진 (TEST_DATABASE_URL이 없으면 skip)"""
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from alembic import command
+    from alembic.config import Config
+
+    from app.core.database import engine
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, "head")
+    return engine
+
+
+@pytest.fixture
+def db(migrated_engine):
+    """테스트 DB 세션 (테스트가 끝나면 모든 스캔 관련 행 삭제)"""
+    from sqlalchemy import text
+
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.execute(text(
+            "TRUNCATE scan_sessions, scan_ports, scan_findings, scan_result_blobs, "
+            "scan_outcome_stats, finding_severity_stats, open_service_stats"
+        ))
+        session.commit()
+        session.close()
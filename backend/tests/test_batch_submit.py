@@ -0,0 +1,136 @@
+"""
+배치 스캔 제출 (batch_scan_service.submit_batch) 테스트
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import batch as batch_api
+from app.core import events
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import InProcessEventBus
+
+from app.models import crud
+from app.models.scan_session import ScanStatus
+from app.services import async_scan_service, batch_scan_service, scan_registry
+from app.services.async_scan_service import start_or_attach
+from app.services.scan_registry import InProcessScanRegistry
+
+
+class CountingRegistry(InProcessScanRegistry):
+    def __init__(self):
+        super().__init__()
+        self.claim_calls = 0
+
+    def claim_many(self, claims):
+        self.claim_calls += 1
+        return super().claim_many(claims)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = CountingRegistry()
+    monkeypatch.setattr(scan_registry, "_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """워커 풀 대신 제출된 세션 ID를 기록"""
+    session_ids = []
+    monkeypatch.setattr(
+        async_scan_service.AsyncScanService, "submit", lambda self: session_ids.append(self.session_id)
+    )
+    return session_ids
+
+
+def test_submit_batch_merges_duplicates_and_links_in_flight(db, registry, submitted):
+    owner, _ = start_or_attach(db, "10.0.0.2", "quick")
+    registry.claim_calls = 0
+    submitted.clear()
+
+    targets = ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.1"]
+    batch_id, sessions = batch_scan_service.submit_batch(db, targets, "quick")
+
+    # 대상 수와 관계없이 레지스트리 왕복 1회
+    assert registry.claim_calls == 1
+    assert [s["target"] for s in sessions] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    by_target = {s["target"]: s for s in sessions}
+    assert by_target["10.0.0.2"]["linked_session_id"] == owner
+    assert by_target["10.0.0.1"]["linked_session_id"] is None
+    assert sorted(submitted) == sorted([by_target["10.0.0.1"]["session_id"], by_target["10.0.0.3"]["session_id"]])
+
+    statuses = crud.get_batch_statuses(db, batch_id)
+    assert len(statuses) == 3
+    assert {row.status for row in statuses} == {ScanStatus.PENDING}
+
+
+def test_submit_batch_releases_claims_when_insert_fails(db, registry, submitted, monkeypatch):
+    def fail_insert(db, rows):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(crud, "create_scan_sessions_bulk", fail_insert)
+    with pytest.raises(RuntimeError):
+        batch_scan_service.submit_batch(db, ["10.0.0.1", "10.0.0.2"], "quick")
+
+    assert submitted == []
+    assert registry.age("10.0.0.1", "quick") is None
+    assert registry.age("10.0.0.2", "quick") is None
+
+
+def test_submit_batch_fails_unsubmitted_sessions(db, registry, monkeypatch):
+    calls = []
+
+    def submit_once(self):
+        if calls:
+            raise RuntimeError("executor is shut down")
+        calls.append(self.session_id)
+
+    monkeypatch.setattr(async_scan_service.AsyncScanService, "submit", submit_once)
+    with pytest.raises(RuntimeError):
+        batch_scan_service.submit_batch(db, ["10.0.0.1", "10.0.0.2"], "quick")
+
+    assert registry.claim("10.0.0.1", "quick", "other") == calls[0]
+    assert registry.age("10.0.0.2", "quick") is None
+    failed = db.query(crud.ScanSession).filter(crud.ScanSession.target == "10.0.0.2").one()
+    assert failed.status == ScanStatus.FAILED
+
+
+def test_stream_batch_results_in_chunks(db, registry, submitted, monkeypatch):
+    monkeypatch.setattr(events, "_bus", InProcessEventBus())
+    monkeypatch.setattr(settings, "EVENT_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(batch_scan_service, "RESULT_FETCH_SIZE", 1)
+
+    batch_id, sessions = batch_scan_service.submit_batch(db, ["10.0.0.1", "10.0.0.2", "10.0.0.3"], "quick")
+    first, second, last = (s["session_id"] for s in sessions)
+    crud.save_scan_result(db, first, {"target": "10.0.0.1"})
+    crud.update_scan_status(db, second, ScanStatus.FAILED, error="boom")
+
+    # 스트리밍 중에 마지막 세션이 끝남 (하트비트 재확인으로 감지)
+    def complete():
+        worker_db = SessionLocal()
+        try:
+            crud.save_scan_result(worker_db, last, {"target": "10.0.0.3"})
+        finally:
+            worker_db.close()
+
+    async def collect():
+        return [json.loads(line) async for line in batch_scan_service.stream_batch_results(batch_id)]
+
+    threading.Timer(0.2, complete).start()
+    lines = asyncio.run(collect())
+    assert sorted(line["session_id"] for line in lines[:2]) == sorted([first, second])
+    assert [(line["session_id"], line["status"]) for line in lines[2:]] == [(last, "completed")]
+
+
+def test_results_of_unknown_batch_not_found(db):
+    app = FastAPI()
+    app.include_router(batch_api.router, prefix="/api/v1/langgraph")
+    client = TestClient(app)
+    assert client.get("/api/v1/langgraph/scans:batch/not-a-uuid/results").status_code == 404
+    assert client.get("/api/v1/langgraph/scans:batch/01a15278-942c-767e-83f5-e70d1407b3d8/results").status_code == 404
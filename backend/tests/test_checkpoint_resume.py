@@ -0,0 +1,122 @@
+"""
+노드 체크포인트와 스캔 재개 (checkpointer, LangGraphService.run_scan) 테스트
+
+가짜 LLM과 stub 스캐너로 그래프를 실제로 실행한다.
+"""
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services import checkpointer
+from app.services.langgraph_service import LangGraphService
+
+
+@pytest.fixture(autouse=True)
+def fast_scan(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "FAKE_LLM_TOKEN_DELAY_MS", 0)
+    monkeypatch.setattr(settings, "SCANNER_BACKEND", "stub")
+    monkeypatch.setattr(settings, "STUB_SCANNER_DELAY_MS", 0)
+
+
+@pytest.fixture
+def flaky_risk(monkeypatch):
+    """위험도 평가 단계가 처음 한 번 실패하고, 포트 스캔 실행 횟수를 센다"""
+    calls = {"port_scan": 0, "risk": 0}
+    port_scan = LangGraphService._port_scan
+    risk = LangGraphService._risk_assessment
+
+    def counting_port_scan(self, state):
+        calls["port_scan"] += 1
+        return port_scan(self, state)
+
+    def failing_risk(self, state):
+        calls["risk"] += 1
+        if calls["risk"] == 1:
+            raise RuntimeError("LLM unavailable")
+        return risk(self, state)
+
+    monkeypatch.setattr(LangGraphService, "_port_scan", counting_port_scan)
+    monkeypatch.setattr(LangGraphService, "_risk_assessment", failing_risk)
+    return calls
+
+
+def _fail(saver, thread_id, calls):
+    with pytest.raises(RuntimeError):
+        LangGraphService(checkpointer=saver).run_scan("127.0.0.1", "quick", thread_id=thread_id)
+    assert calls == {"port_scan": 1, "risk": 1}
+
+
+def _resume(saver, thread_id, calls):
+    result = LangGraphService(checkpointer=saver).run_scan("127.0.0.1", "quick", thread_id=thread_id, resume=True)
+    # 포트 스캔은 다시 하지 않고 실패한 단계부터 실행
+    assert calls == {"port_scan": 1, "risk": 2}
+    assert result["ports"]
+    assert result["risk_assessment"] is not None
+    assert result["remediation"] is not None
+
+
+def test_resume_continues_from_failed_node(flaky_risk):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    saver = MemorySaver()
+    thread_id = str(uuid.uuid4())
+    _fail(saver, thread_id, flaky_risk)
+    _resume(saver, thread_id, flaky_risk)
+
+
+def test_resume_without_checkpoint_starts_over(flaky_risk):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    thread_id = str(uuid.uuid4())
+    with pytest.raises(RuntimeError):
+        LangGraphService(checkpointer=MemorySaver()).run_scan("127.0.0.1", "quick", thread_id=thread_id)
+    LangGraphService(checkpointer=MemorySaver()).run_scan("127.0.0.1", "quick", thread_id=thread_id, resume=True)
+    assert flaky_risk["port_scan"] == 2
+
+
+@pytest.fixture
+def configured_checkpointer(monkeypatch):
+    """SCAN_CHECKPOINTER를 바꿔 가며 만들 수 있도록 모듈 상태 초기화"""
+    checkpointer.close_checkpointer()
+    yield lambda backend: monkeypatch.setattr(settings, "SCAN_CHECKPOINTER", backend)
+    checkpointer.close_checkpointer()
+
+
+def test_memory_checkpoints_of_failed_scans_are_released(configured_checkpointer, flaky_risk):
+    configured_checkpointer("memory")
+    saver = checkpointer.get_checkpointer()
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+    with pytest.raises(RuntimeError):
+        LangGraphService(checkpointer=saver).run_scan("127.0.0.1", "quick", thread_id=thread_id)
+    assert saver.get_tuple(config) is not None
+
+    assert not checkpointer.is_durable()
+    checkpointer.release_checkpoint(thread_id)
+    assert saver.get_tuple(config) is None
+
+
+def test_postgres_checkpointer_survives_restart_with_small_pool(
+    migrated_engine, configured_checkpointer, flaky_risk, monkeypatch
+):
+    # psycopg_pool 기본 min_size(4)보다 작은 max_size
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_SCANS", 2)
+    configured_checkpointer("postgres")
+    saver = checkpointer.get_checkpointer()
+    assert checkpointer.is_durable()
+    assert saver.conn.max_size == 2
+
+    thread_id = str(uuid.uuid4())
+    _fail(saver, thread_id, flaky_risk)
+    # 워커가 죽은 뒤 새 프로세스에서 재개하는 경우와 같도록 새 연결 풀로 재개
+    checkpointer.close_checkpointer()
+    _resume(checkpointer.get_checkpointer(), thread_id, flaky_risk)
+
+    # 실패한 스캔의 체크포인트는 남긴다
+    checkpointer.release_checkpoint(thread_id)
+    assert checkpointer.get_checkpointer().get_tuple({"configurable": {"thread_id": thread_id}}) is not None
+    checkpointer.delete_checkpoint(thread_id)
+    assert checkpointer.get_checkpointer().get_tuple({"configurable": {"thread_id": thread_id}}) is None
@@ -0,0 +1,71 @@
+"""
+스캔 이벤트 스트리밍 엔드포인트 (api/v1/events) 테스트
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import events as events_api
+from app.core import events
+from app.core.events import InProcessEventBus
+from app.models import crud
+from app.models.scan_session import ScanStatus
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = InProcessEventBus()
+    monkeypatch.setattr(events, "_bus", bus)
+    return bus
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(events_api.router, prefix="/api/v1/langgraph")
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_invalid_session_id_is_not_found(bus, client):
+    for _ in range(3):
+        assert client.get("/api/v1/langgraph/scan/not-a-uuid/events").status_code == 404
+    assert bus._subscribers == {}
+
+
+def test_subscription_closed_when_snapshot_fails(bus, client, monkeypatch):
+    def fail(session_id):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(events_api, "_load_snapshot", fail)
+    response = client.get("/api/v1/langgraph/scan/01a15278-942c-767e-83f5-e70d1407b3d8/events")
+    assert response.status_code == 500
+    assert bus._subscribers == {}
+
+
+def test_sse_stream_of_finished_scan(db, bus, client):
+    session = crud.create_scan_session(db, "10.0.0.1", "quick")
+    crud.update_scan_status(db, str(session.id), ScanStatus.FAILED, error="boom")
+
+    response = client.get(f"/api/v1/langgraph/scan/{session.id}/events")
+    assert response.status_code == 200
+    assert response.text.startswith("event: snapshot\n")
+    assert '"status": "failed"' in response.text
+    assert bus._subscribers == {}
+
+
+def test_websocket_closes_subscription(db, bus, client):
+    session = crud.create_scan_session(db, "10.0.0.1", "quick")
+    crud.update_scan_status(db, str(session.id), ScanStatus.COMPLETED)
+
+    with client.websocket_connect(f"/api/v1/langgraph/scan/{session.id}/events") as websocket:
+        assert websocket.receive_json()["status"] == "completed"
+    assert bus._subscribers == {}
+
+
+def test_subscription_requires_implementation():
+    class Incomplete(events.Subscription):
+        async def get(self, timeout=None):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,20 @@
+"""
+DB 헬스 프로브 (health_probes, database.ping_database) 테스트
+"""
+import asyncio
+
+from app.core import health_probes
+from app.core.config import settings
+from app.core.database import pool_config
+
+
+def test_database_probe_ok_when_pool_exhausted(migrated_engine, monkeypatch):
+    monkeypatch.setattr(settings, "HEALTH_PROBE_TIMEOUT", 2.0)
+    # 요청/스캔이 풀의 연결을 모두 쓰고 있는 상태
+    held = [migrated_engine.connect() for _ in range(migrated_engine.pool.size() + pool_config()["max_overflow"])]
+    try:
+        result = asyncio.run(health_probes._run_probe("database", health_probes._probe_database))
+    finally:
+        for connection in held:
+            connection.close()
+    assert result["status"] == health_probes.OK, result["error"]
@@ -0,0 +1,51 @@
+"""
+채팅 스캔 의도 파싱 (intent_parser) 테스트
+"""
+import pytest
+
+from app.schemas.scan_request import validate_scan_target
+from app.services.intent_parser import _parse_fast, expand_targets, normalize_message
+
+
+def parse(message):
+    return _parse_fast(normalize_message(message))
+
+
+@pytest.mark.parametrize("message, targets, scan_type", [
+    ("192.168.0.5에 풀스캔 해줘", ("192.168.0.5",), "full"),
+    ("10.0.0.0/30 빠른 스캔", ("10.0.0.0/30",), "quick"),
+    ("localhost를 표준 스캔", ("localhost",), "standard"),
+    ("scan 127.0.0.1 and 10.0.0.1", ("127.0.0.1", "10.0.0.1"), "quick"),
+])
+def test_pattern_parsing(message, targets, scan_type):
+    intent, ambiguous = parse(message)
+    assert not ambiguous
+    assert intent.targets == targets
+    assert intent.scan_type == scan_type
+    # 추출한 대상은 모두 스캔 요청 검증을 통과한다
+    for target in expand_targets(intent.targets):
+        validate_scan_target(target)
+
+
+@pytest.mark.parametrize("message", [
+    "example.com 스캔해줘",
+    "localhost.example.com quick scan",
+    "999.1.1.1 quick",
+])
+def test_unscannable_targets_are_not_extracted(message):
+    intent, ambiguous = parse(message)
+    assert intent is None
+    assert ambiguous
+
+
+def test_conflicting_scan_types_are_ambiguous():
+    assert parse("192.168.0.5 quick full") == (None, True)
+
+
+def test_expand_targets_limits_cidr_size(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MAX_BATCH_TARGETS", 4)
+    assert expand_targets(("10.0.0.0/30", "10.0.0.1")) == ["10.0.0.1", "10.0.0.2"]
+    with pytest.raises(ValueError):
+        expand_targets(("10.0.0.0/29",))
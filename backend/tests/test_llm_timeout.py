@@ -0,0 +1,42 @@
+"""
+LLM 호출 제한 시간 (LangGraphService._invoke_llm) 테스트
+"""
+import pytest
+
+from app.core.config import settings
+from app.services.cancellation import CancellationToken
+from app.services.langgraph_service import LangGraphService
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.bound = []
+
+    def bind(self, **kwargs):
+        self.bound.append(kwargs)
+        return self
+
+    def invoke(self, prompt):
+        return "ok"
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "fake")
+    service = LangGraphService()
+    service.llm = RecordingLLM()
+    return service
+
+
+def test_binds_shorter_of_llm_and_scan_timeout(service, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_TIMEOUT", 30)
+    service.cancel_token = CancellationToken(timeout=5)
+    service._invoke_llm("prompt", "risk_assessment")
+    assert 0 < service.llm.bound[0]["timeout"] <= 5
+
+
+def test_no_bind_without_any_timeout(service, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_TIMEOUT", 0)
+    service.cancel_token = CancellationToken(timeout=None)
+    assert service._invoke_llm("prompt", "risk_assessment") == "ok"
+    assert service.llm.bound == []
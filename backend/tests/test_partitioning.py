@@ -0,0 +1,106 @@
+"""
+scan_sessions 파티션 (ID 조회 pruning, retention 보관) 테스트
+"""
+import gzip
+import json
+import re
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.models import crud
+from app.models.scan_session import ScanSession, ScanStatus, ScanType, created_at_range, new_session_id
+from app.services import retention
+
+OLD_MONTH = date(2020, 1, 1)
+
+
+def _scanned_partitions(db, statement) -> set:
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars().all()
+    return {match for line in plan for match in re.findall(r" on (scan_sessions_\w+)", line)}
+
+
+def test_session_id_carries_created_at():
+    session_id = new_session_id()
+    lower, upper = created_at_range(session_id)
+    assert lower < datetime.utcnow() < upper
+    assert session_id.version == 7
+    # 기존 uuid4 ID와 잘못된 값은 범위를 알 수 없다
+    assert created_at_range(uuid.uuid4()) is None
+    assert created_at_range("not-a-uuid") is None
+
+
+def test_lookup_by_id_prunes_partitions(db):
+    session = crud.create_scan_session(db, "10.0.0.1", "quick")
+
+    by_id_only = select(ScanSession.id).where(ScanSession.id == session.id)
+    assert len(_scanned_partitions(db, by_id_only)) > 1
+
+    # ID의 생성 시각 전후 범위가 걸친 월 파티션만 (월 경계가 아니면 하나)
+    pruned = by_id_only.where(*crud.created_at_bounds([session.id]))
+    months = {retention.partition_name(bound.date().replace(day=1)) for bound in created_at_range(session.id)}
+    assert retention.partition_name(session.created_at.date().replace(day=1)) in _scanned_partitions(db, pruned)
+    assert _scanned_partitions(db, pruned) <= months
+
+    assert crud.get_scan_status(db, str(session.id)).status == ScanStatus.PENDING
+
+
+def test_legacy_ids_still_found(db):
+    legacy = str(uuid.uuid4())
+    crud.create_scan_session(db, "10.0.0.1", "quick", session_id=legacy)
+    assert crud.created_at_bounds([legacy, new_session_id()]) == []
+    assert crud.get_scan_session(db, legacy) is not None
+    assert len(crud.get_scan_statuses(db, [legacy])) == 1
+
+
+@pytest.fixture
+def old_partition(db, tmp_path, monkeypatch):
+    """보관 대상이 될 지난 달 파티션 (테스트가 끝나면 남은 테이블 삭제)"""
+    monkeypatch.setattr(settings, "SCAN_ARCHIVE_DIR", str(tmp_path))
+    name = retention.partition_name(OLD_MONTH)
+    with db.get_bind().connect() as conn:
+        retention.create_partition(conn, OLD_MONTH)
+    yield name
+    db.rollback()
+    db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    db.commit()
+
+
+def test_archive_partition_exports_observations(db, old_partition):
+    # 파티션 이전에 만들어진 세션처럼 uuid4 ID로 지난 달에 생성
+    session_id = str(uuid.uuid4())
+    crud.create_scan_sessions_bulk(db, [{
+        "id": uuid.UUID(session_id),
+        "target": "10.0.0.1",
+        "scan_type": ScanType.QUICK,
+        "created_at": datetime(2020, 1, 15),
+    }])
+    crud.save_scan_result(db, session_id, {
+        "target": "10.0.0.1",
+        "ports": [{"port": 22, "service": "ssh", "version": "OpenSSH 8.9"}],
+        "vulnerabilities": [{"port": 22, "service": "ssh", "type": "weak_auth", "severity": "high"}],
+        "report": "# report",
+    })
+
+    with db.get_bind().connect() as conn:
+        assert retention.archive_partition(conn, old_partition) == 1
+    db.commit()
+
+    with gzip.open(retention.archive_path(old_partition), "rt", encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    assert record["session_id"] == session_id
+    assert record["status"] == "completed"
+    assert record["report"] == "# report"
+    assert [(p["port"], p["service"]) for p in record["scan_ports"]] == [(22, "ssh")]
+    assert [(f["type"], f["severity"]) for f in record["scan_findings"]] == [("weak_auth", "high")]
+
+    # DB에서는 세션과 관측 행이 모두 지워지고, 보관 파일에서 조회된다
+    assert crud.get_scan_session(db, session_id) is None
+    assert db.execute(text("SELECT count(*) FROM scan_ports")).scalar() == 0
+    assert db.execute(text("SELECT count(*) FROM scan_findings")).scalar() == 0
+    archived = list(retention.iter_archived_sessions(session_id=session_id))
+    assert [r["session_id"] for r in archived] == [session_id]
@@ -0,0 +1,39 @@
+"""
+read-your-writes 표시 (replicas.mark_written, recently_written) 테스트
+"""
+import pytest
+
+from app.core import replicas
+from app.core.cache import LocalCache
+from app.core.config import settings
+
+
+class CountingCache(LocalCache):
+    def __init__(self):
+        super().__init__(100)
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CountingCache()
+    monkeypatch.setattr(replicas, "get_cache", lambda: cache)
+    return cache
+
+
+def test_no_cache_lookup_without_replicas(cache, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", "")
+    replicas.mark_written("abc")
+    assert not replicas.recently_written("abc")
+    assert cache.gets == 0
+
+
+def test_recently_written_with_replicas(cache, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", "postgresql://replica/securitydb")
+    assert not replicas.recently_written("abc")
+    replicas.mark_written("abc")
+    assert replicas.recently_written("abc")
@@ -0,0 +1,80 @@
+"""
+보고서 디스크 캐시 (report_renderer) 테스트
+"""
+import os
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services import report_renderer
+
+RESULT = {
+    "ports": [{"port": 80, "state": "open", "service": "http", "version": "nginx"}],
+    "vulnerabilities": [],
+    "risk_assessment": {"score": 20, "level": "low", "analysis": ""},
+    "remediation": [],
+    "report": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _meta(session_id=None):
+    return {
+        "session_id": session_id or str(uuid.uuid4()),
+        "target": "10.0.0.1",
+        "scan_type": "quick",
+        "completed_at": "2026-10-19T00:00:00",
+    }
+
+
+def _cached_files(cache_dir):
+    return sorted(path for path in cache_dir.glob("*/*"))
+
+
+def test_cached_per_session_and_deleted_with_session(cache_dir):
+    meta = _meta()
+    body, key = report_renderer.render_report(meta, RESULT, "markdown")
+    assert report_renderer.render_report(meta, RESULT, "markdown") == (body, key)
+    report_renderer.render_report(_meta(), RESULT, "markdown")
+    assert len(_cached_files(cache_dir)) == 2
+
+    report_renderer.delete_reports(meta["session_id"])
+    files = _cached_files(cache_dir)
+    assert len(files) == 1
+    assert meta["session_id"] not in str(files[0])
+
+
+def test_prune_removes_least_recently_read_above_size_cap(cache_dir, monkeypatch):
+    metas = [_meta() for _ in range(3)]
+    for i, meta in enumerate(metas):
+        report_renderer.render_report(meta, RESULT, "html")
+        for p in report_renderer.session_cache_dir(meta["session_id"]).iterdir():
+            os.utime(p, (time.time() - 100 + i, time.time() - 100 + i))
+    # 가장 오래된 보고서를 읽으면 최근 사용으로 바뀐다
+    report_renderer.render_report(metas[0], RESULT, "html")
+
+    size = next(report_renderer.session_cache_dir(metas[0]["session_id"]).iterdir()).stat().st_size
+    monkeypatch.setattr(settings, "REPORT_CACHE_MAX_MB", 2 * size / 1024 / 1024)
+    assert report_renderer.prune_cache() == 1
+    assert not report_renderer.session_cache_dir(metas[1]["session_id"]).exists()
+    assert report_renderer.session_cache_dir(metas[0]["session_id"]).exists()
+    assert report_renderer.session_cache_dir(metas[2]["session_id"]).exists()
+
+
+def test_prune_removes_expired(cache_dir, monkeypatch):
+    old, new = _meta(), _meta()
+    report_renderer.render_report(old, RESULT, "json")
+    report_renderer.render_report(new, RESULT, "json")
+    for path in report_renderer.session_cache_dir(old["session_id"]).iterdir():
+        os.utime(path, (time.time() - 7200, time.time() - 7200))
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_MAX_AGE_HOURS", 1)
+    assert report_renderer.prune_cache() == 1
+    assert [p.parent.name for p in _cached_files(cache_dir)] == [new["session_id"]]
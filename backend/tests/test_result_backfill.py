@@ -0,0 +1,38 @@
+"""
+압축 저장소 백필 (result_backfill) 테스트
+"""
+import uuid
+
+from app.models import crud
+from app.models.scan_session import ScanSession
+from app.services.result_backfill import backfill_compressed_results
+
+RESULT = {
+    "ports": [{"port": 22, "state": "open", "service": "ssh", "version": "OpenSSH 8.9p1"}],
+    "vulnerabilities": [],
+    "risk_assessment": {"score": 10, "level": "low"},
+    "remediation": [],
+    "report": "# report",
+}
+
+
+def test_moves_inline_results_and_keeps_them_readable(db):
+    ids = []
+    for i in range(3):
+        session = crud.create_scan_session(db, f"10.0.0.{i}", "quick", session_id=str(uuid.uuid4()))
+        crud.save_scan_result(db, str(session.id), {**RESULT, "target": session.target})
+        ids.append(str(session.id))
+    # 결과가 없는 세션은 건너뛴다
+    crud.create_scan_session(db, "10.0.0.9", "quick", session_id=str(uuid.uuid4()))
+
+    assert backfill_compressed_results(batch_size=2) == 3
+    assert backfill_compressed_results(batch_size=2) == 0
+
+    db.expire_all()
+    for session_id in ids:
+        session = crud.get_scan_session(db, session_id, with_result=True)
+        assert session.result_digest is not None
+        assert session.ports is None
+        assert session.result_payload() == RESULT
+    # 같은 결과는 한 번만 저장
+    assert db.query(ScanSession.result_digest).distinct().filter(ScanSession.result_digest.isnot(None)).count() == 1
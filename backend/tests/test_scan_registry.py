@@ -0,0 +1,207 @@
+"""
+스캔 중복 제거와 취소/재개 (scan_registry, claim_or_find_owner, start_or_attach, cancel_scan, resume_scan) 테스트
+"""
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from app.core import events
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import InProcessEventBus
+from app.models import crud
+from app.models.scan_session import ScanStatus
+from app.services import async_scan_service, scan_registry
+from app.services.async_scan_service import claim_or_find_owner, start_or_attach, wait_for_result
+from app.services.scan_registry import InProcessScanRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = InProcessScanRegistry()
+    monkeypatch.setattr(scan_registry, "_registry", registry)
+    return registry
+
+
+def test_claim_returns_existing_owner(registry):
+    assert registry.claim("10.0.0.1", "quick", "a") is None
+    assert registry.claim("10.0.0.1", "quick", "b") == "a"
+    # 대상 표기가 달라도 같은 키
+    assert registry.claim(" 10.0.0.1 ", "quick", "c") == "a"
+    # 스캔 유형이 다르면 별개
+    assert registry.claim("10.0.0.1", "full", "d") is None
+
+
+def test_release_only_by_owner(registry):
+    registry.claim("10.0.0.1", "quick", "a")
+    registry.release("10.0.0.1", "quick", "b")
+    assert registry.claim("10.0.0.1", "quick", "b") == "a"
+
+    registry.release("10.0.0.1", "quick", "a")
+    assert registry.age("10.0.0.1", "quick") is None
+    assert registry.claim("10.0.0.1", "quick", "b") is None
+
+
+def test_claim_many_matches_claim(registry):
+    registry.claim("10.0.0.2", "quick", "a")
+    owners = registry.claim_many([
+        ("10.0.0.1", "quick", "b"),
+        ("10.0.0.2", "quick", "c"),
+        ("10.0.0.1", "quick", "d"),
+    ])
+    assert owners == [None, "a", "b"]
+
+
+def test_missing_owner_row_released_after_grace(db, registry, monkeypatch):
+    orphan = str(uuid.uuid4())
+    registry.claim("10.0.0.1", "quick", orphan)
+
+    # 소유자가 아직 세션을 만드는 중이면 합류
+    assert claim_or_find_owner(db, "10.0.0.1", "quick", str(uuid.uuid4())) == orphan
+
+    # 유예 시간이 지나도 행이 없으면 해제하고 새로 획득
+    monkeypatch.setattr(async_scan_service, "REGISTRY_CLAIM_GRACE_SECONDS", 0)
+    session_id = str(uuid.uuid4())
+    assert claim_or_find_owner(db, "10.0.0.1", "quick", session_id) is None
+    assert registry.claim("10.0.0.1", "quick", "other") == session_id
+
+
+def test_finished_owner_released(db, registry):
+    owner = str(uuid.uuid4())
+    crud.create_scan_session(db, "10.0.0.1", "quick", session_id=owner)
+    registry.claim("10.0.0.1", "quick", owner)
+    assert claim_or_find_owner(db, "10.0.0.1", "quick", str(uuid.uuid4())) == owner
+
+    crud.update_scan_status(db, owner, ScanStatus.FAILED, error="boom")
+    assert claim_or_find_owner(db, "10.0.0.1", "quick", str(uuid.uuid4())) is None
+
+
+def test_start_or_attach_releases_claim_when_submit_fails(db, registry, monkeypatch):
+    def fail_submit(self):
+        raise RuntimeError("executor is shut down")
+
+    monkeypatch.setattr(async_scan_service.AsyncScanService, "submit", fail_submit)
+    with pytest.raises(RuntimeError):
+        start_or_attach(db, "10.0.0.1", "quick")
+
+    assert registry.age("10.0.0.1", "quick") is None
+    failed = db.query(crud.ScanSession).filter(crud.ScanSession.target == "10.0.0.1").one()
+    assert failed.status == ScanStatus.FAILED
+
+
+def test_start_or_attach_releases_claim_when_insert_fails(db, registry, monkeypatch):
+    def fail_insert(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(crud, "create_scan_session", fail_insert)
+    with pytest.raises(RuntimeError):
+        start_or_attach(db, "10.0.0.1", "quick")
+    assert registry.age("10.0.0.1", "quick") is None
+
+
+def test_start_or_attach_joins_in_flight_scan(db, registry, monkeypatch):
+    monkeypatch.setattr(async_scan_service.AsyncScanService, "submit", lambda self: None)
+    first, _ = start_or_attach(db, "10.0.0.1", "quick")
+    second, future = start_or_attach(db, "10.0.0.1", "quick")
+    assert second == first
+    assert future is None
+
+
+@pytest.fixture
+def quick_heartbeat(monkeypatch):
+    monkeypatch.setattr(events, "_bus", InProcessEventBus())
+    monkeypatch.setattr(settings, "EVENT_HEARTBEAT_SECONDS", 0.05)
+
+
+def test_wait_for_result_loads_result_once_completed(db, quick_heartbeat, monkeypatch):
+    session = crud.create_scan_session(db, "10.0.0.1", "quick")
+    session_id = str(session.id)
+    crud.update_scan_status(db, session_id, ScanStatus.RUNNING)
+
+    loads = []
+    get_scan_session = crud.get_scan_session
+    monkeypatch.setattr(crud, "get_scan_session", lambda *a, **kw: loads.append(kw) or get_scan_session(*a, **kw))
+
+    # 대기하는 동안 다른 워커가 완료 (종료 이벤트 없이 하트비트 재확인으로 감지)
+    def complete():
+        worker_db = SessionLocal()
+        try:
+            crud.save_scan_result(worker_db, session_id, {"target": "10.0.0.1", "report": "# done"})
+        finally:
+            worker_db.close()
+
+    threading.Timer(0.2, complete).start()
+    result = asyncio.run(wait_for_result(session_id))
+    assert result["report"] == "# done"
+    assert loads == [{"with_result": True}]
+
+
+def test_wait_for_result_raises_for_failed_scan(db, quick_heartbeat):
+    session = crud.create_scan_session(db, "10.0.0.1", "quick")
+    crud.update_scan_status(db, str(session.id), ScanStatus.FAILED, error="boom")
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(wait_for_result(str(session.id)))
+
+
+class FakeRedis:
+    """취소 플래그에 쓰는 명령만 지원하는 Redis 대역"""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def fast_scan(monkeypatch):
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "FAKE_LLM_TOKEN_DELAY_MS", 0)
+    monkeypatch.setattr(settings, "STUB_SCANNER_DELAY_MS", 0)
+
+
+def test_resume_after_remote_cancel_completes(db, registry, fast_scan, monkeypatch):
+    from app.core import redis
+
+    fake = FakeRedis()
+    monkeypatch.setattr(redis, "_client", fake)
+    monkeypatch.setattr(settings, "SCAN_REGISTRY_BACKEND", "redis")
+    monkeypatch.setattr(settings, "SCAN_DEDUP_ENABLED", False)
+
+    # 다른 워커에서 대기 중인 스캔 취소 (플래그 설정 + 바로 CANCELLED)
+    session_id = str(crud.create_scan_session(db, "127.0.0.1", "quick").id)
+    assert async_scan_service.cancel_scan(db, session_id) is True
+    assert fake.values
+
+    async_scan_service.resume_scan(db, session_id).result(timeout=30)
+    db.expire_all()
+    assert crud.get_scan_status(db, session_id).status == ScanStatus.COMPLETED
+    assert fake.values == {}
+
+
+def test_queued_scan_cancelled_once(db, registry, monkeypatch):
+    published = []
+    monkeypatch.setattr(async_scan_service, "publish_terminal", lambda *args: published.append(args))
+
+    session_id = str(crud.create_scan_session(db, "127.0.0.1", "quick").id)
+    service = async_scan_service.AsyncScanService(session_id, "127.0.0.1", "quick")
+    # 워커 풀에서 대기 중인 상태 (토큰만 등록)
+    async_scan_service.register_token(service.cancel_token)
+    assert async_scan_service.cancel_scan(db, session_id) is True
+    assert len(published) == 1
+
+    # 대기하던 작업이 시작되면 기록/발행 없이 끝난다
+    with pytest.raises(async_scan_service.ScanCancelled):
+        service.run()
+    assert len(published) == 1
+    db.expire_all()
+    status = crud.get_scan_status(db, session_id)
+    assert (status.status, status.error) == (ScanStatus.CANCELLED, "Scan cancelled")
@@ -0,0 +1,68 @@
+"""
+세션 목록 keyset 페이지네이션 (crud.list_sessions) 테스트
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import crud
+from app.models.scan_session import ScanStatus, ScanType
+
+
+@pytest.fixture
+def sessions(db):
+    """created_at이 같은 행(id로 정렬)과 다른 행이 섞인 세션 7개"""
+    now = datetime.utcnow().replace(microsecond=0)
+    rows = []
+    for i in range(7):
+        rows.append({
+            "id": uuid.uuid4(),
+            "target": f"10.0.0.{i % 2}",
+            "scan_type": ScanType.QUICK,
+            "created_at": now - timedelta(minutes=i // 3),
+        })
+    crud.create_scan_sessions_bulk(db, rows)
+    return sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+
+
+def _all_pages(db, limit, **filters):
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = crud.list_sessions(db, limit, cursor=cursor, **filters)
+        ids.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_pages_cover_all_rows_in_order(db, sessions):
+    ids, pages = _all_pages(db, 2)
+    assert ids == [row["id"] for row in sessions]
+    assert pages == 4
+
+
+def test_last_page_has_no_cursor(db, sessions):
+    rows, cursor = crud.list_sessions(db, len(sessions))
+    assert len(rows) == len(sessions)
+    assert cursor is None
+
+
+def test_filters_apply_across_pages(db, sessions):
+    ids, _ = _all_pages(db, 1, target="10.0.0.1")
+    assert ids == [row["id"] for row in sessions if row["target"] == "10.0.0.1"]
+
+    ids, _ = _all_pages(db, 3, status=ScanStatus.RUNNING)
+    assert ids == []
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    created_at, session_id = datetime(2026, 10, 1, 12, 30, 15, 123456), uuid.uuid4()
+    assert crud.decode_cursor(crud.encode_cursor(created_at, session_id)) == (created_at, session_id)
+    with pytest.raises(ValueError):
+        crud.decode_cursor("not-a-cursor")
+
+
+def test_exact_count(db, sessions):
+    assert crud.count_sessions(db, exact=True) == (len(sessions), False)
+    assert crud.count_sessions(db, exact=True, target="10.0.0.0") == (4, False)